@@ -0,0 +1,253 @@
+"""
+IndiStockPredictor - asyncio (ASGI) serving mode
+
+Serves the same API as mock_server.py from an ASGI application so one
+process can hold many concurrent clients:
+
+- /api/stream/market runs natively on the event loop; each open stream is a
+  coroutine waiting on an asyncio.Event, not a blocked server thread.
+- Every other route is dispatched to the Flask app on an executor, so the
+  JSON responses, CORS headers and response caches are exactly the ones the
+  Flask server produces.
+- Slow, CPU-heavy routes (prediction, technical, news, fundamentals,
+  historical) run on their own bounded executor, so a burst of prediction
+  requests queues there while quote and index lookups keep flowing through
+  the quick executor.
+
+No ASGI framework is required. Run it with any ASGI server, for example:
+
+    uvicorn asgi_server:app --host 0.0.0.0 --port 5000
+    python asgi_server.py [--port 5000]   (uses uvicorn when installed)
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from market_stream import HEARTBEAT_SECONDS, format_pending, parse_subscription
+from mock_server import MARKET_STREAM, app as flask_app
+from stock_registry import STOCK_REGISTRY
+
+# Routes whose generation is CPU-heavy and may take seconds
+HEAVY_ROUTE_PATTERN = re.compile(r'^/api/(stock/[^/]+/(prediction|technical|news|fundamentals|historical)|stock_news/)')
+
+QUICK_WORKERS = 32
+HEAVY_WORKERS = 4
+
+QUICK_EXECUTOR = ThreadPoolExecutor(max_workers=QUICK_WORKERS, thread_name_prefix="api-quick")
+HEAVY_EXECUTOR = ThreadPoolExecutor(max_workers=HEAVY_WORKERS, thread_name_prefix="api-heavy")
+
+STREAM_PATH = '/api/stream/market'
+
+
+def _wsgi_environ(scope, body):
+    """Build a WSGI environ for the Flask app from an ASGI HTTP scope"""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"],
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        "CONTENT_LENGTH": str(len(body)),
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif name != "CONTENT_LENGTH":
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def call_flask(scope, body):
+    """Run one request through the Flask app; returns (status, headers, body)"""
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = int(status.split(" ", 1)[0])
+        response["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+
+    result = flask_app(_wsgi_environ(scope, body), start_response)
+    try:
+        content = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return response["status"], response["headers"], content
+
+
+def executor_for(path):
+    """Pick the executor a route runs on"""
+    return HEAVY_EXECUTOR if HEAVY_ROUTE_PATTERN.match(path) else QUICK_EXECUTOR
+
+
+async def _read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _send_json_error(send, status, message):
+    content = json.dumps({"error": message}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"access-control-allow-origin", b"*")]
+    })
+    await send({"type": "http.response.body", "body": content})
+
+
+async def _watch_disconnect(receive, disconnected):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            disconnected.set()
+            return
+
+
+async def stream_market(scope, receive, send):
+    """Native asyncio version of /api/stream/market"""
+    loop = asyncio.get_running_loop()
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    symbols, indices, error = parse_subscription(
+        query.get("symbols", [None])[0], query.get("indices", [None])[0], STOCK_REGISTRY.get
+    )
+    if error:
+        await _send_json_error(send, 400, error)
+        return
+
+    updated = asyncio.Event()
+    # Publisher threads wake this coroutine through the loop instead of blocking a thread per client
+    client = await loop.run_in_executor(
+        QUICK_EXECUTOR,
+        lambda: MARKET_STREAM.subscribe(symbols, indices, on_update=lambda: loop.call_soon_threadsafe(updated.set))
+    )
+    if client is None:
+        await _send_json_error(send, 503, "Too many open streams, fall back to polling")
+        return
+
+    disconnected = asyncio.Event()
+    watcher = asyncio.ensure_future(_watch_disconnect(receive, disconnected))
+    gone = asyncio.ensure_future(disconnected.wait())
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+                (b"access-control-allow-origin", b"*"),
+            ]
+        })
+        await send({"type": "http.response.body", "body": f"retry: {HEARTBEAT_SECONDS * 1000}\n\n".encode(), "more_body": True})
+
+        while True:
+            # Wake on a tick or a disconnect, whichever comes first, so a closed
+            # stream frees its slot at once instead of at the next tick or heartbeat
+            tick = asyncio.ensure_future(updated.wait())
+            done, _ = await asyncio.wait({tick, gone}, timeout=HEARTBEAT_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if gone in done:
+                tick.cancel()
+                break
+            if tick not in done:
+                tick.cancel()
+                await send({"type": "http.response.body", "body": b": keep-alive\n\n", "more_body": True})
+                continue
+            updated.clear()
+            pending = client.take(0)
+            if pending:
+                await send({"type": "http.response.body", "body": format_pending(pending).encode(), "more_body": True})
+    except OSError:
+        # Client went away mid-write
+        pass
+    finally:
+        watcher.cancel()
+        gone.cancel()
+        MARKET_STREAM.unsubscribe(client)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            QUICK_EXECUTOR.shutdown(wait=False)
+            HEAVY_EXECUTOR.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    if scope["path"] == STREAM_PATH and scope["method"] == "GET":
+        await stream_market(scope, receive, send)
+        return
+
+    body = await _read_body(receive)
+    if body is None:
+        return
+
+    loop = asyncio.get_running_loop()
+    try:
+        status, headers, content = await loop.run_in_executor(executor_for(scope["path"]), call_flask, scope, body)
+    except Exception as e:
+        print(f"Error serving {scope['path']}: {str(e)}")
+        await _send_json_error(send, 500, "Internal server error")
+        return
+
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": content})
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Serve the market API with an ASGI server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("uvicorn is not installed; run 'pip install uvicorn' or start asgi_server:app with any ASGI server")
+        return 1
+
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
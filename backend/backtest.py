@@ -0,0 +1,259 @@
+"""
+IndiStockPredictor - Walk-Forward Backtest
+
+Validates StockPredictor over a full history instead of a single 80/20
+split. The history is cut into successive train/test folds (sliding or
+expanding train window), every fold is trained and scored independently,
+and MSE/MAE/RMSE/R² are reported per fold and per model (rf, lstm,
+ensemble). Folds run in parallel on a process pool; the feature matrix is
+extracted once and handed to each worker once through the pool initializer,
+and every fold is scaled with min/max statistics of its own training window
+only (computed once per window in the parent), so no test rows leak in.
+
+Usage: python backtest.py --symbol TCS [--days 2000] [--train 500] [--test 60] [--workers 4]
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sequence_windows import create_sequences
+from train_universe import default_workers, init_worker
+
+MODEL_NAMES = ("rf", "lstm", "ensemble")
+METRIC_NAMES = ("MSE", "MAE", "RMSE", "R²")
+
+
+def walk_forward_folds(n_rows, train_size, test_size, step=None, expanding=False):
+    """
+    Return (train_start, test_start, test_end) row ranges covering the history.
+    Each test window follows its train window; windows advance by `step`
+    (default test_size). With expanding=True every fold trains from row 0.
+    """
+    step = step or test_size
+    folds = []
+    test_start = train_size
+    while test_start + test_size <= n_rows:
+        train_start = 0 if expanding else test_start - train_size
+        folds.append((train_start, test_start, test_start + test_size))
+        test_start += step
+    return folds
+
+
+def scaler_stats(features, folds):
+    """
+    Min-max statistics (low, span) of each fold's training rows, keyed by
+    the (train_start, test_start) window. Only rows before test_start are
+    used, so no fold sees its test data. Expanding folds share row 0 and
+    read running minima/maxima instead of rescanning the history.
+    """
+    stats = {}
+    prefix = None
+    for train_start, test_start, _ in folds:
+        window = (train_start, test_start)
+        if window in stats:
+            continue
+        if train_start == 0:
+            if prefix is None:
+                prefix = (np.minimum.accumulate(features, axis=0), np.maximum.accumulate(features, axis=0))
+            low, high = prefix[0][test_start - 1], prefix[1][test_start - 1]
+        else:
+            rows = features[train_start:test_start]
+            low, high = rows.min(axis=0), rows.max(axis=0)
+        span = high - low
+        span[span == 0] = 1.0
+        stats[window] = (low, span)
+    return stats
+
+
+# History shared by the folds of one worker process (see init_fold_worker)
+_HISTORY = {}
+
+
+def init_fold_worker(threads_per_worker, features, targets):
+    """
+    Process initializer: cap native threads and keep the history in the
+    worker, so each fold task only carries its row ranges and scaler stats.
+    """
+    init_worker(threads_per_worker)
+    _HISTORY["features"] = features
+    _HISTORY["targets"] = targets
+
+
+def run_fold(fold_id, fold, stats, epochs=50, features=None, targets=None):
+    """
+    Train and score one fold. `stats` is the (low, span) of the fold's
+    training rows from scaler_stats. `features`/`targets` are the full
+    history; in a pool worker they come from init_fold_worker instead.
+    """
+    from prediction_demo import StockPredictor
+
+    if features is None:
+        features, targets = _HISTORY["features"], _HISTORY["targets"]
+
+    started = time.time()
+    train_start, test_start, test_end = fold
+    predictor = StockPredictor()
+    seq_len = predictor.sequence_length
+
+    low, span = stats
+    scaled = (features[train_start:test_end] - low) / span
+    train_rows = test_start - train_start
+
+    # Random Forest: one row of features per target
+    X_train_rf = scaled[:train_rows]
+    X_test_rf = scaled[train_rows:]
+    y_train = targets[train_start:test_start]
+    y_test = targets[test_start:test_end]
+
+    # LSTM: windows over the fold; test windows may start in the training rows
+    X_seq, y_seq = create_sequences(scaled, targets[train_start:test_end], seq_len)
+    split = train_rows - seq_len
+    X_train_lstm, y_train_lstm = X_seq[:split], y_seq[:split]
+    X_test_lstm = X_seq[split:]
+
+    predictor.train_random_forest(X_train_rf, y_train)
+    predictor.train_lstm(X_train_lstm, y_train_lstm, epochs=epochs, verbose=0)
+
+    predictions = predictor.ensemble_predict(X_test_rf, X_test_lstm)
+    evaluation = predictor.evaluate(y_test, predictions)
+
+    return {
+        "fold": fold_id,
+        "trainStart": int(train_start),
+        "testStart": int(test_start),
+        "testEnd": int(test_end),
+        "metrics": {
+            model: {metric: float(value) for metric, value in values.items()}
+            for model, values in evaluation.items()
+        },
+        "seconds": round(time.time() - started, 2)
+    }
+
+
+def summarize(fold_results):
+    """Mean and standard deviation of every metric across folds, per model"""
+    summary = {}
+    for model in MODEL_NAMES:
+        summary[model] = {}
+        for metric in METRIC_NAMES:
+            values = np.array([r["metrics"][model][metric] for r in fold_results if model in r["metrics"]])
+            if len(values):
+                summary[model][metric] = {"mean": float(values.mean()), "std": float(values.std())}
+    return summary
+
+
+def walk_forward_backtest(df, train_size=500, test_size=60, step=None, expanding=False,
+                          workers=1, threads_per_worker=1, epochs=50,
+                          feature_cols=None, target_col='close', progress=print):
+    """
+    Run a walk-forward backtest on a feature DataFrame (see build_feature_frame).
+    Returns {"folds": [...], "summary": {...}} with folds in chronological order.
+    """
+    from prediction_demo import StockPredictor
+
+    defaults = StockPredictor()
+    feature_cols = feature_cols or defaults.feature_cols
+    if train_size <= defaults.sequence_length:
+        raise ValueError(f"train_size must exceed the LSTM sequence length ({defaults.sequence_length})")
+
+    # Extract the matrices once; every fold slices these instead of the DataFrame
+    features = np.ascontiguousarray(df[feature_cols].to_numpy(dtype=np.float64))
+    targets = np.ascontiguousarray(df[target_col].to_numpy(dtype=np.float64))
+
+    folds = walk_forward_folds(len(features), train_size, test_size, step, expanding)
+    if not folds:
+        raise ValueError(f"History of {len(features)} rows is too short for train={train_size}, test={test_size}")
+    stats = scaler_stats(features, folds)
+
+    results = []
+
+    def report(result):
+        results.append(result)
+        if progress:
+            rmse = result["metrics"]["ensemble"]["RMSE"]
+            progress(f"[{len(results)}/{len(folds)}] fold {result['fold']} rows "
+                     f"{result['testStart']}-{result['testEnd']} ensemble RMSE {rmse:.2f} ({result['seconds']}s)")
+
+    if workers <= 1:
+        for fold_id, fold in enumerate(folds):
+            report(run_fold(fold_id, fold, stats[fold[:2]], epochs, features, targets))
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(folds)),
+            mp_context=context,
+            initializer=init_fold_worker,
+            initargs=(threads_per_worker, features, targets)
+        ) as pool:
+            futures = [
+                pool.submit(run_fold, fold_id, fold, stats[fold[:2]], epochs)
+                for fold_id, fold in enumerate(folds)
+            ]
+            for future in futures:
+                report(future.result())
+
+    results.sort(key=lambda r: r["fold"])
+    return {"folds": results, "summary": summarize(results)}
+
+
+def print_report(report, symbol):
+    """Print per-fold and summary metrics"""
+    print("\n" + "=" * 50)
+    print(f"WALK-FORWARD BACKTEST FOR {symbol}: {len(report['folds'])} folds")
+    print("=" * 50)
+    for result in report["folds"]:
+        line = ", ".join(
+            f"{model} RMSE {result['metrics'][model]['RMSE']:.2f}"
+            for model in MODEL_NAMES if model in result["metrics"]
+        )
+        print(f"Fold {result['fold']:>3} [{result['testStart']}:{result['testEnd']}] {line}")
+
+    print("\nSummary (mean ± std across folds):")
+    for model, metrics in report["summary"].items():
+        print(f"\n{model.upper()} Model:")
+        for metric, stats in metrics.items():
+            print(f"  {metric}: {stats['mean']:.4f} ± {stats['std']:.4f}")
+    print("=" * 50 + "\n")
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of StockPredictor")
+    parser.add_argument("--symbol", default="RELIANCE", help="Symbol to backtest")
+    parser.add_argument("--days", type=int, default=2000, help="Days of history")
+    parser.add_argument("--train", type=int, default=500, help="Training window in rows")
+    parser.add_argument("--test", type=int, default=60, help="Test window in rows")
+    parser.add_argument("--step", type=int, help="Rows between folds (default: test window)")
+    parser.add_argument("--expanding", action="store_true", help="Grow the training window from the start")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="Parallel fold workers")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="Native threads per worker")
+    parser.add_argument("--epochs", type=int, default=50, help="LSTM training epochs per fold")
+    parser.add_argument("--store", help="OHLCV store directory to read the history from (default: simulate)")
+    args = parser.parse_args()
+
+    from prediction_demo import generate_symbol_data
+
+    df = generate_symbol_data(args.symbol, args.days, args.store)
+    started = time.time()
+    report = walk_forward_backtest(
+        df,
+        train_size=args.train,
+        test_size=args.test,
+        step=args.step,
+        expanding=args.expanding,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        epochs=args.epochs
+    )
+    print_report(report, args.symbol)
+    print(f"Backtest completed in {time.time() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
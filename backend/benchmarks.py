@@ -0,0 +1,337 @@
+"""
+IndiStockPredictor - Benchmark Suite
+
+Times the platform's hot paths and writes the results as JSON so runs can be
+compared as the universe grows:
+
+  generators  every data generator in market_data.py and mock_server.py
+              (history, fundamentals, news, technical, prediction, indices, ...)
+              called directly with fixed-seed generators
+  routes      every GET route of mock_server.py driven through the Flask test
+              client; the first (cold) call is reported separately from the
+              repeated (warm) calls that hit the per-tick and per-day caches
+  pipeline    StockPredictor stages (prepare_data, _create_sequences, training,
+              predict_future) at several history sizes; skipped when the ML
+              stack (scikit-learn/TensorFlow) is not installed
+
+Usage: python benchmarks.py [--suites generators,routes] [--repeat 20] [--sizes 500,1000,2000]
+                            [--output results.json] [--compare previous.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+import fundamentals_engine
+import market_data
+import mock_server
+import technical_data
+from seeded_random import seeded_numpy_rng, seeded_rng
+from stock_registry import STOCK_REGISTRY
+
+SUITES = ("generators", "routes", "pipeline")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "benchmark_results")
+
+BENCHMARK_SYMBOL = "RELIANCE"
+DEFAULT_REPEAT = 20
+DEFAULT_SIZES = (500, 1000, 2000)
+PIPELINE_EPOCHS = 2
+
+# Routes that never finish (server-sent events) are not benchmarked
+SKIPPED_ROUTES = {"/api/stream/market"}
+
+# Query strings for routes that need parameters to do their real work
+ROUTE_QUERIES = {
+    "/api/search": "query=tata",
+    "/api/stocks/batch": "symbols=RELIANCE,TCS,INFY,HDFCBANK,ICICIBANK&include=details,quote",
+    "/api/fundamental/screen": "q=ROE > 10 and D/E < 1",
+    "/api/fundamental/screener": "min_pe=20&max_pe=30&sort=marketCap",
+}
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    """Timing statistics in milliseconds for a list of durations in seconds"""
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "runs": len(ms),
+        "minMs": round(ms[0], 4),
+        "medianMs": round(statistics.median(ms), 4),
+        "meanMs": round(statistics.fmean(ms), 4),
+        "p95Ms": round(_percentile(ms, 95), 4),
+        "maxMs": round(ms[-1], 4),
+    }
+
+
+def time_call(fn, repeat=DEFAULT_REPEAT):
+    """
+    Call fn once cold, then `repeat` more times.
+    Returns (statistics dict, result of the last call).
+    """
+    started = time.perf_counter()
+    result = fn()
+    first = time.perf_counter() - started
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+
+    stats = summarize(samples or [first])
+    stats["firstMs"] = round(first * 1000, 4)
+    return stats, result
+
+
+def generator_benchmarks(symbol=BENCHMARK_SYMBOL):
+    """(name, callable) pairs; every call builds a fresh fixed-seed generator"""
+    details = mock_server.generate_stock_details(symbol, rng=seeded_rng("benchmark", "details", symbol))
+
+    def seeded(name, fn):
+        return name, lambda: fn(seeded_rng("benchmark", name))
+
+    return [
+        seeded("market_data.generate_realistic_index_values", market_data.generate_realistic_index_values),
+        seeded("market_data.generate_detailed_sector_performance", market_data.generate_detailed_sector_performance),
+        seeded("market_data.generate_market_breadth", market_data.generate_market_breadth),
+        seeded("market_data.generate_market_movers", lambda rng: market_data.generate_market_movers(rng=rng)),
+        seeded("market_data.generate_market_sentiment", market_data.generate_market_sentiment),
+        seeded("market_data.generate_enhanced_market_overview", market_data.generate_enhanced_market_overview),
+        ("mock_server.generate_market_indices", lambda: mock_server.generate_market_indices(
+            market_data.generate_enhanced_market_overview(seeded_rng("benchmark", "indices"))
+        )),
+        seeded("mock_server.generate_stock_price_history", lambda rng: mock_server.generate_stock_price_history(symbol, 365, rng)),
+        seeded("mock_server.generate_prediction", lambda rng: mock_server.generate_prediction(symbol, 30, rng)),
+        ("fundamentals_engine.generate_fundamentals_universe", lambda: fundamentals_engine.generate_fundamentals_universe(
+            STOCK_REGISTRY.stocks, seeded_numpy_rng("benchmark", "fundamentals")
+        )),
+        ("fundamentals_engine.FundamentalsUniverse.record",
+         lambda: fundamentals_engine.get_fundamentals_universe().record(symbol)),
+        seeded("mock_server.generate_stock_news", lambda rng: mock_server.generate_stock_news(symbol, details, rng)),
+        seeded("mock_server.generate_stock_quote", lambda rng: mock_server.generate_stock_quote(symbol, rng)),
+        seeded("mock_server.generate_stock_details", lambda rng: mock_server.generate_stock_details(symbol, rng=rng)),
+        seeded("mock_server.generate_recommendations", lambda rng: mock_server.generate_recommendations(10, rng)),
+        seeded("mock_server.generate_portfolio", mock_server.generate_portfolio),
+        seeded("mock_server.generate_portfolio_performance", mock_server.generate_portfolio_performance),
+        seeded("mock_server.generate_top_gainers", lambda rng: mock_server.generate_top_gainers(5, rng)),
+        seeded("mock_server.generate_top_losers", lambda rng: mock_server.generate_top_losers(5, rng)),
+        seeded("mock_server.generate_sector_performance", mock_server.generate_sector_performance),
+        seeded("mock_server.generate_market_overview", mock_server.generate_market_overview),
+        seeded("mock_server.generate_default_prediction", lambda rng: mock_server.generate_default_prediction(30, rng)),
+        ("technical_data.get_technical_snapshot", lambda: technical_data.get_technical_snapshot(symbol)),
+        ("mock_server.generate_model_forecast", lambda: mock_server.generate_model_forecast(symbol, 30)),
+    ]
+
+
+def run_generators(repeat, symbol=BENCHMARK_SYMBOL, progress=print):
+    """Time every generator; Flask-dependent ones run inside an app context"""
+    results = []
+    with mock_server.app.test_request_context():
+        for name, fn in generator_benchmarks(symbol):
+            try:
+                stats, _ = time_call(fn, repeat)
+                results.append({"name": name, **stats})
+            except Exception as e:
+                results.append({"name": name, "error": f"{type(e).__name__}: {str(e)}"})
+            if progress:
+                progress(format_result(results[-1]))
+    return results
+
+
+def benchmark_routes(app=None, symbol=BENCHMARK_SYMBOL):
+    """GET URLs for every route of the app, with <symbol> filled in"""
+    app = app or mock_server.app
+    urls = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if "GET" not in rule.methods or rule.endpoint == "static" or rule.rule in SKIPPED_ROUTES:
+            continue
+        path = re.sub(r"<(?:[^:<>]+:)?symbol>", symbol, rule.rule)
+        if "<" in path:
+            continue
+        query = ROUTE_QUERIES.get(rule.rule)
+        urls.append((rule.rule, f"{path}?{query}" if query else path))
+    return urls
+
+
+def run_routes(repeat, symbol=BENCHMARK_SYMBOL, progress=print):
+    """Time every GET route through the test client, recording status and payload size"""
+    client = mock_server.app.test_client()
+    results = []
+    for route, url in benchmark_routes(symbol=symbol):
+        responses = []
+
+        def call():
+            response = client.get(url)
+            responses.append((response.status_code, len(response.get_data())))
+            return response
+
+        try:
+            stats, _ = time_call(call, repeat)
+            status, size = responses[-1]
+            results.append({"name": route, "url": url, "status": status, "bytes": size, **stats})
+        except Exception as e:
+            results.append({"name": route, "url": url, "error": f"{type(e).__name__}: {str(e)}"})
+        if progress:
+            progress(format_result(results[-1]))
+    return results
+
+
+def run_pipeline(sizes, repeat=1, epochs=PIPELINE_EPOCHS, symbol=BENCHMARK_SYMBOL, progress=print):
+    """Time StockPredictor stages at each history size"""
+    try:
+        from prediction_demo import StockPredictor, generate_symbol_data
+    except ImportError as e:
+        message = f"ML stack not installed ({str(e)})"
+        if progress:
+            progress(f"  pipeline skipped: {message}")
+        return [{"name": "pipeline", "skipped": message}]
+
+    results = []
+    for size in sizes:
+        df = generate_symbol_data(symbol, size)
+        predictor = StockPredictor()
+        data = predictor.prepare_data(df)
+        train_df = df[predictor.feature_cols].iloc[:len(data['rf'][0])]
+
+        stages = [
+            ("prepare_data", lambda: predictor.prepare_data(df)),
+            ("_create_sequences", lambda: predictor._create_sequences(train_df, train_df[predictor.target_col])),
+            ("train_random_forest", lambda: predictor.train_random_forest(data['rf'][0], data['rf'][1])),
+            ("train_lstm", lambda: predictor.train_lstm(data['lstm'][0], data['lstm'][1], epochs=epochs, verbose=0)),
+            ("predict_future", lambda: predictor.predict_future(df)),
+        ]
+        for stage, fn in stages:
+            name = f"StockPredictor.{stage}"
+            try:
+                stats, _ = time_call(fn, repeat)
+                results.append({"name": name, "rows": size, **stats})
+            except Exception as e:
+                results.append({"name": name, "rows": size, "error": f"{type(e).__name__}: {str(e)}"})
+            if progress:
+                progress(format_result(results[-1]))
+    return results
+
+
+def format_result(result):
+    """One table line per benchmark"""
+    label = result["name"] + (f" [{result['rows']} rows]" if "rows" in result else "")
+    if "error" in result:
+        return f"  {label:<60} ERROR {result['error']}"
+    size = f"  {result['bytes']:>9,} B" if "bytes" in result else ""
+    return (f"  {label:<60} first {result['firstMs']:>9.2f} ms  median {result['medianMs']:>9.3f} ms"
+            f"  p95 {result['p95Ms']:>9.3f} ms{size}")
+
+
+def environment():
+    """Machine and data-size context stored with every run"""
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "universeSize": len(STOCK_REGISTRY.stocks),
+    }
+
+
+def _result_key(result):
+    return (result["name"], result.get("rows"))
+
+
+def compare_runs(previous, current, threshold=0.1):
+    """
+    Compare median timings of two runs. Returns rows of
+    (suite, name, previous ms, current ms, ratio, regressed) for benchmarks in both,
+    slowest regressions first; a ratio above 1 + threshold is a regression.
+    """
+    rows = []
+    for suite, results in current["results"].items():
+        before = {_result_key(r): r for r in previous.get("results", {}).get(suite, []) if "medianMs" in r}
+        for result in results:
+            old = before.get(_result_key(result))
+            if old is None or "medianMs" not in result or not old["medianMs"]:
+                continue
+            label = result["name"] + (f" [{result['rows']} rows]" if "rows" in result else "")
+            ratio = result["medianMs"] / old["medianMs"]
+            rows.append((suite, label, old["medianMs"], result["medianMs"], ratio, ratio > 1 + threshold))
+    rows.sort(key=lambda row: row[4], reverse=True)
+    return rows
+
+
+def run_benchmarks(suites=SUITES, repeat=DEFAULT_REPEAT, sizes=DEFAULT_SIZES, epochs=PIPELINE_EPOCHS,
+                   symbol=BENCHMARK_SYMBOL, progress=print):
+    """Run the selected suites and return the results document"""
+    run = {"environment": environment(), "symbol": symbol, "repeat": repeat, "results": {}}
+    for suite in suites:
+        if progress:
+            progress(f"\n{suite}")
+        started = time.perf_counter()
+        if suite == "generators":
+            run["results"][suite] = run_generators(repeat, symbol, progress)
+        elif suite == "routes":
+            run["results"][suite] = run_routes(repeat, symbol, progress)
+        elif suite == "pipeline":
+            run["results"][suite] = run_pipeline(sizes, max(1, repeat // 10), epochs, symbol, progress)
+        if progress:
+            progress(f"  ({time.perf_counter() - started:.1f}s)")
+    return run
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark generators, API routes and the ML pipeline")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"Comma-separated suites ({', '.join(SUITES)})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed calls per benchmark after the first")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated history sizes (days) for the pipeline suite")
+    parser.add_argument("--epochs", type=int, default=PIPELINE_EPOCHS, help="LSTM epochs in the pipeline suite")
+    parser.add_argument("--symbol", default=BENCHMARK_SYMBOL, help="Symbol used by per-stock benchmarks")
+    parser.add_argument("--output", help="Results file (default: benchmark_results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare median timings against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        print(f"Unknown suites: {', '.join(unknown)}")
+        return 1
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    run = run_benchmarks(suites, args.repeat, sizes, args.epochs, args.symbol.upper())
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults written to {os.path.abspath(output)}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        rows = compare_runs(previous, run, args.threshold)
+        regressions = sum(1 for row in rows if row[5])
+        print(f"\nCompared with {args.compare}: {len(rows)} benchmarks, {regressions} slower by more than "
+              f"{args.threshold:.0%}")
+        for suite, label, before, after, ratio, regressed in rows:
+            marker = "  <-- slower" if regressed else ""
+            print(f"  {suite:<10} {label:<60} {before:>9.3f} -> {after:>9.3f} ms  x{ratio:.2f}{marker}")
+        return 2 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
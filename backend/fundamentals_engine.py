@@ -0,0 +1,356 @@
+"""
+Batch fundamentals generation for the IndiStockPredictor platform.
+Produces every stock's fundamentals for the whole universe at once: sector-dependent ranges come from lookup tables indexed by
+a per-stock profile code, every metric is one vectorized draw, and the
+fundamental score is computed with array comparisons. The result is built
+once per trading day and shared by the fundamentals, stock details and batch
+endpoints, both screeners and the recommendations, so they all agree.
+"""
+
+import threading
+
+import numpy as np
+
+from screener import ScreenerTable
+from seeded_random import seeded_numpy_rng, time_bucket
+from stock_registry import STOCK_REGISTRY
+
+FUNDAMENTALS_DAY_SECONDS = 86400
+
+# Sector profiles with their own parameter ranges; every other sector uses "default"
+PROFILES = ("Information Technology", "Financial Services", "Healthcare",
+            "Consumer Goods", "Energy", "Basic Materials", "default")
+
+# metric -> {profile: (low, high)} for uniformly drawn sector-dependent metrics
+SECTOR_RANGES = {
+    "pe": {"Information Technology": (20, 35), "Financial Services": (10, 18), "Healthcare": (18, 30),
+           "Consumer Goods": (15, 25), "Energy": (8, 15), "Basic Materials": (12, 20), "default": (15, 25)},
+    "pb": {"Information Technology": (4, 8), "Financial Services": (1, 3), "Healthcare": (3, 6),
+           "Consumer Goods": (2, 5), "Energy": (1, 2.5), "Basic Materials": (1.5, 3), "default": (2, 4)},
+    "ps": {"Information Technology": (3, 7), "Financial Services": (2, 4), "Healthcare": (2, 6),
+           "Consumer Goods": (1, 3), "Energy": (0.5, 2), "Basic Materials": (1, 2.5), "default": (1, 3)},
+    "evToEbitda": {"Information Technology": (15, 25), "Financial Services": (8, 15), "Healthcare": (12, 20),
+                   "Consumer Goods": (10, 18), "Energy": (5, 12), "Basic Materials": (7, 14), "default": (8, 16)},
+    "peg": {"Information Technology": (1.2, 2.0), "Financial Services": (0.8, 1.5), "Healthcare": (1.0, 1.8),
+            "Consumer Goods": (0.9, 1.6), "Energy": (0.6, 1.3), "Basic Materials": (0.7, 1.4), "default": (0.8, 1.5)},
+    "debtToEquity": {"Information Technology": (0.1, 0.8), "Financial Services": (1.5, 4.0), "Healthcare": (0.3, 1.2),
+                     "Consumer Goods": (0.3, 1.5), "Energy": (0.5, 2.0), "default": (0.3, 1.5)},
+    "currentRatio": {"Information Technology": (1.8, 3.5), "Financial Services": (1.0, 1.5), "Healthcare": (1.5, 3.0),
+                     "Consumer Goods": (1.3, 2.5), "Energy": (1.2, 2.0), "default": (1.3, 2.5)},
+    "quickRatio": {"Information Technology": (1.5, 3.0), "Financial Services": (0.8, 1.3), "Healthcare": (1.2, 2.5),
+                   "Consumer Goods": (1.0, 2.0), "Energy": (0.9, 1.5), "default": (1.0, 2.0)},
+    "interestCoverage": {"Information Technology": (10, 30), "Financial Services": (3, 10), "Healthcare": (8, 20),
+                         "Consumer Goods": (6, 15), "Energy": (4, 12), "default": (6, 15)},
+    "grossMargin": {"Information Technology": (50, 80), "Financial Services": (60, 85), "Healthcare": (45, 75),
+                    "Consumer Goods": (30, 50), "Energy": (20, 40), "default": (30, 60)},
+    "operatingMargin": {"Information Technology": (20, 35), "Financial Services": (25, 40), "Healthcare": (15, 30),
+                        "Consumer Goods": (8, 20), "Energy": (8, 18), "default": (10, 25)},
+    "netMargin": {"Information Technology": (15, 30), "Financial Services": (15, 25), "Healthcare": (10, 25),
+                  "Consumer Goods": (5, 15), "Energy": (5, 12), "default": (8, 18)},
+    "ebitdaMargin": {"Information Technology": (25, 40), "Financial Services": (30, 45), "Healthcare": (20, 35),
+                     "Consumer Goods": (12, 25), "Energy": (15, 25), "default": (15, 30)},
+    "revenueGrowth": {"Information Technology": (5, 40), "default": (-5, 30)},
+    "dividendYield": {"Information Technology": (0.5, 2.0), "Financial Services": (2.0, 5.0), "Healthcare": (1.0, 3.0),
+                      "Consumer Goods": (1.5, 4.0), "Energy": (3.0, 7.0), "default": (1.0, 3.5)},
+    "dividendPayout": {"Information Technology": (10, 30), "Financial Services": (30, 60), "Healthcare": (20, 40),
+                       "Consumer Goods": (30, 50), "Energy": (40, 70), "default": (20, 50)},
+}
+
+# Sector averages the fundamental score compares against
+SECTOR_AVERAGES = {
+    "pe": {"Information Technology": 25, "Financial Services": 15, "Healthcare": 22, "Consumer Goods": 20,
+           "Energy": 12, "Basic Materials": 16, "default": 18},
+    "pb": {"Information Technology": 5, "Financial Services": 1.5, "Healthcare": 4, "Consumer Goods": 3,
+           "Energy": 1.5, "Basic Materials": 2, "default": 2.5},
+    "netMargin": {"Information Technology": 20, "Financial Services": 22, "Healthcare": 18, "Consumer Goods": 10,
+                  "Energy": 8, "Basic Materials": 12, "default": 15},
+}
+
+# Nested output layout: section -> fields, flattened as "section.field"
+FUNDAMENTAL_LAYOUT = {
+    "valuation": ("pe", "pb", "ps", "peg", "evToEbitda", "marketCap"),
+    "financialHealth": ("debtToEquity", "currentRatio", "quickRatio", "interestCoverage",
+                        "totalDebt", "totalCash", "operatingCashFlow", "freeCashFlow"),
+    "profitability": ("grossMargin", "operatingMargin", "netMargin", "ebitdaMargin",
+                      "returnOnEquity", "returnOnAssets", "returnOnInvestedCapital"),
+    "growth": ("revenueGrowth", "earningsGrowth", "dividendGrowth", "5YrRevenueCAGR", "5YrEPSCAGR"),
+    "dividend": ("yield", "payout", "years"),
+    "risks": ("beta", "volatility", "rsquared"),
+    "analystRatings": ("consensus", "buy", "hold", "sell", "targetPrice"),
+}
+INTEGER_FIELDS = {"dividend.years", "analystRatings.buy", "analystRatings.hold", "analystRatings.sell", "fundamentalScore"}
+
+QUARTERS = ["Q4 FY23", "Q1 FY24", "Q2 FY24", "Q3 FY24"]
+HISTORY_YEARS = [str(2019 + i) for i in range(5)]
+
+# Lookup tables as arrays indexed by profile code
+_RANGE_TABLES = {
+    metric: np.array([ranges.get(profile, ranges["default"]) for profile in PROFILES], dtype=float)
+    for metric, ranges in SECTOR_RANGES.items()
+}
+_AVERAGE_TABLES = {
+    metric: np.array([averages[profile] for profile in PROFILES], dtype=float)
+    for metric, averages in SECTOR_AVERAGES.items()
+}
+
+
+def profile_codes(sectors):
+    """Map sector names to rows of the lookup tables"""
+    index = {profile: code for code, profile in enumerate(PROFILES)}
+    return np.array([index.get(sector, index["default"]) for sector in sectors], dtype=np.intp)
+
+
+def _sector_uniform(rng, metric, codes):
+    bounds = _RANGE_TABLES[metric][codes]
+    return rng.uniform(bounds[:, 0], bounds[:, 1])
+
+
+def fundamental_scores(columns, codes):
+    """Fundamental score (0-100) for every row of the flattened fundamentals columns"""
+    c = columns
+    avg_pe = _AVERAGE_TABLES["pe"][codes]
+    avg_pb = _AVERAGE_TABLES["pb"][codes]
+    avg_margin = _AVERAGE_TABLES["netMargin"][codes]
+
+    def points(better, worse, gain, loss):
+        return np.where(better, gain, np.where(worse, -loss, 0))
+
+    score = np.full(len(codes), 50)
+    # Valuation (lower is better)
+    score += points(c["valuation.pe"] < avg_pe, c["valuation.pe"] > avg_pe * 1.5, 5, 5)
+    score += points(c["valuation.pb"] < avg_pb, c["valuation.pb"] > avg_pb * 1.5, 3, 3)
+    score += points(c["valuation.peg"] < 1, c["valuation.peg"] > 2, 5, 5)
+    # Financial health
+    score += points(c["financialHealth.debtToEquity"] < 0.5, c["financialHealth.debtToEquity"] > 2, 4, 4)
+    score += points(c["financialHealth.currentRatio"] > 2, c["financialHealth.currentRatio"] < 1, 3, 5)
+    score += np.where(c["financialHealth.freeCashFlow"] > 0, 5, -5)
+    # Profitability
+    score += points(c["profitability.returnOnEquity"] > 15, c["profitability.returnOnEquity"] < 5, 5, 3)
+    score += points(c["profitability.netMargin"] > avg_margin, c["profitability.netMargin"] < avg_margin * 0.5, 4, 4)
+    # Growth
+    score += points(c["growth.revenueGrowth"] > 15, c["growth.revenueGrowth"] < 0, 5, 5)
+    score += points(c["growth.earningsGrowth"] > 20, c["growth.earningsGrowth"] < 0, 6, 6)
+    # Dividend
+    score += np.where(c["dividend.yield"] > 3, 3, 0)
+    score += np.where(c["dividend.years"] > 10, 3, 0)
+    # Analyst ratings
+    consensus = c["analystRatings.consensus"]
+    score += points(consensus == "Buy", consensus == "Sell", 4, 4)
+    # Risk adjustment
+    score += points(c["risks.beta"] < 0.8, c["risks.beta"] > 1.5, 2, 3)
+
+    return np.clip(score, 0, 100)
+
+
+class FundamentalsUniverse:
+    """One day's fundamentals for every stock, as flat columns plus per-period arrays"""
+
+    def __init__(self, stocks, columns, labels, quarterly, historical):
+        self.stocks = list(stocks)
+        self.row_of = {stock["symbol"]: row for row, stock in enumerate(self.stocks)}
+        self.columns = columns
+        self.labels = labels
+        self.quarterly = quarterly
+        self.historical = historical
+        self.table = ScreenerTable(self.stocks, columns, labels)
+
+    def __contains__(self, symbol):
+        return symbol in self.row_of
+
+    def _value(self, name, row):
+        if name in self.labels:
+            return str(self.labels[name][row])
+        value = self.columns[name][row].item()
+        return int(value) if name in INTEGER_FIELDS else value
+
+    def value(self, symbol, name, default=None):
+        """One field of one stock, e.g. value("TCS", "valuation.pe"), or default if not listed"""
+        row = self.row_of.get(symbol)
+        return default if row is None else self._value(name, row)
+
+    def record(self, symbol):
+        """Return one stock's fundamentals as nested sections, or None"""
+        row = self.row_of.get(symbol)
+        if row is None:
+            return None
+
+        fundamentals = {}
+        for section, fields in FUNDAMENTAL_LAYOUT.items():
+            if section == "analystRatings":
+                continue
+            fundamentals[section] = {field: self._value(f"{section}.{field}", row) for field in fields}
+
+        fundamentals["quarterlyResults"] = [
+            {
+                "quarter": quarter,
+                "revenue": self.quarterly["revenue"][row, i].item(),
+                "profit": self.quarterly["profit"][row, i].item(),
+                "eps": self.quarterly["eps"][row, i].item()
+            }
+            for i, quarter in enumerate(QUARTERS)
+        ]
+        # Most recent year first
+        fundamentals["historicalData"] = [
+            {
+                "year": year,
+                "revenue": self.historical["revenue"][row, i].item(),
+                "profit": self.historical["profit"][row, i].item(),
+                "eps": self.historical["eps"][row, i].item(),
+                "dividend": self.historical["dividend"][row, i].item()
+            }
+            for i, year in reversed(list(enumerate(HISTORY_YEARS)))
+        ]
+        fundamentals["analystRatings"] = {
+            field: self._value(f"analystRatings.{field}", row) for field in FUNDAMENTAL_LAYOUT["analystRatings"]
+        }
+        fundamentals["fundamental_score"] = self._value("fundamentalScore", row)
+        return fundamentals
+
+    def top(self, count, column="fundamentalScore"):
+        """Symbols with the highest values of a column, listing order among ties"""
+        rows = np.argsort(-self.columns[column], kind="stable")[:count]
+        return [self.stocks[row]["symbol"] for row in rows]
+
+
+def generate_fundamentals_universe(stocks, rng):
+    """Generate fundamentals, quotes and scores for every stock in one vectorized pass"""
+    stocks = list(stocks)
+    n = len(stocks)
+    codes = profile_codes(stock.get("sector", "Unknown") for stock in stocks)
+
+    # Quote fields, as generate_stock_quote draws them
+    symbol_hash = np.array([sum(ord(ch) for ch in stock["symbol"]) for stock in stocks], dtype=float)
+    price = np.round(500 + symbol_hash % 3000 + rng.uniform(-50, 50, n), 2)
+    change = np.round(rng.uniform(-50, 50, n), 2)
+
+    # Valuation multiples scale with the price trend
+    price_trend = rng.uniform(-0.2, 0.3, n)
+    pe = np.maximum(5, _sector_uniform(rng, "pe", codes) * (1 + price_trend))
+    pb = np.maximum(0.5, _sector_uniform(rng, "pb", codes) * (1 + price_trend))
+    ps = np.maximum(0.3, _sector_uniform(rng, "ps", codes) * (1 + price_trend))
+    ev_ebitda = np.maximum(3, _sector_uniform(rng, "evToEbitda", codes) * (1 + price_trend))
+    peg = np.maximum(0.5, _sector_uniform(rng, "peg", codes) * (1 + 0.5 * price_trend))
+
+    shares_outstanding = rng.integers(100, 5001, n) * 1000000.0
+    market_cap = price * shares_outstanding
+
+    # Financial health
+    debt_to_equity = _sector_uniform(rng, "debtToEquity", codes)
+    equity = market_cap / (1 + debt_to_equity)
+    operating_cash_flow = market_cap * rng.uniform(0.05, 0.15, n)
+    capex = operating_cash_flow * rng.uniform(0.2, 0.5, n)
+
+    # Profitability and returns
+    net_margin = _sector_uniform(rng, "netMargin", codes)
+    operating_margin = _sector_uniform(rng, "operatingMargin", codes)
+    roa = net_margin * rng.uniform(0.5, 0.8, n)
+    roic = operating_margin * rng.uniform(0.6, 0.9, n)
+
+    # Growth
+    revenue_growth = _sector_uniform(rng, "revenueGrowth", codes)
+    earnings_growth = revenue_growth * rng.uniform(0.8, 1.5, n)
+    dividend_growth = np.where(earnings_growth > 0, earnings_growth * rng.uniform(0.3, 0.8, n), 0.0)
+    revenue_cagr_5y = revenue_growth * rng.uniform(0.6, 1.2, n)
+
+    dividend_yield = _sector_uniform(rng, "dividendYield", codes)
+    dividend_payout = _sector_uniform(rng, "dividendPayout", codes)
+
+    # Analyst consensus from the ratings distribution
+    buy = rng.integers(0, 16, n)
+    hold = rng.integers(0, 11, n)
+    sell = rng.integers(0, 6, n)
+    total_ratings = np.maximum(buy + hold + sell, 1)
+    consensus = np.where(buy / total_ratings > 0.6, "Buy", np.where(sell / total_ratings > 0.4, "Sell", "Hold"))
+    consensus = np.where(buy + hold + sell == 0, "Hold", consensus)
+    target_multiplier = np.select(
+        [consensus == "Buy", consensus == "Sell"],
+        [rng.uniform(1.05, 1.25, n), rng.uniform(0.75, 0.95, n)],
+        rng.uniform(0.9, 1.1, n)
+    )
+
+    columns = {
+        "price": price,
+        "change": change,
+        "changePercent": np.round(change / price * 100, 2),
+        "valuation.pe": pe,
+        "valuation.pb": pb,
+        "valuation.ps": ps,
+        "valuation.peg": peg,
+        "valuation.evToEbitda": ev_ebitda,
+        "valuation.marketCap": market_cap,
+        "financialHealth.debtToEquity": debt_to_equity,
+        "financialHealth.currentRatio": _sector_uniform(rng, "currentRatio", codes),
+        "financialHealth.quickRatio": _sector_uniform(rng, "quickRatio", codes),
+        "financialHealth.interestCoverage": _sector_uniform(rng, "interestCoverage", codes),
+        "financialHealth.totalDebt": equity * debt_to_equity,
+        "financialHealth.totalCash": market_cap * rng.uniform(0.05, 0.2, n),
+        "financialHealth.operatingCashFlow": operating_cash_flow,
+        "financialHealth.freeCashFlow": operating_cash_flow - capex,
+        "profitability.grossMargin": _sector_uniform(rng, "grossMargin", codes),
+        "profitability.operatingMargin": operating_margin,
+        "profitability.netMargin": net_margin,
+        "profitability.ebitdaMargin": _sector_uniform(rng, "ebitdaMargin", codes),
+        "profitability.returnOnEquity": roa * (1 + debt_to_equity),
+        "profitability.returnOnAssets": roa,
+        "profitability.returnOnInvestedCapital": roic,
+        "growth.revenueGrowth": revenue_growth,
+        "growth.earningsGrowth": earnings_growth,
+        "growth.dividendGrowth": dividend_growth,
+        "growth.5YrRevenueCAGR": revenue_cagr_5y,
+        "growth.5YrEPSCAGR": earnings_growth * rng.uniform(0.7, 1.3, n),
+        "dividend.yield": dividend_yield,
+        "dividend.payout": dividend_payout,
+        "dividend.years": rng.integers(0, 21, n).astype(float),
+        "risks.beta": rng.uniform(0.6, 1.5, n),
+        "risks.volatility": rng.uniform(15, 45, n),
+        "risks.rsquared": rng.uniform(0.3, 0.8, n),
+        "analystRatings.buy": buy.astype(float),
+        "analystRatings.hold": hold.astype(float),
+        "analystRatings.sell": sell.astype(float),
+        "analystRatings.targetPrice": price * target_multiplier,
+    }
+    labels = {"analystRatings.consensus": consensus}
+
+    # Last four quarters: (n, 4) arrays
+    base_quarterly_revenue = market_cap * rng.uniform(0.02, 0.1, n)
+    quarter_index = np.arange(len(QUARTERS))
+    quarter_revenue = base_quarterly_revenue[:, None] * (1 + rng.uniform(-0.05, 0.15, (n, len(QUARTERS))) * quarter_index)
+    quarter_profit = quarter_revenue * (net_margin[:, None] / 100)
+    quarterly = {
+        "revenue": quarter_revenue,
+        "profit": quarter_profit,
+        "eps": quarter_profit / shares_outstanding[:, None] * 10000000  # EPS in rupees
+    }
+
+    # Five years of history: (n, 5) arrays, oldest first
+    year_index = np.arange(len(HISTORY_YEARS))
+    base_annual_revenue = quarter_revenue[:, -1] * 4 * 0.85
+    year_growth = revenue_cagr_5y[:, None] / 100 * (1 + rng.uniform(-0.3, 0.3, (n, len(HISTORY_YEARS))))
+    year_revenue = base_annual_revenue[:, None] * (1 + year_growth) ** year_index
+    year_profit = year_revenue * ((net_margin[:, None] - rng.uniform(-5, 5, (n, len(HISTORY_YEARS)))) / 100)
+    year_eps = year_profit / (shares_outstanding[:, None] * (1 - 0.02 * year_index))  # Buybacks shrink the count
+    historical = {
+        "revenue": year_revenue,
+        "profit": year_profit,
+        "eps": year_eps,
+        "dividend": np.where(dividend_yield[:, None] > 0, year_eps * (dividend_payout[:, None] / 100), 0.0)
+    }
+
+    columns["fundamentalScore"] = fundamental_scores({**columns, **labels}, codes).astype(float)
+    return FundamentalsUniverse(stocks, columns, labels, quarterly, historical)
+
+
+_universe_lock = threading.Lock()
+_universe = {"day": None, "data": None}
+
+
+def get_fundamentals_universe(now=None):
+    """Return the current trading day's fundamentals universe, generating it on first use"""
+    day = time_bucket(FUNDAMENTALS_DAY_SECONDS, now)
+    with _universe_lock:
+        if _universe["day"] != day:
+            _universe["data"] = generate_fundamentals_universe(
+                STOCK_REGISTRY.stocks, seeded_numpy_rng("fundamentals-universe", day)
+            )
+            _universe["day"] = day
+        return _universe["data"]
@@ -0,0 +1,487 @@
+"""
+Technical indicator engine for the IndiStockPredictor platform.
+Every indicator comes in two forms with identical results:
+
+- a streaming state object whose update() costs O(1) per new bar, kept per
+  symbol so live ticks never recompute history, and
+- a vectorized batch function over NumPy arrays of shape (n_bars,) or
+  (n_symbols, n_bars) for backfilling whole histories or the whole universe.
+
+IndicatorState.from_history() seeds the streaming state from a batch pass,
+so a symbol can be backfilled once and then updated bar by bar.
+
+Definitions: SMA is the mean of the last `period` values. EMA uses
+alpha = 2 / (period + 1) seeded with the first value. RSI averages gains and
+losses over `period` changes with a simple mean, as in prediction_demo. MACD
+is EMA(12) - EMA(26) with an EMA(9) signal. Bollinger bands are SMA(20) ±
+2 population standard deviations. ATR uses Wilder smoothing of the true range.
+Values are NaN (batch) or None (streaming) until enough bars are seen.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+# Running sums are recomputed from the window this often to stop float drift
+RESYNC_INTERVAL = 4096
+
+
+class RollingWindow:
+    """Fixed-size window with running sum and sum of squares"""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.updates = 0
+
+    def push(self, value):
+        if len(self.values) == self.size:
+            oldest = self.values[0]
+            self.total -= oldest
+            self.total_sq -= oldest * oldest
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+    def seed(self, values):
+        """Replace the window contents with the last `size` values"""
+        self.values = deque((float(v) for v in values[-self.size:]), maxlen=self.size)
+        self.total = math.fsum(self.values)
+        self.total_sq = math.fsum(v * v for v in self.values)
+
+    def full(self):
+        return len(self.values) == self.size
+
+    def mean(self):
+        return self.total / len(self.values)
+
+    def std(self):
+        """Population standard deviation of the window"""
+        mean = self.mean()
+        return math.sqrt(max(0.0, self.total_sq / len(self.values) - mean * mean))
+
+
+# ---------------------------------------------------------------------------
+# Vectorized batch functions. Inputs are (n_bars,) or (n_symbols, n_bars).
+# ---------------------------------------------------------------------------
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return (values[None, :], True) if values.ndim == 1 else (values, False)
+
+
+def _restore(result, squeeze):
+    return result[0] if squeeze else result
+
+
+def _rolling_sum(values, period):
+    """Sum of each trailing window along the last axis; NaN before the first full window"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] >= period:
+        cs = np.cumsum(values, axis=1)
+        out[:, period - 1] = cs[:, period - 1]
+        out[:, period:] = cs[:, period:] - cs[:, :-period]
+    return out
+
+
+def sma(values, period):
+    """Simple moving average"""
+    values, squeeze = _as_2d(values)
+    return _restore(_rolling_sum(values, period) / period, squeeze)
+
+
+def ema(values, period):
+    """Exponential moving average seeded with the first value"""
+    values, squeeze = _as_2d(values)
+    alpha = 2.0 / (period + 1)
+    out = np.empty(values.shape)
+    if values.shape[1]:
+        out[:, 0] = values[:, 0]
+        # Recursive in time but vectorized across symbols
+        for t in range(1, values.shape[1]):
+            out[:, t] = out[:, t - 1] + alpha * (values[:, t] - out[:, t - 1])
+    return _restore(out, squeeze)
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi_values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    rsi_values = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), rsi_values)
+    return np.where(np.isnan(avg_gain), np.nan, rsi_values)
+
+
+def rsi(close, period=14):
+    """Relative strength index from simple averages of gains and losses"""
+    close, squeeze = _as_2d(close)
+    delta = np.diff(close, axis=1)
+    avg_gain = np.full(close.shape, np.nan)
+    avg_loss = np.full(close.shape, np.nan)
+    avg_gain[:, 1:] = _rolling_sum(np.clip(delta, 0, None), period) / period
+    avg_loss[:, 1:] = _rolling_sum(np.clip(-delta, 0, None), period) / period
+    return _restore(_rsi_from_averages(avg_gain, avg_loss), squeeze)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """Return (macd, signal, histogram)"""
+    line = np.asarray(ema(close, fast)) - np.asarray(ema(close, slow))
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger_bands(close, period=20, num_std=2.0):
+    """Return (upper, middle, lower) using the population standard deviation"""
+    close, squeeze = _as_2d(close)
+    middle = _rolling_sum(close, period) / period
+    mean_sq = _rolling_sum(close * close, period) / period
+    std = np.sqrt(np.clip(mean_sq - middle * middle, 0, None))
+    upper = middle + num_std * std
+    lower = middle - num_std * std
+    return _restore(upper, squeeze), _restore(middle, squeeze), _restore(lower, squeeze)
+
+
+def true_range(high, low, close):
+    """True range; the first bar uses high - low"""
+    high, squeeze = _as_2d(high)
+    low, _ = _as_2d(low)
+    close, _ = _as_2d(close)
+    tr = high - low
+    prev_close = close[:, :-1]
+    tr[:, 1:] = np.maximum(tr[:, 1:], np.maximum(np.abs(high[:, 1:] - prev_close), np.abs(low[:, 1:] - prev_close)))
+    return _restore(tr, squeeze)
+
+
+def atr(high, low, close, period=14):
+    """Average true range with Wilder smoothing, seeded by the mean of the first `period` ranges"""
+    tr, squeeze = _as_2d(true_range(high, low, close))
+    out = np.full(tr.shape, np.nan)
+    if tr.shape[1] >= period:
+        out[:, period - 1] = tr[:, :period].mean(axis=1)
+        for t in range(period, tr.shape[1]):
+            out[:, t] = (out[:, t - 1] * (period - 1) + tr[:, t]) / period
+    return _restore(out, squeeze)
+
+
+# ---------------------------------------------------------------------------
+# Streaming state objects. update() is O(1) and returns the latest value.
+# ---------------------------------------------------------------------------
+
+def _optional(value):
+    """Convert a batch value to the streaming convention (None while warming up)"""
+    return None if value is None or np.isnan(value) else float(value)
+
+
+class SMA:
+    """Streaming simple moving average"""
+
+    def __init__(self, period):
+        self.period = period
+        self.window = RollingWindow(period)
+        self.value = None
+
+    def update(self, x):
+        self.window.push(float(x))
+        self.value = self.window.mean() if self.window.full() else None
+        return self.value
+
+    def seed(self, values):
+        self.window.seed(values)
+        self.value = self.window.mean() if self.window.full() else None
+
+
+class EMA:
+    """Streaming exponential moving average"""
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+
+    def update(self, x):
+        x = float(x)
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        return self.value
+
+    def seed(self, last_value):
+        self.value = _optional(last_value)
+
+
+class RSI:
+    """Streaming relative strength index"""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        self.prev_close = None
+        self.value = None
+
+    def update(self, close):
+        close = float(close)
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            self.gains.push(max(delta, 0.0))
+            self.losses.push(max(-delta, 0.0))
+        self.prev_close = close
+
+        if self.gains.full():
+            avg_gain, avg_loss = self.gains.mean(), self.losses.mean()
+            if avg_loss == 0:
+                self.value = 50.0 if avg_gain == 0 else 100.0
+            else:
+                self.value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        return self.value
+
+    def seed(self, close, value):
+        """Seed from a close history and the batch RSI value at its last bar"""
+        delta = np.diff(close[-(self.period + 1):])
+        self.gains.seed(np.clip(delta, 0, None))
+        self.losses.seed(np.clip(-delta, 0, None))
+        self.prev_close = float(close[-1]) if len(close) else None
+        self.value = _optional(value)
+
+
+class MACD:
+    """Streaming MACD line, signal line and histogram"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = None
+
+    def update(self, close):
+        line = self.fast.update(close) - self.slow.update(close)
+        signal_value = self.signal.update(line)
+        self.value = (line, signal_value, line - signal_value)
+        return self.value
+
+    def seed(self, fast_value, slow_value, signal_value):
+        """Seed from the batch fast/slow EMAs and signal line at the last bar"""
+        self.fast.seed(fast_value)
+        self.slow.seed(slow_value)
+        self.signal.seed(signal_value)
+        line = self.fast.value - self.slow.value
+        self.value = (line, self.signal.value, line - self.signal.value)
+
+
+class BollingerBands:
+    """Streaming Bollinger bands"""
+
+    def __init__(self, period=20, num_std=2.0):
+        self.period = period
+        self.num_std = num_std
+        self.window = RollingWindow(period)
+        self.value = None
+
+    def _current(self):
+        if not self.window.full():
+            return None
+        middle = self.window.mean()
+        spread = self.num_std * self.window.std()
+        return (middle + spread, middle, middle - spread)
+
+    def update(self, close):
+        self.window.push(float(close))
+        self.value = self._current()
+        return self.value
+
+    def seed(self, close):
+        self.window.seed(close)
+        self.value = self._current()
+
+
+class ATR:
+    """Streaming average true range with Wilder smoothing"""
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self.warmup = []
+        self.value = None
+
+    def update(self, high, low, close):
+        high, low, close = float(high), float(low), float(close)
+        tr = high - low
+        if self.prev_close is not None:
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+
+        if self.value is not None:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+        else:
+            self.warmup.append(tr)
+            if len(self.warmup) == self.period:
+                self.value = sum(self.warmup) / self.period
+                self.warmup = []
+        return self.value
+
+    def seed(self, high, low, close, value):
+        """Seed from a bar history and the batch ATR value at its last bar"""
+        self.prev_close = float(close[-1]) if len(close) else None
+        self.value = _optional(value)
+        # Still warming up: keep the true ranges seen so far (fewer than `period`)
+        self.warmup = [] if self.value is not None else [float(v) for v in true_range(high, low, close)]
+
+
+# Indicator periods shared by the streaming and batch modes
+SMA_PERIODS = (20, 50, 200)
+EMA_PERIODS = (12, 26)
+RSI_PERIOD = 14
+BOLLINGER_PERIOD = 20
+BOLLINGER_STD = 2.0
+ATR_PERIOD = 14
+
+# Keys of an indicator snapshot, in output order
+INDICATOR_KEYS = (
+    [f"sma{p}" for p in SMA_PERIODS]
+    + [f"ema{p}" for p in EMA_PERIODS]
+    + [f"rsi{RSI_PERIOD}", "macd", "macdSignal", "macdHistogram",
+       "bollingerUpper", "bollingerMiddle", "bollingerLower", f"atr{ATR_PERIOD}"]
+)
+
+
+def compute_indicators(high, low, close):
+    """
+    Compute every indicator over whole histories at once.
+    Inputs are (n_bars,) or (n_symbols, n_bars); returns {key: array} with
+    the same shape, keyed like IndicatorState.snapshot().
+    """
+    result = {f"sma{p}": sma(close, p) for p in SMA_PERIODS}
+    result.update({f"ema{p}": ema(close, p) for p in EMA_PERIODS})
+    result[f"rsi{RSI_PERIOD}"] = rsi(close, RSI_PERIOD)
+    result["macd"], result["macdSignal"], result["macdHistogram"] = macd(close)
+    result["bollingerUpper"], result["bollingerMiddle"], result["bollingerLower"] = bollinger_bands(
+        close, BOLLINGER_PERIOD, BOLLINGER_STD
+    )
+    result[f"atr{ATR_PERIOD}"] = atr(high, low, close, ATR_PERIOD)
+    return result
+
+
+def _ema_value(latest, period, close):
+    """Latest EMA for a period, from the batch results when that period was computed"""
+    key = f"ema{period}"
+    return latest[key] if key in latest else ema(close, period)[-1]
+
+
+class IndicatorState:
+    """All streaming indicators for one symbol"""
+
+    def __init__(self):
+        self.smas = {p: SMA(p) for p in SMA_PERIODS}
+        self.emas = {p: EMA(p) for p in EMA_PERIODS}
+        self.rsi = RSI(RSI_PERIOD)
+        self.macd = MACD()
+        self.bollinger = BollingerBands(BOLLINGER_PERIOD, BOLLINGER_STD)
+        self.atr = ATR(ATR_PERIOD)
+        self.bars = 0
+        self.last_close = None
+
+    @classmethod
+    def from_history(cls, high, low, close):
+        """Build a state that has already seen the given bars, using the batch functions"""
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        if len(close) == 0:
+            return cls()
+        latest = {key: values[-1] for key, values in compute_indicators(high, low, close).items()}
+        return cls.from_batch(high, low, close, latest)
+
+    @classmethod
+    def from_batch(cls, high, low, close, latest):
+        """
+        Build a state from a bar history and the batch indicator values at its
+        last bar (one column of compute_indicators output), without recomputing.
+        """
+        state = cls()
+        if len(close) == 0:
+            return state
+        for sma_state in state.smas.values():
+            sma_state.seed(close)
+        for period, ema_state in state.emas.items():
+            ema_state.seed(latest[f"ema{period}"])
+        state.rsi.seed(close, latest[f"rsi{RSI_PERIOD}"])
+        fast, slow = state.macd.fast.period, state.macd.slow.period
+        fast_value, slow_value = _ema_value(latest, fast, close), _ema_value(latest, slow, close)
+        state.macd.seed(fast_value, slow_value, latest["macdSignal"])
+        state.bollinger.seed(close)
+        state.atr.seed(high, low, close, latest[f"atr{ATR_PERIOD}"])
+        state.bars = len(close)
+        state.last_close = float(close[-1])
+        return state
+
+    def update(self, high, low, close):
+        """Feed one new bar and return the updated snapshot"""
+        for sma_state in self.smas.values():
+            sma_state.update(close)
+        for ema_state in self.emas.values():
+            ema_state.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bollinger.update(close)
+        self.atr.update(high, low, close)
+        self.bars += 1
+        self.last_close = float(close)
+        return self.snapshot()
+
+    def snapshot(self):
+        """Current value of every indicator (None until warmed up)"""
+        result = {f"sma{p}": s.value for p, s in self.smas.items()}
+        result.update({f"ema{p}": e.value for p, e in self.emas.items()})
+        result[f"rsi{RSI_PERIOD}"] = self.rsi.value
+        result["macd"], result["macdSignal"], result["macdHistogram"] = self.macd.value or (None, None, None)
+        result["bollingerUpper"], result["bollingerMiddle"], result["bollingerLower"] = (
+            self.bollinger.value or (None, None, None)
+        )
+        result[f"atr{ATR_PERIOD}"] = self.atr.value
+        return result
+
+
+class IndicatorEngine:
+    """Per-symbol indicator states for a universe of symbols"""
+
+    def __init__(self):
+        self.states = {}
+
+    def __contains__(self, symbol):
+        return symbol in self.states
+
+    def backfill(self, symbol, high, low, close):
+        """Seed a symbol's state from its full history"""
+        self.states[symbol] = IndicatorState.from_history(high, low, close)
+        return self.states[symbol].snapshot()
+
+    def backfill_many(self, symbols, high, low, close):
+        """
+        Seed many symbols from (n_symbols, n_bars) arrays with one vectorized
+        batch pass. Returns the batch results so callers can reuse them.
+        """
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        batch = compute_indicators(high, low, close)
+
+        for i, symbol in enumerate(symbols):
+            latest = {key: values[i, -1] for key, values in batch.items()}
+            self.states[symbol] = IndicatorState.from_batch(high[i], low[i], close[i], latest)
+        return batch
+
+    def update(self, symbol, high, low, close):
+        """Apply one new bar for a symbol, creating its state on first use"""
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = IndicatorState()
+        return state.update(high, low, close)
+
+    def snapshot(self, symbol):
+        """Latest indicator values for a symbol, or None if it was never seen"""
+        state = self.states.get(symbol)
+        return state.snapshot() if state is not None else None
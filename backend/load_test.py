@@ -0,0 +1,389 @@
+"""
+IndiStockPredictor - Traffic Replay Load Test
+
+Replays the API calls the React pages make when they load, at a configurable
+number of concurrent virtual users, against a running mock_server.py (or the
+Flask app in-process), and reports throughput and tail latency per route:
+
+  home             HomePage: recommended stocks and indices, sometimes a search
+                   (search, then one batch request for the results)
+  stock_details    StockDetailsPage: details, prediction, fundamentals, news, technical
+  market_overview  MarketOverviewPage: indices, top gainers/losers, sectors, overview
+  screener         StockScreenerPage: a range screen and an expression screen
+  portfolio        PortfolioPage: holdings and performance, sometimes a search
+
+Each virtual user picks a page by weight and a symbol by popularity (large
+caps draw most detail views), requests the page's calls in order, waits the
+think time and repeats. Results can be written as JSON and compared with an
+earlier run to size workers before a market-open spike.
+
+Usage: python load_test.py [--url http://localhost:5000] [--users 50] [--duration 30]
+                           [--mix home=3,stock_details=4] [--output run.json] [--compare previous.json]
+       python load_test.py --in-process --users 8 --duration 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+
+from stock_registry import STOCK_REGISTRY
+
+DEFAULT_URL = "http://localhost:5000"
+DEFAULT_USERS = 20
+DEFAULT_DURATION = 30
+DEFAULT_TIMEOUT = 30
+
+# Share of page loads per page; stock pages dominate around market open
+PAGE_WEIGHTS = {
+    "home": 25,
+    "stock_details": 40,
+    "market_overview": 15,
+    "screener": 10,
+    "portfolio": 10,
+}
+
+SEARCH_PROBABILITY = {"home": 0.3, "portfolio": 0.2}
+SEARCH_TERMS = ("tata", "bank", "reliance", "infy", "hdfc", "auto", "pharma", "steel", "adani", "power")
+
+SCREENER_RANGES = (
+    "min_pe=10&max_pe=25&sort=marketCap&order=desc&limit=50",
+    "min_dividend_yield=2&sort=dividendYield&order=desc&limit=50",
+    "max_price=1500&min_market_cap=100000000000&limit=50",
+)
+SCREENER_QUERIES = (
+    "ROE > 15 and D/E < 0.5",
+    "PE < 20 and dividendYield > 1",
+    "sector in (IT, Pharma) and score > 60",
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def page_requests(page, symbol, rng):
+    """(route, url) pairs a page loads, in the order its effects dispatch them"""
+    if page == "home":
+        return [("/api/stock/recommended", "/api/stock/recommended"),
+                ("/api/market/indices", "/api/market/indices")]
+    if page == "stock_details":
+        # fetchStockPrediction is dispatched with a bare symbol, so the page currently
+        # requests /stock/undefined/prediction; replay the intended per-symbol call
+        return [("/api/stock/<symbol>", f"/api/stock/{symbol}"),
+                ("/api/stock/<symbol>/prediction", f"/api/stock/{symbol}/prediction?days=30"),
+                ("/api/stock/<symbol>/fundamentals", f"/api/stock/{symbol}/fundamentals"),
+                ("/api/stock/<symbol>/news", f"/api/stock/{symbol}/news"),
+                ("/api/stock/<symbol>/technical", f"/api/stock/{symbol}/technical")]
+    if page == "market_overview":
+        return [("/api/market/indices", "/api/market/indices"),
+                ("/api/market/top-gainers", "/api/market/top-gainers?limit=5"),
+                ("/api/market/top-losers", "/api/market/top-losers?limit=5"),
+                ("/api/market/sector-performance", "/api/market/sector-performance"),
+                ("/api/market/overview", "/api/market/overview")]
+    if page == "screener":
+        # The page filters client-side mock data today; replay the server screeners it maps onto
+        return [("/api/fundamental/screener", "/api/fundamental/screener?" + rng.choice(SCREENER_RANGES)),
+                ("/api/fundamental/screen", "/api/fundamental/screen?q=" + quote(rng.choice(SCREENER_QUERIES)))]
+    if page == "portfolio":
+        return [("/api/portfolio", "/api/portfolio"),
+                ("/api/portfolio/performance", "/api/portfolio/performance")]
+    raise ValueError(f"Unknown page: {page}")
+
+
+def parse_mix(text):
+    """'home=3,stock_details=5' -> page weights; pages left out keep no traffic"""
+    weights = {}
+    for part in (text or "").split(","):
+        if not part.strip():
+            continue
+        page, _, weight = part.partition("=")
+        page = page.strip()
+        if page not in PAGE_WEIGHTS:
+            raise ValueError(f"Unknown page {page!r} (pages: {', '.join(PAGE_WEIGHTS)})")
+        weights[page] = float(weight) if weight.strip() else 1.0
+    if not weights or sum(weights.values()) <= 0:
+        raise ValueError("Page mix needs at least one page with a positive weight")
+    return weights
+
+
+def symbol_weights(stocks):
+    """Popularity weights: the registry lists large caps first, so weight falls off with rank"""
+    return [1 / (rank + 1) for rank in range(len(stocks))]
+
+
+class HttpTarget:
+    """Keep-alive HTTP connection to a running server, one per virtual user"""
+
+    def __init__(self, url, timeout=DEFAULT_TIMEOUT):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+        self.prefix = parts.path.rstrip("/")
+
+    def get(self, url):
+        """Return (status, body bytes); connection errors are raised"""
+        try:
+            self.connection.request("GET", self.prefix + url, headers={"Accept": "application/json"})
+            response = self.connection.getresponse()
+            body = response.read()
+            if response.will_close:
+                self.connection.close()
+            return response.status, body
+        except (OSError, http.client.HTTPException):
+            # Drop the broken connection; the next request reconnects
+            self.connection.close()
+            raise
+
+    def close(self):
+        self.connection.close()
+
+
+class InProcessTarget:
+    """Flask test client for load runs without a server (measures the app, not the network)"""
+
+    def __init__(self):
+        import mock_server
+        self.client = mock_server.app.test_client()
+
+    def get(self, url):
+        response = self.client.get(url)
+        return response.status_code, response.get_data()
+
+    def close(self):
+        pass
+
+
+class RouteRecorder:
+    """Latencies, statuses and payload sizes per route, shared by all virtual users"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.pages = {}
+
+    def record(self, route, seconds, status, size):
+        with self.lock:
+            entry = self.routes.setdefault(route, {"latencies": [], "errors": 0, "bytes": 0, "statuses": {}})
+            entry["latencies"].append(seconds)
+            entry["bytes"] += size
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            if status == 0 or status >= 400:
+                entry["errors"] += 1
+
+    def record_page(self, page, seconds):
+        with self.lock:
+            self.pages.setdefault(page, []).append(seconds)
+
+
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def latency_summary(latencies, elapsed):
+    """Count, throughput and latency quantiles in milliseconds"""
+    ordered = sorted(latencies)
+    summary = {"requests": len(ordered), "throughput": round(len(ordered) / elapsed, 2) if elapsed else 0.0}
+    if ordered:
+        summary["meanMs"] = round(sum(ordered) / len(ordered) * 1000, 3)
+        for q in QUANTILES:
+            summary[f"p{int(q * 100)}Ms"] = round(_quantile(ordered, q) * 1000, 3)
+        summary["maxMs"] = round(ordered[-1] * 1000, 3)
+    return summary
+
+
+def virtual_user(user_id, target, recorder, weights, deadline, think, seed, visits=None):
+    """Load pages until the deadline (or visit budget) runs out"""
+    rng = random.Random(f"{seed}-{user_id}")
+    pages = list(weights)
+    page_weights = [weights[page] for page in pages]
+    stocks = STOCK_REGISTRY.stocks
+    popularity = symbol_weights(stocks)
+    done = 0
+
+    while time.time() < deadline and (visits is None or done < visits):
+        page = rng.choices(pages, page_weights)[0]
+        symbol = rng.choices(stocks, popularity)[0]["symbol"]
+        requests = page_requests(page, symbol, rng)
+        searches = rng.random() < SEARCH_PROBABILITY.get(page, 0)
+
+        page_started = time.perf_counter()
+        for route, url in requests:
+            _timed_get(target, recorder, route, url)
+        if searches:
+            _search(target, recorder, rng.choice(SEARCH_TERMS))
+        recorder.record_page(page, time.perf_counter() - page_started)
+        done += 1
+
+        if think:
+            time.sleep(rng.uniform(0.5 * think, 1.5 * think))
+    target.close()
+
+
+def _timed_get(target, recorder, route, url):
+    started = time.perf_counter()
+    try:
+        status, body = target.get(url)
+    except Exception:
+        status, body = 0, b""
+    recorder.record(route, time.perf_counter() - started, status, len(body))
+    return status, body
+
+
+def _search(target, recorder, term):
+    """searchStocks: the search request, then one batch request for up to 100 results"""
+    status, body = _timed_get(target, recorder, "/api/search", f"/api/search?query={quote(term)}")
+    if status != 200:
+        return
+    try:
+        symbols = [item["symbol"] for item in json.loads(body)[:100]]
+    except (ValueError, KeyError, TypeError):
+        return
+    if symbols:
+        _timed_get(target, recorder, "/api/stocks/batch", "/api/stocks/batch?symbols=" + quote(",".join(symbols)))
+
+
+def run_load(make_target, users=DEFAULT_USERS, duration=DEFAULT_DURATION, weights=None, think=0.0,
+             seed=0, visits=None):
+    """Run `users` virtual users for `duration` seconds and return the results document"""
+    weights = weights or dict(PAGE_WEIGHTS)
+    recorder = RouteRecorder()
+    deadline = time.time() + duration
+    per_user_visits = None if visits is None else max(1, visits // users)
+
+    threads = [
+        threading.Thread(
+            target=virtual_user,
+            args=(i, make_target(), recorder, weights, deadline, think, seed, per_user_visits),
+            daemon=True
+        )
+        for i in range(users)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [latency for entry in recorder.routes.values() for latency in entry["latencies"]]
+    total_errors = sum(entry["errors"] for entry in recorder.routes.values())
+    routes = {}
+    for route, entry in sorted(recorder.routes.items()):
+        routes[route] = {
+            **latency_summary(entry["latencies"], elapsed),
+            "errors": entry["errors"],
+            "avgBytes": round(entry["bytes"] / len(entry["latencies"])),
+            "statuses": {str(status): count for status, count in sorted(entry["statuses"].items())},
+        }
+
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "config": {"users": users, "duration": duration, "think": think, "seed": seed, "mix": weights},
+        "elapsedSeconds": round(elapsed, 2),
+        "total": {**latency_summary(all_latencies, elapsed), "errors": total_errors},
+        "routes": routes,
+        "pages": {page: latency_summary(latencies, elapsed) for page, latencies in sorted(recorder.pages.items())},
+    }
+
+
+def format_report(run):
+    """Per-route and per-page tables"""
+    header = f"  {'':<36} {'reqs':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+
+    def row(label, stats, errors=None):
+        if not stats.get("requests"):
+            return f"  {label:<36} {0:>7}"
+        line = (f"  {label:<36} {stats['requests']:>7} {stats['throughput']:>8.1f} {stats['p50Ms']:>9.2f} "
+                f"{stats['p95Ms']:>9.2f} {stats['p99Ms']:>9.2f} {stats['maxMs']:>9.2f}")
+        return line + (f"  {errors} errors" if errors else "")
+
+    config = run["config"]
+    lines = [f"\n{config['users']} users for {run['elapsedSeconds']}s (think {config['think']}s)", "\nRoutes", header]
+    lines += [row(route, stats, stats["errors"]) for route, stats in run["routes"].items()]
+    lines += ["\nPages", header]
+    lines += [row(page, stats) for page, stats in run["pages"].items()]
+    lines += ["", row("TOTAL", run["total"], run["total"]["errors"])]
+    return "\n".join(lines)
+
+
+def compare_runs(previous, current, metric="p95Ms", threshold=0.1):
+    """
+    Per-route throughput and `metric` of two runs, slowest latency change first.
+    Rows are (route, old req/s, new req/s, old ms, new ms, ratio, regressed).
+    """
+    rows = []
+    for route, stats in current["routes"].items():
+        old = previous.get("routes", {}).get(route)
+        if not old or not old.get(metric) or metric not in stats:
+            continue
+        ratio = stats[metric] / old[metric]
+        rows.append((route, old["throughput"], stats["throughput"], old[metric], stats[metric],
+                     ratio, ratio > 1 + threshold))
+    rows.sort(key=lambda row: row[5], reverse=True)
+    return rows
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Replay per-page API traffic against the mock server")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Server base URL")
+    parser.add_argument("--in-process", action="store_true", help="Drive the Flask app directly instead of a server")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds to run")
+    parser.add_argument("--visits", type=int, help="Stop after about this many page loads in total")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean seconds a user waits between pages")
+    parser.add_argument("--mix", help=f"Page weights, e.g. home=3,stock_details=5 (pages: {', '.join(PAGE_WEIGHTS)})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for page, symbol and query choices")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--compare", help="Earlier results file to compare p95 latency and throughput against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="p95 slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    try:
+        weights = parse_mix(args.mix) if args.mix else dict(PAGE_WEIGHTS)
+    except ValueError as e:
+        print(str(e))
+        return 1
+
+    if args.in_process:
+        make_target = InProcessTarget
+        where = "in-process Flask app"
+    else:
+        make_target = lambda: HttpTarget(args.url, args.timeout)
+        where = args.url
+    print(f"Replaying {', '.join(f'{page}={weight:g}' for page, weight in weights.items())} "
+          f"with {args.users} users against {where}")
+
+    run = run_load(make_target, args.users, args.duration, weights, args.think, args.seed, args.visits)
+    run["config"]["target"] = where
+    print(format_report(run))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults written to {os.path.abspath(args.output)}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        rows = compare_runs(previous, run, threshold=args.threshold)
+        regressions = sum(1 for row in rows if row[6])
+        print(f"\nCompared with {args.compare}: {regressions} of {len(rows)} routes slower at p95 by more than "
+              f"{args.threshold:.0%}")
+        for route, old_rps, new_rps, old_ms, new_ms, ratio, regressed in rows:
+            marker = "  <-- slower" if regressed else ""
+            print(f"  {route:<36} {old_rps:>8.1f} -> {new_rps:>8.1f} req/s  p95 {old_ms:>8.2f} -> {new_ms:>8.2f} ms"
+                  f"  x{ratio:.2f}{marker}")
+        return 2 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,18 @@ Enhanced market data for the IndiStockPredictor platform.
 Provides realistic market indices and sector performance data.
 """
 
-import random
+import threading
 from datetime import datetime, timedelta
 
+from seeded_random import seeded_rng, unseeded_rng, time_bucket
+
+# Market data is generated once per tick and shared by every market endpoint
+MARKET_TICK_SECONDS = 60
+MARKET_MOVER_COUNT = 10
+
+_snapshot_lock = threading.Lock()
+_snapshot = {"tick": None, "data": None}
+
 # Major Indian Market Indices
 MARKET_INDICES = [
     {
@@ -124,19 +133,21 @@ SECTORS = [
     }
 ]
 
-def generate_realistic_index_values():
+def generate_realistic_index_values(rng=None):
     """Generate realistic values for market indices with proper correlations"""
+    rng = rng or unseeded_rng()
+    
     # Base values and sentiment
-    nifty_50_value = round(random.uniform(19500, 20500), 2)
-    market_sentiment = random.uniform(-1.5, 1.5)  # Overall market sentiment
+    nifty_50_value = round(rng.uniform(19500, 20500), 2)
+    market_sentiment = rng.uniform(-1.5, 1.5)  # Overall market sentiment
     
     # First generate Nifty and Sensex with high correlation
-    nifty_change_percent = market_sentiment + random.uniform(-0.5, 0.5)
-    sensex_change_percent = nifty_change_percent * random.uniform(0.95, 1.05)  # High correlation with small variation
+    nifty_change_percent = market_sentiment + rng.uniform(-0.5, 0.5)
+    sensex_change_percent = nifty_change_percent * rng.uniform(0.95, 1.05)  # High correlation with small variation
     
     # VIX typically moves opposite to the market, especially on big moves
     vix_base = 15 + abs(market_sentiment) * 3
-    vix_change = -1 * nifty_change_percent * random.uniform(1.5, 2.5) if abs(nifty_change_percent) > 1 else random.uniform(-3, 3)
+    vix_change = -1 * nifty_change_percent * rng.uniform(1.5, 2.5) if abs(nifty_change_percent) > 1 else rng.uniform(-3, 3)
     
     index_values = []
     
@@ -147,64 +158,64 @@ def generate_realistic_index_values():
         if symbol == "NIFTY 50":
             value = nifty_50_value
             change_percent = nifty_change_percent
-            volume = random.randint(150000, 250000)
+            volume = rng.randint(150000, 250000)
         elif symbol == "SENSEX":
             value = nifty_50_value * 3.3  # Sensex is roughly 3.3x Nifty 50
             change_percent = sensex_change_percent
-            volume = random.randint(120000, 220000)
+            volume = rng.randint(120000, 220000)
         elif symbol == "INDIA VIX":
             value = vix_base
             change_percent = vix_change
-            volume = random.randint(50000, 100000)
+            volume = rng.randint(50000, 100000)
         else:
             # Sector indices have some correlation to main indices but with more variation
             # Different sectors respond differently to market conditions
             if symbol == "NIFTY BANK":
                 sector_sensitivity = 1.2  # Banks tend to be high beta
-                sector_specific = random.uniform(-0.8, 0.8)
+                sector_specific = rng.uniform(-0.8, 0.8)
                 base_value = 46000
             elif symbol == "NIFTY IT":
                 sector_sensitivity = 0.9
-                sector_specific = random.uniform(-1.0, 1.0)
+                sector_specific = rng.uniform(-1.0, 1.0)
                 base_value = 32000
             elif symbol == "NIFTY AUTO":
                 sector_sensitivity = 1.0
-                sector_specific = random.uniform(-0.9, 0.9)
+                sector_specific = rng.uniform(-0.9, 0.9)
                 base_value = 18500
             elif symbol == "NIFTY FMCG":
                 sector_sensitivity = 0.7  # Defensive sector
-                sector_specific = random.uniform(-0.6, 0.6)
+                sector_specific = rng.uniform(-0.6, 0.6)
                 base_value = 52000
             elif symbol == "NIFTY PHARMA":
                 sector_sensitivity = 0.8  # Another defensive sector
-                sector_specific = random.uniform(-0.7, 0.7)
+                sector_specific = rng.uniform(-0.7, 0.7)
                 base_value = 17000
             elif symbol == "NIFTY METAL":
                 sector_sensitivity = 1.4  # High beta cyclical sector
-                sector_specific = random.uniform(-1.2, 1.2)
+                sector_specific = rng.uniform(-1.2, 1.2)
                 base_value = 8000
             elif symbol == "NIFTY REALTY":
                 sector_sensitivity = 1.5  # High beta sector
-                sector_specific = random.uniform(-1.1, 1.1)
+                sector_specific = rng.uniform(-1.1, 1.1)
                 base_value = 900
             else:
                 sector_sensitivity = 1.0
-                sector_specific = random.uniform(-1.0, 1.0)
+                sector_specific = rng.uniform(-1.0, 1.0)
                 base_value = 15000
             
             # Calculate sector index value and change
-            value = base_value * (1 + random.uniform(-0.05, 0.05))
+            value = base_value * (1 + rng.uniform(-0.05, 0.05))
             change_percent = (market_sentiment * sector_sensitivity) + sector_specific
-            volume = random.randint(40000, 150000)
+            volume = rng.randint(40000, 150000)
         
         # Calculate actual change
         change = round(value * change_percent / 100, 2)
         
         # Generate high, low, open values
         prev_close = value - change
-        day_high = value * (1 + random.uniform(0, 0.005)) if change > 0 else prev_close * (1 + random.uniform(0, 0.003))
-        day_low = prev_close * (1 - random.uniform(0, 0.005)) if change < 0 else value * (1 - random.uniform(0, 0.003))
-        day_open = prev_close * (1 + random.uniform(-0.003, 0.003))
+        day_high = value * (1 + rng.uniform(0, 0.005)) if change > 0 else prev_close * (1 + rng.uniform(0, 0.003))
+        day_low = prev_close * (1 - rng.uniform(0, 0.005)) if change < 0 else value * (1 - rng.uniform(0, 0.003))
+        day_open = prev_close * (1 + rng.uniform(-0.003, 0.003))
         
         # Ensure logical values
         day_high = max(day_high, value, day_open)
@@ -225,32 +236,34 @@ def generate_realistic_index_values():
     
     return index_values
 
-def generate_detailed_sector_performance():
+def generate_detailed_sector_performance(rng=None):
     """Generate detailed sector performance with insights and trends"""
+    rng = rng or unseeded_rng()
+    
     sector_data = []
     
     # Base market trend affects all sectors to some degree
-    market_trend = random.uniform(-2, 3)
+    market_trend = rng.uniform(-2, 3)
     
     for sector in SECTORS:
         # Sector-specific variation
-        sector_specific = random.uniform(-2.5, 2.5)
+        sector_specific = rng.uniform(-2.5, 2.5)
         
         # Calculate sector performance
         change_percent = market_trend + sector_specific
         
         # Pick random trends and insights
-        active_trends = random.sample(sector["trends"], min(2, len(sector["trends"])))
+        active_trends = rng.sample(sector["trends"], min(2, len(sector["trends"])))
         key_metrics_insights = []
         
-        for metric in random.sample(sector["key_metrics"], min(2, len(sector["key_metrics"]))):
-            trend = random.choice(["improving", "stable", "declining"])
+        for metric in rng.sample(sector["key_metrics"], min(2, len(sector["key_metrics"]))):
+            trend = rng.choice(["improving", "stable", "declining"])
             key_metrics_insights.append(f"{metric}: {trend}")
         
         # Select active subsectors with their own performance
         active_subsectors = []
         for subsector in sector["subsectors"]:
-            subsector_change = change_percent + random.uniform(-1.5, 1.5)
+            subsector_change = change_percent + rng.uniform(-1.5, 1.5)
             active_subsectors.append({
                 "name": subsector,
                 "changePercent": round(subsector_change, 2)
@@ -263,8 +276,8 @@ def generate_detailed_sector_performance():
             "subsectors": active_subsectors,
             "trends": active_trends,
             "insights": key_metrics_insights,
-            "volume": random.randint(5000000, 50000000),
-            "marketCap": round(random.uniform(100000, 5000000), 2)  # in crores
+            "volume": rng.randint(5000000, 50000000),
+            "marketCap": round(rng.uniform(100000, 5000000), 2)  # in crores
         })
     
     # Sort by performance
@@ -272,46 +285,48 @@ def generate_detailed_sector_performance():
     
     return sector_data
 
-def generate_market_breadth():
+def generate_market_breadth(rng=None):
     """Generate detailed market breadth data"""
+    rng = rng or unseeded_rng()
+    
     # Generate advances, declines for different segments
-    total_stocks = random.randint(3800, 4200)
+    total_stocks = rng.randint(3800, 4200)
     
     # Overall market breadth
-    advances = random.randint(int(total_stocks * 0.3), int(total_stocks * 0.7))
-    declines = total_stocks - advances - random.randint(50, 150)  # Some unchanged
+    advances = rng.randint(int(total_stocks * 0.3), int(total_stocks * 0.7))
+    declines = total_stocks - advances - rng.randint(50, 150)  # Some unchanged
     unchanged = total_stocks - advances - declines
     
     # Segment-specific breadth
-    nse_advances = random.randint(int(advances * 0.4), int(advances * 0.6))
+    nse_advances = rng.randint(int(advances * 0.4), int(advances * 0.6))
     bse_advances = advances - nse_advances
     
-    nse_declines = random.randint(int(declines * 0.4), int(declines * 0.6))
+    nse_declines = rng.randint(int(declines * 0.4), int(declines * 0.6))
     bse_declines = declines - nse_declines
     
-    nse_unchanged = random.randint(int(unchanged * 0.4), int(unchanged * 0.6))
+    nse_unchanged = rng.randint(int(unchanged * 0.4), int(unchanged * 0.6))
     bse_unchanged = unchanged - nse_unchanged
     
     # Market cap segments
-    large_cap_advances = random.randint(int(nse_advances * 0.3), int(nse_advances * 0.4))
-    mid_cap_advances = random.randint(int(nse_advances * 0.3), int(nse_advances * 0.4))
+    large_cap_advances = rng.randint(int(nse_advances * 0.3), int(nse_advances * 0.4))
+    mid_cap_advances = rng.randint(int(nse_advances * 0.3), int(nse_advances * 0.4))
     small_cap_advances = nse_advances - large_cap_advances - mid_cap_advances
     
-    large_cap_declines = random.randint(int(nse_declines * 0.2), int(nse_declines * 0.3))
-    mid_cap_declines = random.randint(int(nse_declines * 0.3), int(nse_declines * 0.4))
+    large_cap_declines = rng.randint(int(nse_declines * 0.2), int(nse_declines * 0.3))
+    mid_cap_declines = rng.randint(int(nse_declines * 0.3), int(nse_declines * 0.4))
     small_cap_declines = nse_declines - large_cap_declines - mid_cap_declines
     
     # Generate 52-week highs and lows
-    week_high = random.randint(50, 150)
-    week_low = random.randint(30, 120)
+    week_high = rng.randint(50, 150)
+    week_low = rng.randint(30, 120)
     
     # Volume and turnover data
-    total_volume = random.randint(15000, 25000)  # in millions
-    equity_volume = random.randint(int(total_volume * 0.7), int(total_volume * 0.9))
+    total_volume = rng.randint(15000, 25000)  # in millions
+    equity_volume = rng.randint(int(total_volume * 0.7), int(total_volume * 0.9))
     derivative_volume = total_volume - equity_volume
     
-    total_turnover = random.randint(80000, 150000)  # in crores
-    equity_turnover = random.randint(int(total_turnover * 0.6), int(total_turnover * 0.8))
+    total_turnover = rng.randint(80000, 150000)  # in crores
+    equity_turnover = rng.randint(int(total_turnover * 0.6), int(total_turnover * 0.8))
     derivative_turnover = total_turnover - equity_turnover
     
     return {
@@ -340,17 +355,17 @@ def generate_market_breadth():
             "largeCap": {
                 "advances": large_cap_advances,
                 "declines": large_cap_declines,
-                "unchanged": random.randint(10, 30)
+                "unchanged": rng.randint(10, 30)
             },
             "midCap": {
                 "advances": mid_cap_advances,
                 "declines": mid_cap_declines,
-                "unchanged": random.randint(15, 40)
+                "unchanged": rng.randint(15, 40)
             },
             "smallCap": {
                 "advances": small_cap_advances,
                 "declines": small_cap_declines,
-                "unchanged": random.randint(20, 50)
+                "unchanged": rng.randint(20, 50)
             }
         },
         "weekStats": {
@@ -364,13 +379,15 @@ def generate_market_breadth():
             "totalTurnover": total_turnover,
             "equityTurnover": equity_turnover,
             "derivativeTurnover": derivative_turnover,
-            "volumeGrowth": round(random.uniform(-10, 15), 2)
+            "volumeGrowth": round(rng.uniform(-10, 15), 2)
         },
         "timestamp": datetime.now().isoformat()
     }
 
-def generate_market_movers(top_count=10):
+def generate_market_movers(top_count=10, rng=None):
     """Generate top gainers and losers across the market"""
+    rng = rng or unseeded_rng()
+    
     # Instead of importing from mock_server, define a sample list locally
     SAMPLE_STOCKS = [
         {"symbol": "RELIANCE", "name": "Reliance Industries Ltd.", "sector": "Energy"},
@@ -405,9 +422,12 @@ def generate_market_movers(top_count=10):
         {"symbol": "JSWSTEEL", "name": "JSW Steel Ltd.", "sector": "Metal"}
     ]
     
+    # Gainers, losers and most active each take a separate slice of the list
+    top_count = min(top_count, len(SAMPLE_STOCKS) // 3)
+    
     # Create shuffled copy of stocks for variety
     stocks_copy = SAMPLE_STOCKS.copy()
-    random.shuffle(stocks_copy)
+    rng.shuffle(stocks_copy)
     
     # Generate top gainers with strong positive movement
     gainers = []
@@ -415,7 +435,7 @@ def generate_market_movers(top_count=10):
         stock = stocks_copy[i]
         symbol_hash = sum(ord(c) for c in stock["symbol"])
         base_price = 500 + (symbol_hash % 3000)
-        change_percent = round(random.uniform(3.5, 15.0), 2)
+        change_percent = round(rng.uniform(3.5, 15.0), 2)
         change = round(base_price * change_percent / 100, 2)
         
         gainers.append({
@@ -425,7 +445,7 @@ def generate_market_movers(top_count=10):
             "price": base_price + change,
             "change": change,
             "changePercent": change_percent,
-            "volume": random.randint(500000, 5000000)
+            "volume": rng.randint(500000, 5000000)
         })
     
     # Sort gainers by change percent
@@ -437,7 +457,7 @@ def generate_market_movers(top_count=10):
         stock = stocks_copy[i + top_count]  # Use different stocks
         symbol_hash = sum(ord(c) for c in stock["symbol"])
         base_price = 500 + (symbol_hash % 3000)
-        change_percent = round(random.uniform(-15.0, -3.5), 2)
+        change_percent = round(rng.uniform(-15.0, -3.5), 2)
         change = round(base_price * change_percent / 100, 2)
         
         losers.append({
@@ -447,7 +467,7 @@ def generate_market_movers(top_count=10):
             "price": base_price + change,
             "change": change,
             "changePercent": change_percent,
-            "volume": random.randint(500000, 5000000)
+            "volume": rng.randint(500000, 5000000)
         })
     
     # Sort losers by change percent
@@ -459,9 +479,9 @@ def generate_market_movers(top_count=10):
         stock = stocks_copy[i + 2 * top_count]  # Use different stocks again
         symbol_hash = sum(ord(c) for c in stock["symbol"])
         base_price = 500 + (symbol_hash % 3000)
-        change_percent = round(random.uniform(-5.0, 5.0), 2)
+        change_percent = round(rng.uniform(-5.0, 5.0), 2)
         change = round(base_price * change_percent / 100, 2)
-        volume = random.randint(5000000, 20000000)  # High volume
+        volume = rng.randint(5000000, 20000000)  # High volume
         
         active_by_volume.append({
             "symbol": stock["symbol"],
@@ -482,30 +502,32 @@ def generate_market_movers(top_count=10):
         "mostActive": active_by_volume
     }
 
-def generate_market_sentiment():
+def generate_market_sentiment(rng=None):
     """Generate overall market sentiment with multiple indicators"""
+    rng = rng or unseeded_rng()
+    
     # Generate technical indicators for the market as a whole
     # RSI (0-100): Below 30 is oversold, above 70 is overbought
-    rsi = random.randint(30, 70)
+    rsi = rng.randint(30, 70)
     
     # Generate other indicators
-    macd = random.uniform(-5, 5)
-    adx = random.randint(15, 40)  # Above 25 indicates a strong trend
+    macd = rng.uniform(-5, 5)
+    adx = rng.randint(15, 40)  # Above 25 indicates a strong trend
     
     # Overall market direction
     if rsi > 60:
         direction = "Bullish" if macd > 0 else "Moderately Bullish"
-        strength = random.randint(60, 90)
+        strength = rng.randint(60, 90)
     elif rsi < 40:
         direction = "Bearish" if macd < 0 else "Moderately Bearish"
-        strength = random.randint(60, 90)
+        strength = rng.randint(60, 90)
     else:
         direction = "Neutral"
-        strength = random.randint(40, 60)
+        strength = rng.randint(40, 60)
     
     # FII and DII activity data
-    fii_net = round(random.uniform(-2000, 2000), 2)  # in crores
-    dii_net = round(random.uniform(-2000, 2000), 2)  # in crores
+    fii_net = round(rng.uniform(-2000, 2000), 2)  # in crores
+    dii_net = round(rng.uniform(-2000, 2000), 2)  # in crores
     
     # Generate market commentary based on conditions
     if direction.startswith("Bull"):
@@ -546,7 +568,7 @@ def generate_market_sentiment():
             }
         },
         "marketCommentary": commentary,
-        "globalCues": random.choice([
+        "globalCues": rng.choice([
             "Positive global cues supporting market sentiment",
             "Weak global markets weighing on domestic sentiment",
             "Mixed global cues keeping markets range-bound",
@@ -554,14 +576,16 @@ def generate_market_sentiment():
         ])
     }
 
-def generate_enhanced_market_overview():
+def generate_enhanced_market_overview(rng=None):
     """Generate a comprehensive market overview with all data points"""
+    rng = rng or unseeded_rng()
+    
     # Get data from all sources
-    indices = generate_realistic_index_values()
-    sectors = generate_detailed_sector_performance()
-    breadth = generate_market_breadth()
-    movers = generate_market_movers()
-    sentiment = generate_market_sentiment()
+    indices = generate_realistic_index_values(rng)
+    sectors = generate_detailed_sector_performance(rng)
+    breadth = generate_market_breadth(rng)
+    movers = generate_market_movers(MARKET_MOVER_COUNT, rng)
+    sentiment = generate_market_sentiment(rng)
     
     # Get Nifty and Sensex for the summary
     nifty = next((idx for idx in indices if idx["symbol"] == "NIFTY 50"), None)
@@ -584,4 +608,18 @@ def generate_enhanced_market_overview():
         "breadth": breadth,
         "movers": movers,
         "sentiment": sentiment
-    } 
\ No newline at end of file
+    } 
+
+def get_market_snapshot(now=None):
+    """
+    Return the market overview for the current tick, generating it on first use.
+    Every market endpoint projects its slice from this one snapshot, so numbers
+    agree across endpoints and each tick is generated exactly once per process.
+    """
+    tick = time_bucket(MARKET_TICK_SECONDS, now)
+    with _snapshot_lock:
+        if _snapshot["tick"] != tick:
+            _snapshot["data"] = generate_enhanced_market_overview(seeded_rng("market-snapshot", tick))
+            _snapshot["tick"] = tick
+        return _snapshot["data"]
+
@@ -0,0 +1,220 @@
+"""
+Server-Sent Events streaming for the IndiStockPredictor market data.
+One background publisher wakes on every market tick, builds the index feed
+and the quotes for every symbol any client watches, and hands each client
+only what changed in its own subscription. Instead of a growing queue, every
+client keeps the latest pending value per key, so a slow reader simply skips
+intermediate ticks (coalescing) and memory per client stays bounded by its
+subscription size.
+"""
+
+import json
+import threading
+import time
+
+from seeded_random import time_bucket
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+
+# How often the publisher checks for a new tick
+POLL_SECONDS = 1
+
+MAX_CLIENTS = 1000
+MAX_SYMBOLS_PER_CLIENT = 50
+
+INDICES_KEY = ("indices", None)
+
+
+def format_event(event, data, event_id=None):
+    """Encode one SSE message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def format_pending(pending):
+    """Encode a batch of pending updates, indices first"""
+    return "".join(
+        format_event(kind, value, tick)
+        for (kind, symbol), (tick, value) in sorted(pending.items(), key=lambda item: item[0][0] != "indices")
+    )
+
+
+def parse_subscription(symbols_param, indices_param, is_listed):
+    """
+    Parse ?symbols=A,B&indices=1 into (symbols, indices, error).
+    Unknown symbols are dropped; error is a message when the request is invalid.
+    """
+    symbols = [s.strip() for s in (symbols_param or '').upper().split(',')]
+    symbols = list(dict.fromkeys(s for s in symbols if s and is_listed(s)))
+    indices = (indices_param or '1') not in ('0', 'false', 'no')
+
+    if len(symbols) > MAX_SYMBOLS_PER_CLIENT:
+        return symbols, indices, f"At most {MAX_SYMBOLS_PER_CLIENT} symbols per stream"
+    if not symbols and not indices:
+        return symbols, indices, "Nothing to stream; pass symbols or indices=1"
+    return symbols, indices, None
+
+
+class StreamClient:
+    """One connected stream: its subscription and the latest undelivered value per key"""
+
+    def __init__(self, symbols, indices=True, on_update=None):
+        self.symbols = frozenset(symbols)
+        self.indices = indices
+        # Called after new updates are queued; lets an event loop wait without a blocked thread
+        self.on_update = on_update
+        self.pending = {}
+        self.ticks = {}  # key -> last tick offered, so the connect snapshot is not sent twice
+        self.condition = threading.Condition()
+        self.closed = False
+        self.delivered = 0
+        self.coalesced = 0
+
+    def wants(self, key):
+        kind, symbol = key
+        return self.indices if kind == "indices" else symbol in self.symbols
+
+    def offer(self, updates, tick):
+        """Queue this client's share of a tick's updates, replacing anything not yet sent"""
+        with self.condition:
+            for key, value in updates.items():
+                if self.wants(key) and self.ticks.get(key, -1) < tick:
+                    self.ticks[key] = tick
+                    if key in self.pending:
+                        self.coalesced += 1
+                    self.pending[key] = (tick, value)
+            self.condition.notify()
+            notify = self.on_update if self.pending else None
+        if notify:
+            notify()
+
+    def take(self, timeout):
+        """Wait up to `timeout` seconds and return all pending updates"""
+        with self.condition:
+            if not self.pending and not self.closed:
+                self.condition.wait(timeout)
+            pending, self.pending = self.pending, {}
+            self.delivered += len(pending)
+            return pending
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+
+class MarketStream:
+    """
+    Publishes index and quote updates to SSE clients once per market tick.
+    `build_indices()` returns the index feed; `build_quote(symbol, tick)`
+    returns one symbol's quote for a tick.
+    """
+
+    def __init__(self, build_indices, build_quote, tick_seconds, max_clients=MAX_CLIENTS):
+        self.build_indices = build_indices
+        self.build_quote = build_quote
+        self.tick_seconds = tick_seconds
+        self.max_clients = max_clients
+        self.clients = set()
+        self.lock = threading.Lock()
+        self.last_values = {}
+        self.last_tick = None
+        self.publisher = None
+        self.ticks_published = 0
+
+    def subscribe(self, symbols, indices=True, on_update=None):
+        """Register a client and prime it with the current values; None if the server is full"""
+        client = StreamClient(symbols, indices, on_update)
+        with self.lock:
+            if len(self.clients) >= self.max_clients:
+                return None
+            self.clients.add(client)
+            if self.publisher is None or not self.publisher.is_alive():
+                self.publisher = threading.Thread(target=self._run, name="market-stream", daemon=True)
+                self.publisher.start()
+
+        # New clients get a full snapshot straight away instead of waiting for the next tick
+        tick = time_bucket(self.tick_seconds)
+        client.offer(self._build_updates(tick, client.symbols, client.indices), tick)
+        return client
+
+    def unsubscribe(self, client):
+        client.close()
+        with self.lock:
+            self.clients.discard(client)
+
+    def _build_updates(self, tick, symbols, indices=True):
+        updates = {}
+        if indices:
+            updates[INDICES_KEY] = self.build_indices()
+        for symbol in symbols:
+            updates[("quote", symbol)] = self.build_quote(symbol, tick)
+        return updates
+
+    def publish(self, tick):
+        """Build one tick's updates for every watched symbol and push the changes to clients"""
+        with self.lock:
+            clients = list(self.clients)
+        if not clients:
+            return 0
+
+        symbols = set().union(*(client.symbols for client in clients))
+        indices = any(client.indices for client in clients)
+        updates = self._build_updates(tick, symbols, indices)
+
+        # Only forward values that actually changed since the last tick
+        changed = {key: value for key, value in updates.items() if self.last_values.get(key) != value}
+        self.last_values.update(updates)
+
+        for client in clients:
+            client.offer(changed, tick)
+        self.last_tick = tick
+        self.ticks_published += 1
+        return len(changed)
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.clients:
+                    # Stop when idle; the next subscriber starts a new publisher
+                    self.publisher = None
+                    return
+            tick = time_bucket(self.tick_seconds)
+            if tick != self.last_tick:
+                try:
+                    self.publish(tick)
+                except Exception as e:
+                    print(f"Error publishing market tick: {str(e)}")
+                    self.last_tick = tick
+            time.sleep(POLL_SECONDS)
+
+    def events(self, client):
+        """Generator of SSE text for a client; unsubscribes when the client disconnects"""
+        try:
+            yield f"retry: {HEARTBEAT_SECONDS * 1000}\n\n"
+            while not client.closed:
+                pending = client.take(HEARTBEAT_SECONDS)
+                if not pending:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_pending(pending)
+        finally:
+            self.unsubscribe(client)
+
+    def stats(self):
+        """Connected clients and delivery counters"""
+        with self.lock:
+            clients = list(self.clients)
+        return {
+            "clients": len(clients),
+            "maxClients": self.max_clients,
+            "watchedSymbols": len(set().union(*(c.symbols for c in clients))) if clients else 0,
+            "ticksPublished": self.ticks_published,
+            "delivered": sum(c.delivered for c in clients),
+            "coalesced": sum(c.coalesced for c in clients),
+        }
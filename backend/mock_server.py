@@ -1,73 +1,53 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-import random
 import json
+import math
 from datetime import datetime, timedelta
-import time
 # Import enhanced market data functions
-from market_data import (
-    generate_enhanced_market_overview,
-    generate_realistic_index_values,
-    generate_detailed_sector_performance,
-    generate_market_breadth,
-    generate_market_movers,
-    generate_market_sentiment
-)
+from market_data import MARKET_TICK_SECONDS, get_market_snapshot
+from stock_registry import INDIAN_STOCKS, STOCK_REGISTRY
+from price_engine import DAILY_HISTORY_DAYS, daily_price_history, simulate_price_history
+from ohlcv_store import PRICE_STORE
+from seeded_random import seeded_rng, unseeded_rng, numpy_rng, time_bucket
+from response_cache import ResponseCache, cached_response
+from search_index import SEARCH_INDEX, DEFAULT_LIMIT as SEARCH_DEFAULT_LIMIT
+from model_registry import ModelRegistry
+from technical_data import DEFAULT_TECHNICAL_SYMBOL, get_technical_snapshot, technical_summary
+from market_stream import MarketStream, parse_subscription
+from screener import (LABEL_FIELDS, MAX_LIMIT as SCREENER_MAX_LIMIT, RANGE_PARAMS as SCREENER_RANGE_PARAMS,
+                      SCREENER_COLUMNS, screener_record)
+from screener_query import ScreenerQueryError, evaluate_query, parse_query, referenced_fields
+from fundamentals_engine import get_fundamentals_universe
+from risk_engine import DEFAULT_CONFIDENCE as DEFAULT_RISK_CONFIDENCE, get_risk_model
+from monte_carlo import band_ratios, prediction_bands
+from request_metrics import RequestMetrics
 
 app = Flask(__name__)
 CORS(app)
 
-# Expanded list of Indian stocks for more comprehensive database
-INDIAN_STOCKS = [
-    {"symbol": "RELIANCE", "name": "Reliance Industries Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Oil & Gas", "description": "India's largest private sector company with businesses in energy, petrochemicals, textiles, retail, and telecommunications."},
-    {"symbol": "TCS", "name": "Tata Consultancy Services Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "India's largest IT services company offering consulting and business solutions globally."},
-    {"symbol": "HDFCBANK", "name": "HDFC Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "India's largest private sector bank by assets offering a wide range of banking products and financial services."},
-    {"symbol": "INFY", "name": "Infosys Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "A global leader in next-generation digital services and consulting, enabling clients to navigate digital transformation."},
-    {"symbol": "HINDUNILVR", "name": "Hindustan Unilever Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Consumer Goods", "description": "India's largest fast-moving consumer goods company with products in home care, beauty & personal care, and foods & refreshment."},
-    {"symbol": "ICICIBANK", "name": "ICICI Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "Second largest private sector bank in India offering a wide range of banking products and financial services."},
-    {"symbol": "SBIN", "name": "State Bank of India", "sector": "Banking", "exchange": "NSE", "industry": "Public Banking", "description": "India's largest public sector bank offering a wide range of banking products and services."},
-    {"symbol": "BAJFINANCE", "name": "Bajaj Finance Ltd.", "sector": "Finance", "exchange": "NSE", "industry": "NBFC", "description": "One of India's leading non-banking financial companies (NBFC) with diversified lending products."},
-    {"symbol": "BHARTIARTL", "name": "Bharti Airtel Ltd.", "sector": "Telecom", "exchange": "NSE", "industry": "Telecommunications", "description": "One of India's leading telecommunications service providers with operations in 18 countries."},
-    {"symbol": "ITC", "name": "ITC Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Diversified", "description": "Multi-business conglomerate with diversified presence in FMCG, hotels, paperboards & packaging, agri business & IT."},
-    {"symbol": "KOTAKBANK", "name": "Kotak Mahindra Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "One of India's leading private sector banks offering banking and financial services."},
-    {"symbol": "LT", "name": "Larsen & Toubro Ltd.", "sector": "Construction", "exchange": "NSE", "industry": "Engineering & Construction", "description": "India's largest construction company and a leading technology, engineering, construction, manufacturing and financial services conglomerate."},
-    {"symbol": "ASIANPAINT", "name": "Asian Paints Ltd.", "sector": "Consumer Goods", "exchange": "NSE", "industry": "Paints", "description": "India's leading paint company and ranked among the top decorative paints companies in the world."},
-    {"symbol": "MARUTI", "name": "Maruti Suzuki India Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Passenger Vehicles", "description": "India's largest passenger car manufacturer with more than 50% market share in the Indian passenger car market."},
-    {"symbol": "AXISBANK", "name": "Axis Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "Third largest private sector bank in India offering a wide range of banking products and financial services."},
-    {"symbol": "WIPRO", "name": "Wipro Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "Global information technology, consulting and business process services company providing solutions to enable clients do business better."},
-    {"symbol": "HCLTECH", "name": "HCL Technologies Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "Global technology company that helps enterprises reimagine their businesses for the digital age."},
-    {"symbol": "SUNPHARMA", "name": "Sun Pharmaceutical Industries Ltd.", "sector": "Pharma", "exchange": "NSE", "industry": "Pharmaceuticals", "description": "India's largest pharmaceutical company and the fifth largest specialty generic company globally."},
-    {"symbol": "TATASTEEL", "name": "Tata Steel Ltd.", "sector": "Metal", "exchange": "NSE", "industry": "Steel", "description": "Among the top global steel companies with an annual crude steel capacity of 34 million tonnes per annum."},
-    {"symbol": "ONGC", "name": "Oil & Natural Gas Corporation Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Oil & Gas", "description": "India's largest government-owned oil and gas corporation contributing 70% to India's domestic production."},
-    {"symbol": "TATAMOTORS", "name": "Tata Motors Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Automotive", "description": "India's largest automobile company, also owning the Jaguar Land Rover (JLR) brand."},
-    {"symbol": "NTPC", "name": "NTPC Ltd.", "sector": "Power", "exchange": "NSE", "industry": "Power Generation", "description": "India's largest power generation company with a power generating capacity of 65,810 MW."},
-    {"symbol": "BAJAJFINSV", "name": "Bajaj Finserv Ltd.", "sector": "Finance", "exchange": "NSE", "industry": "Financial Services", "description": "Holding company for Bajaj Finance, Bajaj Allianz General Insurance and Bajaj Allianz Life Insurance."},
-    {"symbol": "BAJAJ-AUTO", "name": "Bajaj Auto Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Two-wheelers", "description": "World's fourth largest two and three-wheeler manufacturer with presence in over 70 countries."},
-    {"symbol": "TITAN", "name": "Titan Company Ltd.", "sector": "Consumer Goods", "exchange": "NSE", "industry": "Watches & Jewelry", "description": "Leading manufacturer of watches, jewelry, and eyewear in India with brands like Tanishq, Titan, Fastrack, etc."},
-    {"symbol": "ADANIENT", "name": "Adani Enterprises Ltd.", "sector": "Diversified", "exchange": "NSE", "industry": "Infrastructure", "description": "Flagship company of the Adani Group with interests in resources, logistics, energy and agro."},
-    {"symbol": "ADANIPORTS", "name": "Adani Ports and Special Economic Zone Ltd.", "sector": "Infrastructure", "exchange": "NSE", "industry": "Ports", "description": "India's largest private port operator with ports across the eastern and western coasts of India."},
-    {"symbol": "ADANIPOWER", "name": "Adani Power Ltd.", "sector": "Power", "exchange": "NSE", "industry": "Power Generation", "description": "India's largest private thermal power producer with capacity of 12,450 MW."},
-    {"symbol": "ADANIGREEN", "name": "Adani Green Energy Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Renewable Energy", "description": "One of the largest renewable energy companies in India with a renewable portfolio of 14,795 MW."},
-    {"symbol": "ULTRACEMCO", "name": "UltraTech Cement Ltd.", "sector": "Cement", "exchange": "NSE", "industry": "Cement", "description": "India's largest cement company and the world's third-largest cement company with annual capacity of 116.75 MTPA."},
-    {"symbol": "JSWSTEEL", "name": "JSW Steel Ltd.", "sector": "Metal", "exchange": "NSE", "industry": "Steel", "description": "India's leading integrated steel manufacturer with 18 MTPA capacity."},
-    {"symbol": "TECHM", "name": "Tech Mahindra Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "Fifth largest IT services company in India offering technology services and solutions."},
-    {"symbol": "NESTLEIND", "name": "Nestle India Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Food Processing", "description": "Leading food and beverage company in India with popular brands like Maggi, Nescafe, KitKat, etc."},
-    {"symbol": "DIVISLAB", "name": "Divi's Laboratories Ltd.", "sector": "Pharma", "exchange": "NSE", "industry": "Pharmaceuticals", "description": "India's leading pharmaceutical company manufacturing active pharmaceutical ingredients."},
-    {"symbol": "CIPLA", "name": "Cipla Ltd.", "sector": "Pharma", "exchange": "NSE", "industry": "Pharmaceuticals", "description": "Global pharmaceutical company with a portfolio in respiratory, antiretroviral, urology, cardiology, and anti-infective segments."},
-    {"symbol": "DRREDDY", "name": "Dr. Reddy's Laboratories Ltd.", "sector": "Pharma", "exchange": "NSE", "industry": "Pharmaceuticals", "description": "Leading Indian pharmaceutical company with presence in over 20 countries and offering a wide range of medicines."},
-    {"symbol": "SHREECEM", "name": "Shree Cement Ltd.", "sector": "Cement", "exchange": "NSE", "industry": "Cement", "description": "One of India's largest cement manufacturers with an installed capacity of 43.40 MTPA."},
-    {"symbol": "COALINDIA", "name": "Coal India Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Mining & Minerals", "description": "World's largest coal producer and contributes to around 83% of India's coal production."},
-    {"symbol": "GRASIM", "name": "Grasim Industries Ltd.", "sector": "Diversified", "exchange": "NSE", "industry": "Textiles & Chemicals", "description": "Flagship company of the Aditya Birla Group with businesses in viscose staple fiber, chemicals, and cement."},
-    {"symbol": "PIDILITIND", "name": "Pidilite Industries Ltd.", "sector": "Chemicals", "exchange": "NSE", "industry": "Adhesives", "description": "India's leading manufacturer of adhesives, sealants, and construction chemicals with brands like Fevicol, Dr. Fixit, etc."},
-    {"symbol": "INDUSINDBK", "name": "IndusInd Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "New-generation Indian bank serving the retail and corporate banking sectors."},
-    {"symbol": "M&M", "name": "Mahindra & Mahindra Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Automotive", "description": "Leading manufacturer of utility vehicles, tractors, and information technology services."},
-    {"symbol": "BRITANNIA", "name": "Britannia Industries Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Food Products", "description": "India's leading food company with popular biscuit brands and a growing presence in dairy and bakery products."},
-    {"symbol": "HEROMOTOCO", "name": "Hero MotoCorp Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Two-wheelers", "description": "World's largest manufacturer of two-wheelers with more than 50% market share in the Indian two-wheeler market."},
-    {"symbol": "ZEEL", "name": "Zee Entertainment Enterprises Ltd.", "sector": "Media", "exchange": "NSE", "industry": "Media & Entertainment", "description": "One of India's largest media and entertainment companies with presence in television, digital content, and live entertainment."},
-    {"symbol": "BPCL", "name": "Bharat Petroleum Corporation Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Oil & Gas", "description": "Second largest downstream oil company in India and one of the Fortune Global 500 companies."},
-    {"symbol": "HDFCLIFE", "name": "HDFC Life Insurance Company Ltd.", "sector": "Insurance", "exchange": "NSE", "industry": "Life Insurance", "description": "One of India's leading private life insurance companies offering a range of insurance products."},
-    {"symbol": "SBILIFE", "name": "SBI Life Insurance Company Ltd.", "sector": "Insurance", "exchange": "NSE", "industry": "Life Insurance", "description": "Joint venture between State Bank of India and BNP Paribas Cardif offering a range of life insurance products."},
-    {"symbol": "DABUR", "name": "Dabur India Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Consumer Goods", "description": "Fourth largest FMCG company in India with a portfolio of over 250 herbal/ayurvedic products."}
+# Per-route request counts, latency and payload sizes, served at /api/metrics
+REQUEST_METRICS = RequestMetrics().install(app)
+
+# Cached market endpoints; TTLs match the market snapshot tick they project from
+MARKET_RESPONSE_CACHE = ResponseCache(max_entries=256)
+MARKET_CACHE_TTLS = {
+    "indices": MARKET_TICK_SECONDS,
+    "overview": MARKET_TICK_SECONDS,
+    "sector-performance": MARKET_TICK_SECONDS,
+    "breadth": MARKET_TICK_SECONDS,
+    "sentiment": MARKET_TICK_SECONDS
+}
+
+# Indices served by /api/market/indices: snapshot symbol, feed symbol, display name, type
+MARKET_INDEX_FEED = [
+    ("NIFTY 50", "NIFTY50", "NIFTY 50", "Broad Market"),
+    ("SENSEX", "SENSEX", "BSE SENSEX", "Broad Market"),
+    ("NIFTY BANK", "NIFTYBANK", "NIFTY Bank", "Sectoral"),
+    ("NIFTY IT", "NIFTYIT", "NIFTY IT", "Sectoral"),
+    ("NIFTY FMCG", "NIFTYFMCG", "NIFTY FMCG", "Sectoral"),
+    ("NIFTY PHARMA", "NIFTYPHARMA", "NIFTY Pharma", "Sectoral"),
+    ("NIFTY AUTO", "NIFTYAUTO", "NIFTY Auto", "Sectoral"),
+    ("NIFTY METAL", "NIFTYMETAL", "NIFTY Metal", "Sectoral")
 ]
 
 # Custom stock recommendations for major stocks
@@ -155,44 +135,26 @@ STOCK_RECOMMENDATIONS = {
 }
 
 # Generate mock data with enhanced details
-def generate_stock_price_history(symbol, days=365):
-    # Set base price based on stock symbol for consistency
-    symbol_hash = sum(ord(c) for c in symbol)
-    base_price = 500 + (symbol_hash % 3000)
-    
-    today = datetime.now()
-    result = []
-    
-    price = base_price
-    volatility = 0.015 + (symbol_hash % 100) / 1000  # Different volatility per stock
-    
-    for i in range(days):
-        date = today - timedelta(days=days-i-1)
-        change = random.uniform(-volatility, volatility)
-        price = price * (1 + change)
-        
-        # Add some trends and seasonality
-        if i % 30 < 15:  # Create some cyclic patterns
-            price *= 1.002
-        
-        # Add volume with some correlation to price movement
-        volume_base = 100000 + (symbol_hash % 1000000)
-        volume_change = 1 + abs(change) * 10  # Higher volume on big moves
-        
-        result.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "open": round(price * (1 - random.uniform(0, 0.01)), 2),
-            "high": round(price * (1 + random.uniform(0, 0.02)), 2),
-            "low": round(price * (1 - random.uniform(0, 0.02)), 2),
-            "close": round(price, 2),
-            "volume": round(volume_base * volume_change),
-        })
-    
-    return result
+def load_price_history(symbol, days=365, rng=None):
+    """
+    Return the last `days` bars from the OHLCV store, or simulate them if the symbol is not stored.
+    Without an rng the simulation is the symbol's daily series, the same bars the technical card uses.
+    """
+    if symbol in PRICE_STORE:
+        return PRICE_STORE.tail(symbol, days)
+    if rng is None:
+        return daily_price_history(symbol, days, time_bucket(86400))
+    return simulate_price_history(symbol, days, rng=numpy_rng(rng))
 
-def generate_prediction(symbol, days=30):
+def generate_stock_price_history(symbol, days=365, rng=None):
+    """Generate daily OHLCV bars for a symbol using the vectorized price engine"""
+    return load_price_history(symbol, days, rng).to_records()
+
+def generate_prediction(symbol, days=30, rng=None):
+    rng = rng or unseeded_rng()
+    
     # Get recent historical data to base prediction on
-    historical_data = generate_stock_price_history(symbol, 30)
+    historical_data = generate_stock_price_history(symbol, 30, rng)
     base_price = historical_data[-1]["close"]
     
     # Create a symbol-specific trend bias for consistency
@@ -213,29 +175,32 @@ def generate_prediction(symbol, days=30):
     rsi = 50 + (trend_bias * 40)  # 30-70 range
     macd = trend_bias * 2
     
+    # Percentile bands from GBM paths fitted to the same history
+    bands = prediction_bands(symbol, days)
+    
     for i in range(days):
         date = today + timedelta(days=i)
         
         # Add some randomness but maintain overall trend
         daily_volatility = 0.01 - (i * 0.0001)  # Volatility decreases for far future predictions
-        change = random.uniform(-daily_volatility, daily_volatility) + trend_factor
+        change = rng.uniform(-daily_volatility, daily_volatility) + trend_factor
         price = price * (1 + change)
         
-        # Calculate confidence intervals - widen for distant predictions
-        confidence_interval = 0.01 + (i * 0.001)
+        # Confidence intervals widen with the simulated spread of paths
+        lower_ratio, upper_ratio = band_ratios(bands, min(i, len(bands["mean"]) - 1))
         
         daily_predictions.append({
             "date": date.strftime("%Y-%m-%d"),
             "price": round(price, 2),
-            "lower_bound": round(price * (1 - confidence_interval), 2),
-            "upper_bound": round(price * (1 + confidence_interval), 2),
+            "lower_bound": round(price * lower_ratio, 2),
+            "upper_bound": round(price * upper_ratio, 2),
         })
     
     change_percent = round((daily_predictions[-1]["price"] - base_price) / base_price * 100, 2)
     
     # Generate analysis drivers based on trend
     if trend == "up":
-        drivers = random.sample([
+        drivers = rng.sample([
             "Strong quarterly results expected",
             "Positive sector outlook",
             "Increased institutional buying",
@@ -246,7 +211,7 @@ def generate_prediction(symbol, days=30):
             "Strategic acquisitions"
         ], 3)
     else:
-        drivers = random.sample([
+        drivers = rng.sample([
             "Competitive pressures increasing",
             "Margin compression expected",
             "Regulatory headwinds",
@@ -260,7 +225,7 @@ def generate_prediction(symbol, days=30):
     # Generate technical signals
     if trend == "up":
         recommendation = "Buy" if change_percent > 5 else "Hold"
-        signals = random.sample([
+        signals = rng.sample([
             "Bullish MACD crossover",
             "RSI showing upward momentum",
             "Golden cross on 50/200 day MA",
@@ -269,7 +234,7 @@ def generate_prediction(symbol, days=30):
         ], 2)
     else:
         recommendation = "Sell" if change_percent < -5 else "Hold"
-        signals = random.sample([
+        signals = rng.sample([
             "Bearish MACD divergence",
             "RSI indicating overbought conditions",
             "Death cross on 50/200 day MA",
@@ -323,601 +288,48 @@ def generate_prediction(symbol, days=30):
         }
     }
 
-def generate_market_indices():
-    """Generate data for the major market indices with real-time-like data"""
-    # Set seed for consistency in a single request but variation between requests
-    current_timestamp = int(datetime.now().timestamp())
-    random.seed(current_timestamp // 60)  # Change every minute
-    
-    # List of major Indian market indices with realistic values
-    indices = [
-        {
-            "symbol": "NIFTY50",
-            "name": "NIFTY 50",
-            "value": round(22000 + random.uniform(-500, 500), 2),
-            "type": "Broad Market"
-        },
-        {
-            "symbol": "SENSEX",
-            "name": "BSE SENSEX",
-            "value": round(72000 + random.uniform(-1000, 1000), 2),
-            "type": "Broad Market"
-        },
-        {
-            "symbol": "NIFTYBANK",
-            "name": "NIFTY Bank",
-            "value": round(48000 + random.uniform(-500, 500), 2),
-            "type": "Sectoral"
-        },
-        {
-            "symbol": "NIFTYIT",
-            "name": "NIFTY IT",
-            "value": round(33000 + random.uniform(-500, 500), 2),
-            "type": "Sectoral"
-        },
-        {
-            "symbol": "NIFTYFMCG",
-            "name": "NIFTY FMCG",
-            "value": round(55000 + random.uniform(-500, 500), 2),
-            "type": "Sectoral"
-        },
-        {
-            "symbol": "NIFTYPHARMA",
-            "name": "NIFTY Pharma",
-            "value": round(16000 + random.uniform(-300, 300), 2),
-            "type": "Sectoral"
-        },
-        {
-            "symbol": "NIFTYAUTO",
-            "name": "NIFTY Auto",
-            "value": round(19000 + random.uniform(-300, 300), 2),
-            "type": "Sectoral"
-        },
-        {
-            "symbol": "NIFTYMETAL",
-            "name": "NIFTY Metal",
-            "value": round(8000 + random.uniform(-200, 200), 2),
-            "type": "Sectoral"
-        }
-    ]
+def generate_market_indices(snapshot=None):
+    """Project the major market indices out of the current market snapshot"""
+    snapshot = snapshot or get_market_snapshot()
+    snapshot_indices = {idx["symbol"]: idx for idx in snapshot["indices"]}
     
     # Format timestamp for "just now" feeling
-    current_time = datetime.now()
-    formatted_timestamp = current_time.strftime("%Y-%m-%dT%H:%M:%S")
-    
-    # Add change data to each index
-    for idx in indices:
-        # Generate consistent changes based on the symbol and current timestamp
-        symbol_hash = sum(ord(c) for c in idx["symbol"]) + (current_timestamp % 100)
-        
-        # Create more realistic trend based on symbol hash and time
-        trend_direction = 1 if symbol_hash % 5 != 0 else -1  # 80% positive, 20% negative
-        
-        # Calculate a more realistic change percentage
-        base_volatility = 0.05 + (symbol_hash % 10) / 100  # 0.05% to 0.15% base volatility
-        change_percent = round(random.uniform(0.05, 1.2) * trend_direction, 2)
-        change = round(idx["value"] * change_percent / 100, 2)
-        
-        # Add all required fields
-        idx["change"] = change
-        idx["changePercent"] = change_percent
-        idx["previousClose"] = round(idx["value"] - change, 2)
-        idx["open"] = round(idx["previousClose"] + random.uniform(-0.5, 0.5) * abs(change), 2)
-        idx["high"] = round(max(idx["value"], idx["open"]) + random.uniform(0, 0.3) * abs(change), 2)
-        idx["low"] = round(min(idx["value"], idx["open"]) - random.uniform(0, 0.3) * abs(change), 2)
-        idx["volume"] = round(random.uniform(100000000, 500000000))
-        
-        # Ensure the price field is included (this is what the frontend expects)
-        idx["price"] = idx["value"]
-        idx["lastUpdated"] = formatted_timestamp
-    
-    # Reset random seed
-    random.seed()
+    formatted_timestamp = snapshot["lastUpdated"][:19]
+    
+    indices = []
+    for snapshot_symbol, symbol, name, index_type in MARKET_INDEX_FEED:
+        idx = snapshot_indices.get(snapshot_symbol)
+        if idx is None:
+            continue
+        
+        indices.append({
+            "symbol": symbol,
+            "name": name,
+            "value": idx["price"],
+            "type": index_type,
+            "change": idx["change"],
+            "changePercent": idx["changePercent"],
+            "previousClose": idx["previousClose"],
+            "open": idx["open"],
+            "high": idx["high"],
+            "low": idx["low"],
+            "volume": idx["volume"],
+            # Ensure the price field is included (this is what the frontend expects)
+            "price": idx["price"],
+            "lastUpdated": formatted_timestamp
+        })
     
     return indices
 
 @app.route('/api/market/indices', methods=['GET'])
+@cached_response(MARKET_RESPONSE_CACHE, MARKET_CACHE_TTLS["indices"])
 def get_market_indices():
     """Get real-time data for the major market indices"""
     return jsonify(generate_market_indices())
 
-def generate_fundamentals(symbol, stock_details=None):
-    """
-    Generate realistic fundamental data for a given stock
-    """
-    if stock_details is None:
-        # Get the stock details if not provided
-        stock_details = get_stock_details(symbol)
+def generate_recommendations(count=10, rng=None):
+    rng = rng or unseeded_rng()
     
-    if not stock_details:
-        return None
-    
-    # Get the sector for more realistic data generation
-    sector = stock_details.get('sector', 'Unknown')
-    price = stock_details.get('price', 1000)
-    
-    # Base values that will be adjusted based on sector
-    pe_base = 0
-    pb_base = 0
-    ps_base = 0
-    ev_ebitda_base = 0
-    peg_base = 0
-    
-    # Set base values by sector
-    if sector == 'Information Technology':
-        pe_base = random.uniform(20, 35)
-        pb_base = random.uniform(4, 8)
-        ps_base = random.uniform(3, 7)
-        ev_ebitda_base = random.uniform(15, 25)
-        peg_base = random.uniform(1.2, 2.0)
-        
-    elif sector == 'Financial Services':
-        pe_base = random.uniform(10, 18)
-        pb_base = random.uniform(1, 3)
-        ps_base = random.uniform(2, 4)
-        ev_ebitda_base = random.uniform(8, 15)
-        peg_base = random.uniform(0.8, 1.5)
-        
-    elif sector == 'Healthcare':
-        pe_base = random.uniform(18, 30)
-        pb_base = random.uniform(3, 6)
-        ps_base = random.uniform(2, 6)
-        ev_ebitda_base = random.uniform(12, 20)
-        peg_base = random.uniform(1.0, 1.8)
-        
-    elif sector == 'Consumer Goods':
-        pe_base = random.uniform(15, 25)
-        pb_base = random.uniform(2, 5)
-        ps_base = random.uniform(1, 3)
-        ev_ebitda_base = random.uniform(10, 18)
-        peg_base = random.uniform(0.9, 1.6)
-        
-    elif sector == 'Energy':
-        pe_base = random.uniform(8, 15)
-        pb_base = random.uniform(1, 2.5)
-        ps_base = random.uniform(0.5, 2)
-        ev_ebitda_base = random.uniform(5, 12)
-        peg_base = random.uniform(0.6, 1.3)
-        
-    elif sector == 'Basic Materials':
-        pe_base = random.uniform(12, 20)
-        pb_base = random.uniform(1.5, 3)
-        ps_base = random.uniform(1, 2.5)
-        ev_ebitda_base = random.uniform(7, 14)
-        peg_base = random.uniform(0.7, 1.4)
-        
-    else:  # Default values for other sectors
-        pe_base = random.uniform(15, 25)
-        pb_base = random.uniform(2, 4)
-        ps_base = random.uniform(1, 3)
-        ev_ebitda_base = random.uniform(8, 16)
-        peg_base = random.uniform(0.8, 1.5)
-    
-    # Adjust values based on price trend (higher growth companies often have higher multiples)
-    price_trend = random.uniform(-0.2, 0.3)  # -20% to +30%
-    pe_ratio = max(5, pe_base * (1 + price_trend))
-    pb_ratio = max(0.5, pb_base * (1 + price_trend))
-    ps_ratio = max(0.3, ps_base * (1 + price_trend))
-    ev_ebitda = max(3, ev_ebitda_base * (1 + price_trend))
-    peg_ratio = max(0.5, peg_base * (1 + 0.5 * price_trend))
-    
-    # Generate market cap (in crores)
-    shares_outstanding = random.randint(100, 5000) * 1000000  # 100M to 5B shares
-    market_cap = price * shares_outstanding
-    
-    # Financial health metrics
-    debt_to_equity = 0
-    current_ratio = 0
-    quick_ratio = 0
-    interest_coverage = 0
-    
-    # Set financial health metrics based on sector
-    if sector == 'Information Technology':
-        debt_to_equity = random.uniform(0.1, 0.8)
-        current_ratio = random.uniform(1.8, 3.5)
-        quick_ratio = random.uniform(1.5, 3.0)
-        interest_coverage = random.uniform(10, 30)
-        
-    elif sector == 'Financial Services':
-        debt_to_equity = random.uniform(1.5, 4.0)
-        current_ratio = random.uniform(1.0, 1.5)
-        quick_ratio = random.uniform(0.8, 1.3)
-        interest_coverage = random.uniform(3, 10)
-        
-    elif sector == 'Healthcare':
-        debt_to_equity = random.uniform(0.3, 1.2)
-        current_ratio = random.uniform(1.5, 3.0)
-        quick_ratio = random.uniform(1.2, 2.5)
-        interest_coverage = random.uniform(8, 20)
-        
-    elif sector == 'Consumer Goods':
-        debt_to_equity = random.uniform(0.3, 1.5)
-        current_ratio = random.uniform(1.3, 2.5)
-        quick_ratio = random.uniform(1.0, 2.0)
-        interest_coverage = random.uniform(6, 15)
-        
-    elif sector == 'Energy':
-        debt_to_equity = random.uniform(0.5, 2.0)
-        current_ratio = random.uniform(1.2, 2.0)
-        quick_ratio = random.uniform(0.9, 1.5)
-        interest_coverage = random.uniform(4, 12)
-        
-    else:  # Default for other sectors
-        debt_to_equity = random.uniform(0.3, 1.5)
-        current_ratio = random.uniform(1.3, 2.5)
-        quick_ratio = random.uniform(1.0, 2.0)
-        interest_coverage = random.uniform(6, 15)
-    
-    # Calculate total debt and cash based on market cap and debt to equity
-    equity = market_cap / (1 + debt_to_equity)
-    total_debt = equity * debt_to_equity
-    total_cash = market_cap * random.uniform(0.05, 0.2)  # 5-20% of market cap in cash
-    
-    # Cash flow metrics
-    operating_cash_flow = market_cap * random.uniform(0.05, 0.15)  # 5-15% of market cap
-    capex = operating_cash_flow * random.uniform(0.2, 0.5)  # 20-50% of operating cash flow
-    free_cash_flow = operating_cash_flow - capex
-    
-    # Profitability metrics
-    gross_margin = 0
-    operating_margin = 0
-    net_margin = 0
-    ebitda_margin = 0
-    
-    # Set profitability metrics based on sector
-    if sector == 'Information Technology':
-        gross_margin = random.uniform(50, 80)
-        operating_margin = random.uniform(20, 35)
-        net_margin = random.uniform(15, 30)
-        ebitda_margin = random.uniform(25, 40)
-        
-    elif sector == 'Financial Services':
-        gross_margin = random.uniform(60, 85)
-        operating_margin = random.uniform(25, 40)
-        net_margin = random.uniform(15, 25)
-        ebitda_margin = random.uniform(30, 45)
-        
-    elif sector == 'Healthcare':
-        gross_margin = random.uniform(45, 75)
-        operating_margin = random.uniform(15, 30)
-        net_margin = random.uniform(10, 25)
-        ebitda_margin = random.uniform(20, 35)
-        
-    elif sector == 'Consumer Goods':
-        gross_margin = random.uniform(30, 50)
-        operating_margin = random.uniform(8, 20)
-        net_margin = random.uniform(5, 15)
-        ebitda_margin = random.uniform(12, 25)
-        
-    elif sector == 'Energy':
-        gross_margin = random.uniform(20, 40)
-        operating_margin = random.uniform(8, 18)
-        net_margin = random.uniform(5, 12)
-        ebitda_margin = random.uniform(15, 25)
-        
-    else:  # Default for other sectors
-        gross_margin = random.uniform(30, 60)
-        operating_margin = random.uniform(10, 25)
-        net_margin = random.uniform(8, 18)
-        ebitda_margin = random.uniform(15, 30)
-    
-    # Return metrics
-    roa = net_margin * random.uniform(0.5, 0.8)  # Return on Assets
-    roe = roa * (1 + debt_to_equity)  # Return on Equity
-    roic = operating_margin * random.uniform(0.6, 0.9)  # Return on Invested Capital
-    
-    # Growth metrics
-    revenue_growth = random.uniform(-5, 30) if sector != 'Information Technology' else random.uniform(5, 40)
-    earnings_growth = revenue_growth * random.uniform(0.8, 1.5)  # Earnings can grow faster or slower than revenue
-    dividend_growth = earnings_growth * random.uniform(0.3, 0.8) if earnings_growth > 0 else 0
-    
-    # Long-term growth metrics
-    revenue_cagr_5y = revenue_growth * random.uniform(0.6, 1.2)  # 5-year CAGR is a smoothed version of current growth
-    eps_cagr_5y = earnings_growth * random.uniform(0.7, 1.3)
-    
-    # Dividend metrics
-    dividend_yield = 0
-    dividend_payout = 0
-    
-    # Set dividend metrics based on sector
-    if sector == 'Information Technology':
-        dividend_yield = random.uniform(0.5, 2.0)
-        dividend_payout = random.uniform(10, 30)
-        
-    elif sector == 'Financial Services':
-        dividend_yield = random.uniform(2.0, 5.0)
-        dividend_payout = random.uniform(30, 60)
-        
-    elif sector == 'Healthcare':
-        dividend_yield = random.uniform(1.0, 3.0)
-        dividend_payout = random.uniform(20, 40)
-        
-    elif sector == 'Consumer Goods':
-        dividend_yield = random.uniform(1.5, 4.0)
-        dividend_payout = random.uniform(30, 50)
-        
-    elif sector == 'Energy':
-        dividend_yield = random.uniform(3.0, 7.0)
-        dividend_payout = random.uniform(40, 70)
-        
-    else:  # Default for other sectors
-        dividend_yield = random.uniform(1.0, 3.5)
-        dividend_payout = random.uniform(20, 50)
-    
-    # Dividend consistency (years of consecutive dividend payments)
-    dividend_years = random.randint(0, 20)
-    
-    # Risk metrics
-    beta = random.uniform(0.6, 1.5)
-    volatility = random.uniform(15, 45)  # Annual volatility in percentage
-    rsquared = random.uniform(0.3, 0.8)  # R-squared against market
-    
-    # Generate quarterly results for last 4 quarters
-    quarterly_results = []
-    base_quarterly_revenue = market_cap * random.uniform(0.02, 0.1)  # Quarterly revenue as % of market cap
-    
-    # Define quarters
-    quarters = ["Q4 FY23", "Q1 FY24", "Q2 FY24", "Q3 FY24"]
-    
-    for i, quarter in enumerate(quarters):
-        # Add some quarter-to-quarter growth
-        quarter_growth = random.uniform(-0.05, 0.15)  # -5% to +15% QoQ growth
-        quarter_revenue = base_quarterly_revenue * (1 + quarter_growth * i)
-        quarter_profit = quarter_revenue * (net_margin / 100)
-        quarter_eps = quarter_profit / shares_outstanding * 10000000  # EPS in rupees
-        
-        quarterly_results.append({
-            "quarter": quarter,
-            "revenue": quarter_revenue,
-            "profit": quarter_profit,
-            "eps": quarter_eps
-        })
-    
-    # Generate 5-year historical data
-    historical_data = []
-    base_annual_revenue = quarterly_results[-1]["revenue"] * 4 * 0.85  # Annual revenue slightly less than 4x latest quarter
-    
-    for i in range(5):
-        year = 2019 + i
-        year_growth = revenue_cagr_5y / 100 * (1 + random.uniform(-0.3, 0.3))  # Add variation to the CAGR
-        year_revenue = base_annual_revenue * (1 + year_growth) ** i
-        year_profit = year_revenue * ((net_margin - random.uniform(-5, 5)) / 100)  # Margin can vary year to year
-        year_eps = year_profit / (shares_outstanding * (1 - 0.02 * i))  # Slightly fewer shares in the past (buybacks)
-        year_dividend = year_eps * (dividend_payout / 100)
-        
-        historical_data.append({
-            "year": str(year),
-            "revenue": year_revenue,
-            "profit": year_profit,
-            "eps": year_eps,
-            "dividend": year_dividend if dividend_yield > 0 else 0
-        })
-    
-    # Reverse to have most recent years last
-    historical_data.reverse()
-    
-    # Analyst ratings
-    buy_count = random.randint(0, 15)
-    hold_count = random.randint(0, 10)
-    sell_count = random.randint(0, 5)
-    total_ratings = buy_count + hold_count + sell_count
-    
-    # Determine consensus based on ratings distribution
-    if total_ratings > 0:
-        if buy_count / total_ratings > 0.6:
-            consensus = "Buy"
-        elif sell_count / total_ratings > 0.4:
-            consensus = "Sell"
-        else:
-            consensus = "Hold"
-    else:
-        consensus = "Hold"
-    
-    # Target price is typically +/- 20% from current price
-    target_price_multiplier = 1.0
-    if consensus == "Buy":
-        target_price_multiplier = random.uniform(1.05, 1.25)
-    elif consensus == "Sell":
-        target_price_multiplier = random.uniform(0.75, 0.95)
-    else:
-        target_price_multiplier = random.uniform(0.9, 1.1)
-    
-    target_price = price * target_price_multiplier
-    
-    # Create the fundamentals object
-    fundamentals = {
-        "valuation": {
-            "pe": pe_ratio,
-            "pb": pb_ratio,
-            "ps": ps_ratio,
-            "peg": peg_ratio,
-            "evToEbitda": ev_ebitda,
-            "marketCap": market_cap
-        },
-        "financialHealth": {
-            "debtToEquity": debt_to_equity,
-            "currentRatio": current_ratio,
-            "quickRatio": quick_ratio,
-            "interestCoverage": interest_coverage,
-            "totalDebt": total_debt,
-            "totalCash": total_cash,
-            "operatingCashFlow": operating_cash_flow,
-            "freeCashFlow": free_cash_flow
-        },
-        "profitability": {
-            "grossMargin": gross_margin,
-            "operatingMargin": operating_margin,
-            "netMargin": net_margin,
-            "ebitdaMargin": ebitda_margin,
-            "returnOnEquity": roe,
-            "returnOnAssets": roa,
-            "returnOnInvestedCapital": roic
-        },
-        "growth": {
-            "revenueGrowth": revenue_growth,
-            "earningsGrowth": earnings_growth,
-            "dividendGrowth": dividend_growth,
-            "5YrRevenueCAGR": revenue_cagr_5y,
-            "5YrEPSCAGR": eps_cagr_5y
-        },
-        "dividend": {
-            "yield": dividend_yield,
-            "payout": dividend_payout,
-            "years": dividend_years
-        },
-        "risks": {
-            "beta": beta,
-            "volatility": volatility,
-            "rsquared": rsquared
-        },
-        "quarterlyResults": quarterly_results,
-        "historicalData": historical_data,
-        "analystRatings": {
-            "consensus": consensus,
-            "buy": buy_count,
-            "hold": hold_count,
-            "sell": sell_count,
-            "targetPrice": target_price
-        }
-    }
-    
-    # Calculate a fundamental score based on the metrics
-    fundamental_score = calculate_fundamental_score(fundamentals, sector)
-    fundamentals["fundamental_score"] = fundamental_score
-    
-    return fundamentals
-
-def calculate_fundamental_score(fundamentals, sector):
-    """
-    Calculate an overall fundamental score based on various metrics and the stock's sector
-    """
-    score = 50  # Start with a neutral score
-    
-    # Valuation component (lower is better)
-    valuation = fundamentals["valuation"]
-    if valuation["pe"] < sector_avg_pe(sector):
-        score += 5
-    elif valuation["pe"] > sector_avg_pe(sector) * 1.5:
-        score -= 5
-    
-    if valuation["pb"] < sector_avg_pb(sector):
-        score += 3
-    elif valuation["pb"] > sector_avg_pb(sector) * 1.5:
-        score -= 3
-    
-    if valuation["peg"] < 1:
-        score += 5
-    elif valuation["peg"] > 2:
-        score -= 5
-    
-    # Financial health component
-    health = fundamentals["financialHealth"]
-    if health["debtToEquity"] < 0.5:
-        score += 4
-    elif health["debtToEquity"] > 2:
-        score -= 4
-    
-    if health["currentRatio"] > 2:
-        score += 3
-    elif health["currentRatio"] < 1:
-        score -= 5
-    
-    if health["freeCashFlow"] > 0:
-        score += 5
-    else:
-        score -= 5
-    
-    # Profitability component
-    profit = fundamentals["profitability"]
-    if profit["returnOnEquity"] > 15:
-        score += 5
-    elif profit["returnOnEquity"] < 5:
-        score -= 3
-    
-    if profit["netMargin"] > sector_avg_margin(sector):
-        score += 4
-    elif profit["netMargin"] < sector_avg_margin(sector) * 0.5:
-        score -= 4
-    
-    # Growth component
-    growth = fundamentals["growth"]
-    if growth["revenueGrowth"] > 15:
-        score += 5
-    elif growth["revenueGrowth"] < 0:
-        score -= 5
-    
-    if growth["earningsGrowth"] > 20:
-        score += 6
-    elif growth["earningsGrowth"] < 0:
-        score -= 6
-    
-    # Dividend component
-    dividend = fundamentals["dividend"]
-    if dividend["yield"] > 3:
-        score += 3
-    
-    if dividend["years"] > 10:
-        score += 3
-    
-    # Analyst ratings component
-    ratings = fundamentals["analystRatings"]
-    if ratings["consensus"] == "Buy":
-        score += 4
-    elif ratings["consensus"] == "Sell":
-        score -= 4
-    
-    # Risk adjustment
-    risks = fundamentals["risks"]
-    if risks["beta"] > 1.5:
-        score -= 3
-    elif risks["beta"] < 0.8:
-        score += 2
-    
-    # Clamp the score to 0-100 range
-    score = max(0, min(100, score))
-    
-    return score
-
-def sector_avg_pe(sector):
-    """Return average P/E ratio for a given sector"""
-    sector_pe = {
-        "Information Technology": 25,
-        "Financial Services": 15,
-        "Healthcare": 22,
-        "Consumer Goods": 20,
-        "Energy": 12,
-        "Basic Materials": 16,
-        "Unknown": 18
-    }
-    return sector_pe.get(sector, 18)
-
-def sector_avg_pb(sector):
-    """Return average P/B ratio for a given sector"""
-    sector_pb = {
-        "Information Technology": 5,
-        "Financial Services": 1.5,
-        "Healthcare": 4,
-        "Consumer Goods": 3,
-        "Energy": 1.5,
-        "Basic Materials": 2,
-        "Unknown": 2.5
-    }
-    return sector_pb.get(sector, 2.5)
-
-def sector_avg_margin(sector):
-    """Return average net margin for a given sector"""
-    sector_margin = {
-        "Information Technology": 20,
-        "Financial Services": 22,
-        "Healthcare": 18,
-        "Consumer Goods": 10,
-        "Energy": 8,
-        "Basic Materials": 12,
-        "Unknown": 15
-    }
-    return sector_margin.get(sector, 15)
-
-def generate_recommendations(count=10):
     stocks = [
         {"symbol": "RELIANCE", "name": "Reliance Industries Ltd.", "sector": "Energy"},
         {"symbol": "TCS", "name": "Tata Consultancy Services Ltd.", "sector": "IT"},
@@ -937,12 +349,12 @@ def generate_recommendations(count=10):
     ]
     
     result = []
-    selected_stocks = random.sample(stocks, min(count, len(stocks)))
+    selected_stocks = rng.sample(stocks, min(count, len(stocks)))
     
     for stock in selected_stocks:
-        current_price = round(random.uniform(500, 5000), 2)
-        change = round(random.uniform(-5, 5), 2)
-        pred_change = round(random.uniform(-10, 15), 2)
+        current_price = round(rng.uniform(500, 5000), 2)
+        change = round(rng.uniform(-5, 5), 2)
+        pred_change = round(rng.uniform(-10, 15), 2)
         
         recommendation = {
             "symbol": stock["symbol"],
@@ -953,8 +365,8 @@ def generate_recommendations(count=10):
             "changePercent": round(change / current_price * 100, 2),
             "predictionChange": pred_change,
             "predictionTrend": "up" if pred_change > 0 else "down",
-            "recommendationRating": random.choice(["Strong Buy", "Buy", "Hold", "Sell", "Strong Sell"]),
-            "recommendationReason": random.choice([
+            "recommendationRating": rng.choice(["Strong Buy", "Buy", "Hold", "Sell", "Strong Sell"]),
+            "recommendationReason": rng.choice([
                 "Strong fundamentals and growth potential",
                 "Undervalued compared to peers",
                 "Positive earnings forecast",
@@ -970,7 +382,9 @@ def generate_recommendations(count=10):
     
     return result
 
-def generate_portfolio():
+def generate_portfolio(rng=None):
+    rng = rng or unseeded_rng()
+    
     holdings = [
         {"symbol": "RELIANCE", "name": "Reliance Industries Ltd.", "sector": "Energy", "quantity": 10, "avgCost": 2500.50},
         {"symbol": "TCS", "name": "Tata Consultancy Services Ltd.", "sector": "IT", "quantity": 5, "avgCost": 3400.75},
@@ -982,8 +396,8 @@ def generate_portfolio():
     total_value = 0
     
     for i, holding in enumerate(holdings):
-        current_price = round(holding["avgCost"] * (1 + random.uniform(-0.2, 0.3)), 2)
-        day_change_percent = round(random.uniform(-2, 2), 2)
+        current_price = round(holding["avgCost"] * (1 + rng.uniform(-0.2, 0.3)), 2)
+        day_change_percent = round(rng.uniform(-2, 2), 2)
         day_change = round(current_price * day_change_percent / 100, 2)
         
         invested_amount = holding["quantity"] * holding["avgCost"]
@@ -999,7 +413,7 @@ def generate_portfolio():
         total_investment += invested_amount
         total_value += current_value
     
-    day_change = round(random.uniform(-5000, 5000), 2)
+    day_change = round(rng.uniform(-5000, 5000), 2)
     day_change_percent = round(day_change / total_value * 100, 2)
     overall_gain = total_value - total_investment
     overall_gain_percent = round(overall_gain / total_investment * 100, 2)
@@ -1016,9 +430,19 @@ def generate_portfolio():
         }
     }
     
+    try:
+        result["risk"] = get_risk_model().portfolio_risk(
+            {holding["symbol"]: holding["currentValue"] for holding in holdings}
+        )
+    except Exception as e:
+        print(f"Error computing portfolio risk: {str(e)}")
+        result["risk"] = None
+    
     return result
 
-def generate_portfolio_performance():
+def generate_portfolio_performance(rng=None):
+    rng = rng or unseeded_rng()
+    
     days = 180
     today = datetime.now()
     result = []
@@ -1028,7 +452,7 @@ def generate_portfolio_performance():
     
     for i in range(days):
         date = today - timedelta(days=days-i-1)
-        change = random.uniform(-0.015, 0.018)
+        change = rng.uniform(-0.015, 0.018)
         value = value * (1 + change)
         
         result.append({
@@ -1038,23 +462,25 @@ def generate_portfolio_performance():
     
     return {"historicalValue": result}
 
-def generate_top_gainers(limit=5):
+def generate_top_gainers(limit=5, rng=None):
+    rng = rng or unseeded_rng()
+    
     stocks = [
-        {"symbol": "TATAMOTORS", "name": "Tata Motors Ltd.", "price": round(random.uniform(500, 1000), 2)},
-        {"symbol": "BAJAJFINSV", "name": "Bajaj Finserv Ltd.", "price": round(random.uniform(1500, 2000), 2)},
-        {"symbol": "ADANIPORTS", "name": "Adani Ports Ltd.", "price": round(random.uniform(800, 1200), 2)},
-        {"symbol": "SBIN", "name": "State Bank of India", "price": round(random.uniform(400, 700), 2)},
-        {"symbol": "HCLTECH", "name": "HCL Technologies Ltd.", "price": round(random.uniform(1000, 1500), 2)},
-        {"symbol": "ULTRACEMCO", "name": "UltraTech Cement Ltd.", "price": round(random.uniform(7000, 9000), 2)},
-        {"symbol": "TITAN", "name": "Titan Company Ltd.", "price": round(random.uniform(2500, 3000), 2)},
-        {"symbol": "JSWSTEEL", "name": "JSW Steel Ltd.", "price": round(random.uniform(700, 900), 2)},
-        {"symbol": "CIPLA", "name": "Cipla Ltd.", "price": round(random.uniform(900, 1200), 2)},
-        {"symbol": "TECHM", "name": "Tech Mahindra Ltd.", "price": round(random.uniform(1100, 1400), 2)},
+        {"symbol": "TATAMOTORS", "name": "Tata Motors Ltd.", "price": round(rng.uniform(500, 1000), 2)},
+        {"symbol": "BAJAJFINSV", "name": "Bajaj Finserv Ltd.", "price": round(rng.uniform(1500, 2000), 2)},
+        {"symbol": "ADANIPORTS", "name": "Adani Ports Ltd.", "price": round(rng.uniform(800, 1200), 2)},
+        {"symbol": "SBIN", "name": "State Bank of India", "price": round(rng.uniform(400, 700), 2)},
+        {"symbol": "HCLTECH", "name": "HCL Technologies Ltd.", "price": round(rng.uniform(1000, 1500), 2)},
+        {"symbol": "ULTRACEMCO", "name": "UltraTech Cement Ltd.", "price": round(rng.uniform(7000, 9000), 2)},
+        {"symbol": "TITAN", "name": "Titan Company Ltd.", "price": round(rng.uniform(2500, 3000), 2)},
+        {"symbol": "JSWSTEEL", "name": "JSW Steel Ltd.", "price": round(rng.uniform(700, 900), 2)},
+        {"symbol": "CIPLA", "name": "Cipla Ltd.", "price": round(rng.uniform(900, 1200), 2)},
+        {"symbol": "TECHM", "name": "Tech Mahindra Ltd.", "price": round(rng.uniform(1100, 1400), 2)},
     ]
     
     result = []
     for stock in stocks[:limit]:
-        changePercent = round(random.uniform(2, 10), 2)  # Gainers have positive change
+        changePercent = round(rng.uniform(2, 10), 2)  # Gainers have positive change
         change = round(stock["price"] * changePercent / 100, 2)
         result.append({
             **stock,
@@ -1065,23 +491,25 @@ def generate_top_gainers(limit=5):
     result.sort(key=lambda x: x["changePercent"], reverse=True)
     return result
 
-def generate_top_losers(limit=5):
+def generate_top_losers(limit=5, rng=None):
+    rng = rng or unseeded_rng()
+    
     stocks = [
-        {"symbol": "MARUTI", "name": "Maruti Suzuki India Ltd.", "price": round(random.uniform(8000, 10000), 2)},
-        {"symbol": "ASIANPAINT", "name": "Asian Paints Ltd.", "price": round(random.uniform(3000, 3500), 2)},
-        {"symbol": "RELIANCE", "name": "Reliance Industries Ltd.", "price": round(random.uniform(2500, 2800), 2)},
-        {"symbol": "BRITANNIA", "name": "Britannia Industries Ltd.", "price": round(random.uniform(4000, 4500), 2)},
-        {"symbol": "NESTLEIND", "name": "Nestle India Ltd.", "price": round(random.uniform(20000, 22000), 2)},
-        {"symbol": "POWERGRID", "name": "Power Grid Corporation", "price": round(random.uniform(200, 300), 2)},
-        {"symbol": "NTPC", "name": "NTPC Ltd.", "price": round(random.uniform(150, 200), 2)},
-        {"symbol": "ONGC", "name": "Oil & Natural Gas Corporation", "price": round(random.uniform(160, 220), 2)},
-        {"symbol": "SUNPHARMA", "name": "Sun Pharmaceutical Industries", "price": round(random.uniform(900, 1100), 2)},
-        {"symbol": "HINDUNILVR", "name": "Hindustan Unilever Ltd.", "price": round(random.uniform(2400, 2700), 2)},
+        {"symbol": "MARUTI", "name": "Maruti Suzuki India Ltd.", "price": round(rng.uniform(8000, 10000), 2)},
+        {"symbol": "ASIANPAINT", "name": "Asian Paints Ltd.", "price": round(rng.uniform(3000, 3500), 2)},
+        {"symbol": "RELIANCE", "name": "Reliance Industries Ltd.", "price": round(rng.uniform(2500, 2800), 2)},
+        {"symbol": "BRITANNIA", "name": "Britannia Industries Ltd.", "price": round(rng.uniform(4000, 4500), 2)},
+        {"symbol": "NESTLEIND", "name": "Nestle India Ltd.", "price": round(rng.uniform(20000, 22000), 2)},
+        {"symbol": "POWERGRID", "name": "Power Grid Corporation", "price": round(rng.uniform(200, 300), 2)},
+        {"symbol": "NTPC", "name": "NTPC Ltd.", "price": round(rng.uniform(150, 200), 2)},
+        {"symbol": "ONGC", "name": "Oil & Natural Gas Corporation", "price": round(rng.uniform(160, 220), 2)},
+        {"symbol": "SUNPHARMA", "name": "Sun Pharmaceutical Industries", "price": round(rng.uniform(900, 1100), 2)},
+        {"symbol": "HINDUNILVR", "name": "Hindustan Unilever Ltd.", "price": round(rng.uniform(2400, 2700), 2)},
     ]
     
     result = []
     for stock in stocks[:limit]:
-        changePercent = round(random.uniform(-8, -2), 2)  # Losers have negative change
+        changePercent = round(rng.uniform(-8, -2), 2)  # Losers have negative change
         change = round(stock["price"] * changePercent / 100, 2)
         result.append({
             **stock,
@@ -1092,33 +520,37 @@ def generate_top_losers(limit=5):
     result.sort(key=lambda x: x["changePercent"])
     return result
 
-def generate_sector_performance():
+def generate_sector_performance(rng=None):
+    rng = rng or unseeded_rng()
+    
     sectors = [
-        {"name": "Information Technology", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Banking & Financial Services", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Oil & Gas", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Pharmaceuticals", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Automobile", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Consumer Goods", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Metal & Mining", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Telecommunications", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Power & Energy", "changePercent": round(random.uniform(-3, 5), 2)},
-        {"name": "Real Estate", "changePercent": round(random.uniform(-3, 5), 2)},
+        {"name": "Information Technology", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Banking & Financial Services", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Oil & Gas", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Pharmaceuticals", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Automobile", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Consumer Goods", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Metal & Mining", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Telecommunications", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Power & Energy", "changePercent": round(rng.uniform(-3, 5), 2)},
+        {"name": "Real Estate", "changePercent": round(rng.uniform(-3, 5), 2)},
     ]
     
     return sectors
 
-def generate_market_overview():
-    advances = random.randint(1200, 2000)
-    declines = random.randint(800, 1800)
-    unchanged = random.randint(100, 300)
+def generate_market_overview(rng=None):
+    rng = rng or unseeded_rng()
+    
+    advances = rng.randint(1200, 2000)
+    declines = rng.randint(800, 1800)
+    unchanged = rng.randint(100, 300)
     
-    volume = random.randint(100000000, 500000000)
-    volume_change = round(random.uniform(-10, 15), 2)
+    volume = rng.randint(100000000, 500000000)
+    volume_change = round(rng.uniform(-10, 15), 2)
     
-    sentiment = random.choice(["Bullish", "Moderately Bullish", "Neutral", "Moderately Bearish", "Bearish"])
+    sentiment = rng.choice(["Bullish", "Moderately Bullish", "Neutral", "Moderately Bearish", "Bearish"])
     
-    comment = random.choice([
+    comment = rng.choice([
         "Markets showing strong momentum as FII buying continues.",
         "Profit booking seen in IT and Banking stocks after recent rally.",
         "Global cues mixed, domestic factors driving market sentiment.",
@@ -1138,14 +570,16 @@ def generate_market_overview():
         "lastUpdated": datetime.now().isoformat()
     }
 
-def generate_stock_news(symbol, stock_details=None):
+def generate_stock_news(symbol, stock_details=None, rng=None):
     """
     Generate realistic news articles for a given stock
     Returns a list of news articles with title, description, source, date, sentiment, and category
     """
+    rng = rng or unseeded_rng()
+    
     if stock_details is None:
         # Get the stock details if not provided
-        stock_details = get_stock_details(symbol)
+        stock_details = generate_stock_details(symbol)
     
     if not stock_details:
         return []
@@ -1172,7 +606,7 @@ def generate_stock_news(symbol, stock_details=None):
     now = datetime.now()
     dates = []
     for i in range(20):  # Generate 20 potential dates
-        days_ago = random.randint(0, 30)
+        days_ago = rng.randint(0, 30)
         date = now - timedelta(days=days_ago)
         dates.append(date.strftime('%Y-%m-%dT%H:%M:%S'))
     
@@ -1180,31 +614,31 @@ def generate_stock_news(symbol, stock_details=None):
     dates.sort(reverse=True)
     
     # Generate 8-15 news items
-    num_news = random.randint(8, 15)
+    num_news = rng.randint(8, 15)
     news_items = []
     
     # 1. Earnings news (if any)
-    if random.random() < 0.7:  # 70% chance of having earnings news
-        beat_or_miss = random.choice(["beat", "miss", "meet"])
-        eps_surprise_percent = random.uniform(-15, 20)
+    if rng.random() < 0.7:  # 70% chance of having earnings news
+        beat_or_miss = rng.choice(["beat", "miss", "meet"])
+        eps_surprise_percent = rng.uniform(-15, 20)
         
         if beat_or_miss == "beat":
             sentiment = "positive"
-            title = f"{company_name} Q{random.randint(1,4)} Results: Beats Estimates, Profit Up {abs(eps_surprise_percent):.1f}%"
-            description = f"{company_name} reported quarterly results that exceeded analyst expectations, with earnings per share {abs(eps_surprise_percent):.1f}% above consensus estimates. Revenue also came in stronger than anticipated, driven by {random.choice(['strong demand', 'new product launches', 'market expansion', 'improved pricing'])}"
+            title = f"{company_name} Q{rng.randint(1,4)} Results: Beats Estimates, Profit Up {abs(eps_surprise_percent):.1f}%"
+            description = f"{company_name} reported quarterly results that exceeded analyst expectations, with earnings per share {abs(eps_surprise_percent):.1f}% above consensus estimates. Revenue also came in stronger than anticipated, driven by {rng.choice(['strong demand', 'new product launches', 'market expansion', 'improved pricing'])}"
         elif beat_or_miss == "miss":
             sentiment = "negative"
-            title = f"{company_name} Q{random.randint(1,4)} Results: Misses Estimates, Profit Down {abs(eps_surprise_percent):.1f}%"
-            description = f"{company_name} reported quarterly results that fell short of analyst expectations, with earnings per share {abs(eps_surprise_percent):.1f}% below consensus estimates. The company cited {random.choice(['challenging market conditions', 'rising input costs', 'supply chain disruptions', 'increased competition'])}"
+            title = f"{company_name} Q{rng.randint(1,4)} Results: Misses Estimates, Profit Down {abs(eps_surprise_percent):.1f}%"
+            description = f"{company_name} reported quarterly results that fell short of analyst expectations, with earnings per share {abs(eps_surprise_percent):.1f}% below consensus estimates. The company cited {rng.choice(['challenging market conditions', 'rising input costs', 'supply chain disruptions', 'increased competition'])}"
         else:
             sentiment = "neutral"
-            title = f"{company_name} Q{random.randint(1,4)} Results In Line With Estimates"
-            description = f"{company_name} reported quarterly results that matched analyst expectations. The company reaffirmed its outlook for the remainder of the fiscal year, citing {random.choice(['stable market conditions', 'steady demand', 'operational efficiency', 'strategic initiatives'])}"
+            title = f"{company_name} Q{rng.randint(1,4)} Results In Line With Estimates"
+            description = f"{company_name} reported quarterly results that matched analyst expectations. The company reaffirmed its outlook for the remainder of the fiscal year, citing {rng.choice(['stable market conditions', 'steady demand', 'operational efficiency', 'strategic initiatives'])}"
         
         news_items.append({
             "title": title,
             "description": description,
-            "source": random.choice(sources)["name"],
+            "source": rng.choice(sources)["name"],
             "date": dates.pop(0),  # Use the most recent date for earnings
             "url": f"https://example.com/news/{symbol.lower()}/earnings",
             "sentiment": sentiment,
@@ -1212,7 +646,7 @@ def generate_stock_news(symbol, stock_details=None):
         })
     
     # 2. Analyst news (1-3 items)
-    num_analyst_news = random.randint(1, 3)
+    num_analyst_news = rng.randint(1, 3)
     analysts = [
         "Morgan Stanley", "Goldman Sachs", "JP Morgan", "Nomura", "CLSA", 
         "UBS", "Bank of America", "Jefferies", "Citi", "Credit Suisse"
@@ -1230,27 +664,27 @@ def generate_stock_news(symbol, stock_details=None):
     ]
     
     for _ in range(num_analyst_news):
-        if random.random() < 0.6:  # 60% chance of rating change, 40% price target update
+        if rng.random() < 0.6:  # 60% chance of rating change, 40% price target update
             # Rating change
-            rating_change = random.choice(rating_changes)
-            analyst = random.choice(analysts)
-            title = f"{analyst} {rating_change['to'] if random.random() < 0.5 else 'Upgrades' if rating_change['sentiment'] == 'positive' else 'Downgrades'} {company_name}"
-            description = f"{analyst} has revised its rating on {company_name} from {rating_change['from']} to {rating_change['to']}, citing {random.choice(['valuation concerns', 'growth outlook', 'sector trends', 'competitive positioning', 'management execution'])}"
+            rating_change = rng.choice(rating_changes)
+            analyst = rng.choice(analysts)
+            title = f"{analyst} {rating_change['to'] if rng.random() < 0.5 else 'Upgrades' if rating_change['sentiment'] == 'positive' else 'Downgrades'} {company_name}"
+            description = f"{analyst} has revised its rating on {company_name} from {rating_change['from']} to {rating_change['to']}, citing {rng.choice(['valuation concerns', 'growth outlook', 'sector trends', 'competitive positioning', 'management execution'])}"
             sentiment = rating_change["sentiment"]
         else:
             # Price target update
-            analyst = random.choice(analysts)
-            price_change_percent = random.uniform(-20, 30)
+            analyst = rng.choice(analysts)
+            price_change_percent = rng.uniform(-20, 30)
             new_target = price * (1 + price_change_percent / 100)
             sentiment = "positive" if price_change_percent > 0 else "negative"
             
             title = f"{analyst} {'Raises' if price_change_percent > 0 else 'Cuts'} {company_name} Price Target to ₹{new_target:.2f}"
-            description = f"{analyst} has {'raised' if price_change_percent > 0 else 'lowered'} its price target on {company_name} to ₹{new_target:.2f} from ₹{price:.2f}, representing a {abs(price_change_percent):.1f}% {'increase' if price_change_percent > 0 else 'decrease'}. The firm cited {random.choice(['strong fundamentals', 'potential headwinds', 'changing market dynamics', 'valuation adjustment', 'growth prospects'])}"
+            description = f"{analyst} has {'raised' if price_change_percent > 0 else 'lowered'} its price target on {company_name} to ₹{new_target:.2f} from ₹{price:.2f}, representing a {abs(price_change_percent):.1f}% {'increase' if price_change_percent > 0 else 'decrease'}. The firm cited {rng.choice(['strong fundamentals', 'potential headwinds', 'changing market dynamics', 'valuation adjustment', 'growth prospects'])}"
         
         news_items.append({
             "title": title,
             "description": description,
-            "source": random.choice(sources)["name"],
+            "source": rng.choice(sources)["name"],
             "date": dates.pop(0),
             "url": f"https://example.com/news/{symbol.lower()}/analyst",
             "sentiment": sentiment,
@@ -1258,44 +692,44 @@ def generate_stock_news(symbol, stock_details=None):
         })
     
     # 3. Company events/announcements (2-4 items)
-    num_company_news = random.randint(2, 4)
+    num_company_news = rng.randint(2, 4)
     company_events = [
         {"event": "dividend", "sentiment": "positive", 
-         "title": f"{company_name} Announces Dividend of ₹{random.randint(2, 20)} Per Share",
-         "desc": f"{company_name} has announced a dividend of ₹{random.randint(2, 20)} per share, payable to shareholders of record as of {(now + timedelta(days=random.randint(10, 30))).strftime('%B %d, %Y')}"},
+         "title": f"{company_name} Announces Dividend of ₹{rng.randint(2, 20)} Per Share",
+         "desc": f"{company_name} has announced a dividend of ₹{rng.randint(2, 20)} per share, payable to shareholders of record as of {(now + timedelta(days=rng.randint(10, 30))).strftime('%B %d, %Y')}"},
         
         {"event": "buyback", "sentiment": "positive", 
-         "title": f"{company_name} Approves Share Buyback Program Worth ₹{random.randint(500, 10000)} Crore",
-         "desc": f"The board of {company_name} has approved a share buyback program worth ₹{random.randint(500, 10000)} crore at a price of up to ₹{price * random.uniform(1.1, 1.4):.2f} per share, representing a premium of {random.uniform(10, 40):.1f}% to the current market price"},
+         "title": f"{company_name} Approves Share Buyback Program Worth ₹{rng.randint(500, 10000)} Crore",
+         "desc": f"The board of {company_name} has approved a share buyback program worth ₹{rng.randint(500, 10000)} crore at a price of up to ₹{price * rng.uniform(1.1, 1.4):.2f} per share, representing a premium of {rng.uniform(10, 40):.1f}% to the current market price"},
         
         {"event": "expansion", "sentiment": "positive", 
-         "title": f"{company_name} Announces Expansion into {random.choice(['International Markets', 'New Product Categories', 'Digital Solutions', 'Retail Segment'])}",
-         "desc": f"{company_name} has announced plans to expand its presence in {random.choice(['international markets', 'new product categories', 'digital solutions', 'the retail segment'])}, investing ₹{random.randint(100, 5000)} crore over the next {random.randint(3, 5)} years"},
+         "title": f"{company_name} Announces Expansion into {rng.choice(['International Markets', 'New Product Categories', 'Digital Solutions', 'Retail Segment'])}",
+         "desc": f"{company_name} has announced plans to expand its presence in {rng.choice(['international markets', 'new product categories', 'digital solutions', 'the retail segment'])}, investing ₹{rng.randint(100, 5000)} crore over the next {rng.randint(3, 5)} years"},
         
         {"event": "acquisition", "sentiment": "neutral", 
-         "title": f"{company_name} Acquires {random.choice(['Startup', 'Rival', 'Tech Firm', 'Manufacturing Unit'])} for ₹{random.randint(100, 5000)} Crore",
-         "desc": f"{company_name} has announced the acquisition of a {random.choice(['startup', 'rival company', 'technology firm', 'manufacturing unit'])} for ₹{random.randint(100, 5000)} crore, which is expected to {random.choice(['enhance product offerings', 'expand market reach', 'improve operational efficiency', 'drive innovation'])}"},
+         "title": f"{company_name} Acquires {rng.choice(['Startup', 'Rival', 'Tech Firm', 'Manufacturing Unit'])} for ₹{rng.randint(100, 5000)} Crore",
+         "desc": f"{company_name} has announced the acquisition of a {rng.choice(['startup', 'rival company', 'technology firm', 'manufacturing unit'])} for ₹{rng.randint(100, 5000)} crore, which is expected to {rng.choice(['enhance product offerings', 'expand market reach', 'improve operational efficiency', 'drive innovation'])}"},
         
         {"event": "management", "sentiment": "neutral", 
-         "title": f"{company_name} Appoints New {random.choice(['CEO', 'CFO', 'CTO', 'COO'])}",
-         "desc": f"{company_name} has announced the appointment of a new {random.choice(['CEO', 'CFO', 'CTO', 'COO'])}, effective from {(now + timedelta(days=random.randint(0, 60))).strftime('%B %d, %Y')}. The new executive brings experience from {random.choice(['leading industry firms', 'global corporations', 'technology companies', 'financial institutions'])}"},
+         "title": f"{company_name} Appoints New {rng.choice(['CEO', 'CFO', 'CTO', 'COO'])}",
+         "desc": f"{company_name} has announced the appointment of a new {rng.choice(['CEO', 'CFO', 'CTO', 'COO'])}, effective from {(now + timedelta(days=rng.randint(0, 60))).strftime('%B %d, %Y')}. The new executive brings experience from {rng.choice(['leading industry firms', 'global corporations', 'technology companies', 'financial institutions'])}"},
         
         {"event": "capex", "sentiment": "positive", 
-         "title": f"{company_name} Announces ₹{random.randint(1000, 10000)} Crore Capital Expenditure Plan",
-         "desc": f"{company_name} has announced a capital expenditure plan of ₹{random.randint(1000, 10000)} crore for the next {random.randint(2, 5)} years, focusing on {random.choice(['capacity expansion', 'modernization', 'digital transformation', 'research and development'])}"},
+         "title": f"{company_name} Announces ₹{rng.randint(1000, 10000)} Crore Capital Expenditure Plan",
+         "desc": f"{company_name} has announced a capital expenditure plan of ₹{rng.randint(1000, 10000)} crore for the next {rng.randint(2, 5)} years, focusing on {rng.choice(['capacity expansion', 'modernization', 'digital transformation', 'research and development'])}"},
         
         {"event": "restructuring", "sentiment": "neutral", 
          "title": f"{company_name} Announces Business Restructuring Plan",
-         "desc": f"{company_name} has announced a comprehensive business restructuring plan aimed at {random.choice(['improving operational efficiency', 'focusing on core businesses', 'reducing costs', 'enhancing shareholder value'])}"}
+         "desc": f"{company_name} has announced a comprehensive business restructuring plan aimed at {rng.choice(['improving operational efficiency', 'focusing on core businesses', 'reducing costs', 'enhancing shareholder value'])}"}
     ]
     
-    selected_events = random.sample(company_events, min(num_company_news, len(company_events)))
+    selected_events = rng.sample(company_events, min(num_company_news, len(company_events)))
     
     for event in selected_events:
         news_items.append({
             "title": event["title"],
             "description": event["desc"],
-            "source": random.choice(sources)["name"],
+            "source": rng.choice(sources)["name"],
             "date": dates.pop(0),
             "url": f"https://example.com/news/{symbol.lower()}/company",
             "sentiment": event["sentiment"],
@@ -1303,7 +737,7 @@ def generate_stock_news(symbol, stock_details=None):
         })
     
     # 4. Sector news (2-3 items)
-    num_sector_news = random.randint(2, 3)
+    num_sector_news = rng.randint(2, 3)
     
     # Sector-specific news templates
     sector_news_templates = {
@@ -1358,12 +792,12 @@ def generate_stock_news(symbol, stock_details=None):
     sector_templates = sector_news_templates.get(sector, sector_news_templates["default"])
     
     for _ in range(num_sector_news):
-        template = random.choice(sector_templates)
+        template = rng.choice(sector_templates)
         
         # Fill in template variables
         if sector in sector_news_templates:
             if "trend" in template["title"].lower():
-                trend = random.choice(template.get("trends", ["growth", "challenges"]))
+                trend = rng.choice(template.get("trends", ["growth", "challenges"]))
                 title = template["title"].replace("{Trend}", trend.title()).replace("{trend}", trend)
                 title = title.replace("{Company}", company_name).replace("{company_name}", company_name)
             else:
@@ -1373,7 +807,7 @@ def generate_stock_news(symbol, stock_details=None):
             for var in ["Direction", "Action", "Factor"]:
                 if "{" + var + "}" in title:
                     var_values = template.get(var.lower() + "s", ["positive", "negative"])
-                    title = title.replace("{" + var + "}", random.choice(var_values))
+                    title = title.replace("{" + var + "}", rng.choice(var_values))
             
             # Replace all remaining variables
             title = title.replace("{Sector}", sector).replace("{sector}", sector.lower())
@@ -1384,7 +818,7 @@ def generate_stock_news(symbol, stock_details=None):
             for key in template:
                 if key != "title" and key != "desc":
                     if "{" + key + "}" in desc:
-                        desc = desc.replace("{" + key + "}", random.choice(template[key]))
+                        desc = desc.replace("{" + key + "}", rng.choice(template[key]))
             
             desc = desc.replace("{Sector}", sector).replace("{sector}", sector.lower())
             desc = desc.replace("{Company}", company_name).replace("{company_name}", company_name)
@@ -1392,7 +826,7 @@ def generate_stock_news(symbol, stock_details=None):
         else:
             # Simple fallback for sectors without templates
             title = f"{sector} Sector Outlook: Impact on {company_name} and Peers"
-            desc = f"Analysis of recent trends in the {sector} sector and their potential impact on companies like {company_name}. Industry experts project {random.choice(['positive', 'mixed', 'challenging'])} conditions in the coming quarters."
+            desc = f"Analysis of recent trends in the {sector} sector and their potential impact on companies like {company_name}. Industry experts project {rng.choice(['positive', 'mixed', 'challenging'])} conditions in the coming quarters."
         
         # Determine sentiment based on content
         if any(word in title.lower() + desc.lower() for word in ["growth", "positive", "expansion", "benefit", "opportunity"]):
@@ -1405,7 +839,7 @@ def generate_stock_news(symbol, stock_details=None):
         news_items.append({
             "title": title,
             "description": desc,
-            "source": random.choice(sources)["name"],
+            "source": rng.choice(sources)["name"],
             "date": dates.pop(0),
             "url": f"https://example.com/news/{symbol.lower()}/sector",
             "sentiment": sentiment,
@@ -1413,7 +847,7 @@ def generate_stock_news(symbol, stock_details=None):
         })
     
     # 5. Market/general news (1-3 items)
-    num_market_news = random.randint(1, 3)
+    num_market_news = rng.randint(1, 3)
     market_news = [
         {"title": "Sensex, Nifty End {Direction} Amid {Factor}; {company_name} Among {Performers}",
          "desc": "Indian equity benchmarks ended {direction} today, with the Sensex {changing} {points} points and Nifty {changing} {nifty_points} points. {company_name} was among the {performers} stocks, {stock_movement}",
@@ -1440,18 +874,18 @@ def generate_stock_news(symbol, stock_details=None):
     ]
     
     for _ in range(num_market_news):
-        template = random.choice(market_news)
+        template = rng.choice(market_news)
         
         # Fill in template variables for title
         title = template["title"]
-        direction = random.choice(template.get("directions", ["Higher", "Lower"]))
+        direction = rng.choice(template.get("directions", ["Higher", "Lower"]))
         title = title.replace("{Direction}", direction)
         title = title.replace("{company_name}", company_name)
         
         for var in ["Factor", "Performers"]:
             if "{" + var + "}" in title:
                 var_values = template.get(var.lower() + "s", ["positive", "negative"])
-                title = title.replace("{" + var + "}", random.choice(var_values))
+                title = title.replace("{" + var + "}", rng.choice(var_values))
         
         # Fill in template variables for description
         desc = template["desc"]
@@ -1461,8 +895,8 @@ def generate_stock_news(symbol, stock_details=None):
         changing = "rising by" if direction == "Higher" else "falling by" if direction == "Lower" else "moving"
         desc = desc.replace("{changing}", changing)
         
-        points = random.randint(100, 800)
-        nifty_points = random.randint(30, 250)
+        points = rng.randint(100, 800)
+        nifty_points = rng.randint(30, 250)
         desc = desc.replace("{points}", str(points))
         desc = desc.replace("{nifty_points}", str(nifty_points))
         
@@ -1470,12 +904,12 @@ def generate_stock_news(symbol, stock_details=None):
         for key in template:
             if key not in ["title", "desc", "directions"]:
                 if "{" + key + "}" in desc:
-                    desc = desc.replace("{" + key + "}", random.choice(template[key]))
+                    desc = desc.replace("{" + key + "}", rng.choice(template[key]))
         
         # Replace specific variables
         if "{stock_movement}" in desc:
-            stock_direction = random.choice(template.get("stock_directions", ["gaining", "losing"]))
-            percentage = random.choice(template.get("percentages", ["1-2%", "2-3%"]))
+            stock_direction = rng.choice(template.get("stock_directions", ["gaining", "losing"]))
+            percentage = rng.choice(template.get("percentages", ["1-2%", "2-3%"]))
             desc = desc.replace("{stock_movement}", f"{stock_direction} {percentage} in the session")
         
         # Determine sentiment based on content for market news
@@ -1489,7 +923,7 @@ def generate_stock_news(symbol, stock_details=None):
         news_items.append({
             "title": title,
             "description": desc,
-            "source": random.choice(sources)["name"],
+            "source": rng.choice(sources)["name"],
             "date": dates.pop(0),
             "url": f"https://example.com/news/{symbol.lower()}/market",
             "sentiment": sentiment,
@@ -1499,15 +933,15 @@ def generate_stock_news(symbol, stock_details=None):
     # Ensure we have at least the minimum number of news items
     while len(news_items) < num_news and dates:
         # Add more generic news if needed
-        title = f"{company_name} {random.choice(['Shares', 'Stock', 'Shares'])}: {random.choice(['What to Expect', 'Analyst Views', 'Market Outlook', 'Performance Review'])}"
-        desc = f"A detailed look at {company_name}'s recent performance and outlook. {random.choice(['Analysts remain divided on its future prospects.', 'The company continues to focus on its core business segments.', 'Recent market trends suggest cautious optimism for the stock.', 'Investors are closely watching developments in the sector.'])}"
+        title = f"{company_name} {rng.choice(['Shares', 'Stock', 'Shares'])}: {rng.choice(['What to Expect', 'Analyst Views', 'Market Outlook', 'Performance Review'])}"
+        desc = f"A detailed look at {company_name}'s recent performance and outlook. {rng.choice(['Analysts remain divided on its future prospects.', 'The company continues to focus on its core business segments.', 'Recent market trends suggest cautious optimism for the stock.', 'Investors are closely watching developments in the sector.'])}"
         
-        sentiment = random.choice(["positive", "negative", "neutral"])
+        sentiment = rng.choice(["positive", "negative", "neutral"])
         
         news_items.append({
             "title": title,
             "description": desc,
-            "source": random.choice(sources)["name"],
+            "source": rng.choice(sources)["name"],
             "date": dates.pop(0),
             "url": f"https://example.com/news/{symbol.lower()}/general",
             "sentiment": sentiment,
@@ -1572,7 +1006,7 @@ def get_stock_news(symbol):
         })
     
     # Get the stock details
-    stock_details = next((s for s in INDIAN_STOCKS if s["symbol"] == symbol), None)
+    stock_details = STOCK_REGISTRY.get(symbol)
     if not stock_details:
         print(f"Stock not found: '{symbol}', returning default news data")
         # Return the same default news as above
@@ -1648,7 +1082,7 @@ def get_stock_fundamentals(symbol):
         })
     
     # Find stock details from our database
-    stock = next((s for s in INDIAN_STOCKS if s["symbol"] == symbol), None)
+    stock = STOCK_REGISTRY.get(symbol)
     if not stock:
         print(f"Stock not found: {symbol}, returning default fundamentals data")
         # Return default NIFTY fundamentals
@@ -1667,26 +1101,8 @@ def get_stock_fundamentals(symbol):
             }
         })
     
-    # Generate a consistent price based on the symbol
-    symbol_hash = sum(ord(c) for c in symbol)
-    price = round(500 + (symbol_hash % 3000) + random.uniform(-50, 50), 2)
-    change = round(random.uniform(-50, 50), 2)
-    change_percent = round(change / price * 100, 2)
-    
-    # Create stock details object
-    stock_details = {
-        "symbol": symbol,
-        "name": stock["name"],
-        "sector": stock["sector"],
-        "price": price,
-        "change": change,
-        "change_percent": change_percent
-    }
-    
-    # Generate fundamentals with the stock details
-    fundamentals = generate_fundamentals(symbol, stock_details)
-    
-    return jsonify(fundamentals)
+    # Served from the day's batch-generated universe
+    return jsonify(get_fundamentals_universe().record(symbol))
 
 def generate_default_stock_details():
     """Generate default stock details for NIFTY when symbol is not found or undefined"""
@@ -1825,6 +1241,44 @@ def generate_default_stock_details():
 def get_portfolio():
     return jsonify(generate_portfolio())
 
+@app.route('/api/portfolio/risk', methods=['GET', 'POST'])
+def get_portfolio_risk():
+    """
+    Get volatility, VaR, beta and risk contributions for a portfolio.
+    POST {"holdings": [{"symbol", "value"} or {"symbol", "quantity"[, "price"]}], "confidence": 0.95};
+    GET returns the risk of the demo portfolio.
+    """
+    model = get_risk_model()
+    if request.method == 'GET':
+        holdings = generate_portfolio()["holdings"]
+        exposures = {holding["symbol"]: holding["currentValue"] for holding in holdings}
+        confidence = DEFAULT_RISK_CONFIDENCE
+    else:
+        payload = request.get_json(silent=True) or {}
+        exposures = {}
+        try:
+            for holding in payload.get("holdings", []):
+                symbol = str(holding["symbol"]).upper()
+                if "value" in holding:
+                    value = float(holding["value"])
+                else:
+                    price = holding.get("price", model.last_price(symbol))
+                    value = float(holding["quantity"]) * float(price) if price is not None else 0.0
+                if not math.isfinite(value):
+                    raise ValueError(value)
+                exposures[symbol] = exposures.get(symbol, 0.0) + value
+            confidence = float(payload.get("confidence", DEFAULT_RISK_CONFIDENCE))
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return jsonify({"error": "Each holding needs a symbol and a finite value or quantity"}), 400
+        if not 0.5 <= confidence < 1:
+            return jsonify({"error": "confidence must be between 0.5 and 1"}), 400
+    
+    if not exposures:
+        return jsonify({"error": "No holdings provided"}), 400
+    
+    risk = model.portfolio_risk(exposures, confidence)
+    return jsonify(risk), 400 if "error" in risk else 200
+
 @app.route('/api/portfolio/performance', methods=['GET'])
 def get_portfolio_performance():
     return jsonify(generate_portfolio_performance())
@@ -1832,59 +1286,113 @@ def get_portfolio_performance():
 @app.route('/api/market/top-gainers', methods=['GET'])
 def get_top_gainers():
     limit = int(request.args.get('limit', 5))
-    movers = generate_market_movers(limit)
-    return jsonify(movers['gainers'])
+    return jsonify(get_market_snapshot()['movers']['gainers'][:limit])
 
 @app.route('/api/market/top-losers', methods=['GET'])
 def get_top_losers():
     limit = int(request.args.get('limit', 5))
-    movers = generate_market_movers(limit)
-    return jsonify(movers['losers'])
+    return jsonify(get_market_snapshot()['movers']['losers'][:limit])
 
 @app.route('/api/market/sector-performance', methods=['GET'])
+@cached_response(MARKET_RESPONSE_CACHE, MARKET_CACHE_TTLS["sector-performance"])
 def get_sector_performance():
     """Get detailed sector performance with insights and trends"""
-    return jsonify(generate_detailed_sector_performance())
+    return jsonify(get_market_snapshot()["sectors"])
 
 @app.route('/api/market/overview', methods=['GET'])
+@cached_response(MARKET_RESPONSE_CACHE, MARKET_CACHE_TTLS["overview"])
 def get_market_overview():
     """Get comprehensive market overview with all data points"""
-    return jsonify(generate_enhanced_market_overview())
+    return jsonify(get_market_snapshot())
 
 @app.route('/api/market/breadth', methods=['GET'])
+@cached_response(MARKET_RESPONSE_CACHE, MARKET_CACHE_TTLS["breadth"])
 def get_market_breadth():
     """Get detailed market breadth data across exchanges and market caps"""
-    return jsonify(generate_market_breadth())
+    return jsonify(get_market_snapshot()["breadth"])
 
 @app.route('/api/market/sentiment', methods=['GET'])
+@cached_response(MARKET_RESPONSE_CACHE, MARKET_CACHE_TTLS["sentiment"])
 def get_market_sentiment():
     """Get overall market sentiment with multiple indicators"""
-    return jsonify(generate_market_sentiment())
+    return jsonify(get_market_snapshot()["sentiment"])
+
+@app.route('/api/market/cache-stats', methods=['GET'])
+def get_market_cache_stats():
+    """Get hit/miss counters for the market response cache"""
+    return jsonify(MARKET_RESPONSE_CACHE.stats())
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Per-route request metrics in the Prometheus text format"""
+    return Response(REQUEST_METRICS.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# Pushes index and watchlist quote changes once per market tick instead of clients polling
+MARKET_STREAM = MarketStream(
+    build_indices=lambda: generate_market_indices(),
+    build_quote=lambda symbol, tick: generate_stock_quote(symbol, seeded_rng("quote", symbol, tick)),
+    tick_seconds=MARKET_TICK_SECONDS
+)
+
+@app.route('/api/stream/market', methods=['GET'])
+def stream_market():
+    """
+    Server-Sent Events stream of market updates.
+    ?symbols=TCS,INFY subscribes to those quotes; ?indices=0 leaves out the index feed.
+    Sends an `indices` and/or `quote` event per change, one snapshot on connect.
+    """
+    symbols, indices, error = parse_subscription(
+        request.args.get('symbols'), request.args.get('indices'), STOCK_REGISTRY.get
+    )
+    if error:
+        return jsonify({"error": error}), 400
+    
+    # HEAD never iterates the body, so it must not take a stream slot
+    if request.method != 'GET':
+        response = Response(mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    client = MARKET_STREAM.subscribe(symbols, indices)
+    if client is None:
+        return jsonify({"error": "Too many open streams, fall back to polling"}), 503
+    
+    response = Response(stream_with_context(MARKET_STREAM.events(client)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Keep reverse proxies from buffering events
+    # The generator's cleanup only runs once iterated; closing the response always releases the client
+    response.call_on_close(lambda: MARKET_STREAM.unsubscribe(client))
+    return response
+
+@app.route('/api/stream/stats', methods=['GET'])
+def get_stream_stats():
+    """Get connected stream clients and delivery counters"""
+    return jsonify(MARKET_STREAM.stats())
 
 @app.route('/api/market/most-active', methods=['GET'])
 def get_most_active():
     limit = int(request.args.get('limit', 5))
-    movers = generate_market_movers(limit)
-    return jsonify(movers['mostActive'])
+    return jsonify(get_market_snapshot()['movers']['mostActive'][:limit])
+
+RECOMMENDED_COUNT = 10
 
 @app.route('/api/stock/recommended', methods=['GET'])
 def get_recommended_stocks():
     """Get AI-recommended stocks based on market trends and predictions"""
     try:
-        # Set seed for consistent results across requests
-        random.seed(int(time.time() / 86400))  # Changes daily
+        # Seed by day for consistent results across requests
+        day = time_bucket(86400)  # Changes daily
         
-        # Define a set of consistently recommended stocks (to avoid randomness causing errors)
-        recommended_symbols = ["RELIANCE", "HDFCBANK", "INFY", "TCS", "TATAMOTORS", "ICICIBANK", "BHARTIARTL", "MARUTI", "WIPRO", "ADANIPORTS"]
+        # Recommend the day's highest fundamental scores
+        universe = get_fundamentals_universe()
+        recommended_symbols = universe.top(RECOMMENDED_COUNT)
         recommended_stocks = []
         
         for symbol in recommended_symbols:
             # Find actual stock data
-            stock_data = None
-            for stock in INDIAN_STOCKS:
-                if stock["symbol"] == symbol:
-                    stock_data = stock.copy()
-                    break
+            stock_data = STOCK_REGISTRY.get(symbol)
+            if stock_data:
+                stock_data = stock_data.copy()
             
             # Use fallback if stock not found
             if not stock_data:
@@ -1897,13 +1405,13 @@ def get_recommended_stocks():
             
             # Generate consistent stock price and change data
             symbol_hash = sum(ord(c) for c in symbol)
-            random.seed(symbol_hash)  # Ensure consistent randomness based on symbol
+            rng = seeded_rng("recommended", symbol, day)  # Ensure consistent randomness based on symbol
             
             # Base price for consistency across requests
             base_price = round(500 + (symbol_hash % 3000), 2)
             
             # Generate change based on symbol hash
-            change_percent = round(random.uniform(-2.5, 5.0), 2)  # More positive than negative
+            change_percent = round(rng.uniform(-2.5, 5.0), 2)  # More positive than negative
             change = round(base_price * change_percent / 100, 2)
             
             # Generate AI analysis for the stock
@@ -1915,31 +1423,31 @@ def get_recommended_stocks():
             ai_analysis = {
                 "shortTerm": {
                     "trend": "up" if bullish else "down",
-                    "prediction": f"{'Increase' if bullish else 'Decrease'} of {round(random.uniform(1, 5 if bullish else 3), 1)}% expected",
-                    "timeframe": f"{random.randint(1, 4)} weeks",
-                    "confidence": round(confidence - random.randint(0, 10), 1)
+                    "prediction": f"{'Increase' if bullish else 'Decrease'} of {round(rng.uniform(1, 5 if bullish else 3), 1)}% expected",
+                    "timeframe": f"{rng.randint(1, 4)} weeks",
+                    "confidence": round(confidence - rng.randint(0, 10), 1)
                 },
                 "longTerm": {
-                    "trend": "up" if (bullish or random.random() > 0.3) else "flat",  # Long term is more often up
+                    "trend": "up" if (bullish or rng.random() > 0.3) else "flat",  # Long term is more often up
                     "prediction": f"{'Strong growth' if bullish else 'Stable performance'} expected",
-                    "timeframe": f"{random.randint(6, 18)} months",
-                    "confidence": round(confidence - random.randint(10, 15), 1)  # Lower confidence for long term
+                    "timeframe": f"{rng.randint(6, 18)} months",
+                    "confidence": round(confidence - rng.randint(10, 15), 1)  # Lower confidence for long term
                 },
                 "riskAssessment": {
-                    "level": random.choice(["Low", "Moderate", "High"]),
+                    "level": rng.choice(["Low", "Moderate", "High"]),
                     "factors": [
-                        random.choice([
+                        rng.choice([
                             "Market volatility exposure",
                             "Sector headwinds",
                             "Competitive pressures",
                             "Regulatory challenges"
-                        ]) if not bullish else random.choice([
+                        ]) if not bullish else rng.choice([
                             "Strong balance sheet",
                             "Industry leadership",
                             "Innovation potential",
                             "Expansion opportunities"
                         ]),
-                        random.choice([
+                        rng.choice([
                             "Consistent dividend history",
                             "Solid cash flow generation",
                             "Diversified revenue streams",
@@ -1959,15 +1467,16 @@ def get_recommended_stocks():
                 "changePercent": change_percent,
                 "sector": stock_data["sector"],
                 "predictionAccuracy": confidence,
-                "recommendationRating": random.choice(["Strong Buy", "Buy", "Hold"]) if bullish else random.choice(["Hold", "Sell"]),
-                "recommendationReason": random.choice([
+                "fundamentalScore": universe.record(symbol)["fundamental_score"] if symbol in universe else None,
+                "recommendationRating": rng.choice(["Strong Buy", "Buy", "Hold"]) if bullish else rng.choice(["Hold", "Sell"]),
+                "recommendationReason": rng.choice([
                     f"Strong growth potential in the {stock_data['sector']} sector",
                     "Undervalued based on current financial metrics",
                     "Positive technical indicators and momentum",
                     "Strategic initiatives expected to boost performance",
                     "Market leader with competitive advantages",
                     "Innovative product pipeline and research efforts"
-                ]) if bullish else random.choice([
+                ]) if bullish else rng.choice([
                     "Potential headwinds in the upcoming quarter",
                     "Valuation appears stretched at current levels",
                     "Technical indicators suggest caution",
@@ -2099,6 +1608,20 @@ def get_recommended_stocks():
         
         return jsonify({"recommendations": fallback_recommendations})
 
+# Trained models saved by prediction_demo.py; loaded lazily and never trained on request
+MODEL_REGISTRY = ModelRegistry()
+MODEL_HISTORY_DAYS = 120  # Enough bars for the 50-day SMA feature plus the LSTM window
+
+def generate_model_forecast(symbol, days=30):
+    """Forecast with the symbol's registered models, or None when none are saved"""
+    if MODEL_REGISTRY.latest_version(symbol) is None:
+        return None
+    try:
+        return MODEL_REGISTRY.forecast(symbol, load_price_history(symbol, MODEL_HISTORY_DAYS), days)
+    except Exception as e:
+        print(f"Error forecasting {symbol} with registered models: {str(e)}")
+        return None
+
 @app.route('/api/stock/<symbol>/prediction', methods=['GET'])
 def get_stock_prediction(symbol):
     """Get predictive data for a specific stock"""
@@ -2111,11 +1634,7 @@ def get_stock_prediction(symbol):
             return generate_default_prediction(days)
         
         # Find the stock in our list
-        stock_data = None
-        for stock in INDIAN_STOCKS:
-            if stock["symbol"] == symbol:
-                stock_data = stock
-                break
+        stock_data = STOCK_REGISTRY.get(symbol)
                 
         if not stock_data:
             print(f"Stock not found: {symbol}, returning default prediction")
@@ -2123,7 +1642,7 @@ def get_stock_prediction(symbol):
         
         # Get base price for the stock based on symbol
         symbol_hash = sum(ord(c) for c in symbol)
-        random.seed(symbol_hash)  # Ensure consistent randomness based on symbol
+        rng = seeded_rng("prediction", symbol, time_bucket(86400))  # Ensure consistent randomness based on symbol
         
         # Base price for consistency across requests
         base_price = round(500 + (symbol_hash % 3000), 2)
@@ -2131,34 +1650,51 @@ def get_stock_prediction(symbol):
         # Determine trend bias based on symbol (some stocks will tend up, others down)
         trend_bias = -1 if symbol_hash % 3 == 0 else 1  # 2/3 of stocks trend up, 1/3 trend down
         
+        # Use the registered models' forecast when this symbol has trained models
+        model_forecast = generate_model_forecast(symbol, days)
+        if model_forecast:
+            base_price = round(model_forecast["lastPrice"], 2)
+            trend_bias = 1 if model_forecast["predictions"][-1]["ensemble"] >= base_price else -1
+        
+        # Percentile bands from GBM paths fitted to the symbol's own history
+        bands = prediction_bands(symbol, days)
+        
         # Generate daily predictions
         daily_predictions = []
         current_date = datetime.now()
         current_price = base_price
         
         for i in range(days):
-            future_date = current_date + timedelta(days=i)
-            
-            # The further in future, the higher the variance
-            volatility = 0.01 + (i / days) * 0.03
-            
-            # Generate price change with trend bias and random noise
-            day_change = current_price * (trend_bias * 0.002 + random.uniform(-volatility, volatility))
-            future_price = current_price + day_change
-            
-            # Ensure price doesn't go below a reasonable amount
-            future_price = max(current_price * 0.5, future_price)
+            if model_forecast:
+                forecast_day = model_forecast["predictions"][i]
+                future_date = datetime.strptime(forecast_day["date"], "%Y-%m-%d")
+                future_price = forecast_day["ensemble"]
+            else:
+                future_date = current_date + timedelta(days=i)
+                
+                # The further in future, the higher the variance
+                volatility = 0.01 + (i / days) * 0.03
+                
+                # Generate price change with trend bias and random noise
+                day_change = current_price * (trend_bias * 0.002 + rng.uniform(-volatility, volatility))
+                future_price = current_price + day_change
+                
+                # Ensure price doesn't go below a reasonable amount
+                future_price = max(current_price * 0.5, future_price)
             
             # Add some randomness to confidence based on distance into future
-            confidence = round(max(60, 95 - (i / days) * 30 + random.uniform(-5, 5)), 1)
+            confidence = round(max(60, 95 - (i / days) * 30 + rng.uniform(-5, 5)), 1)
+            
+            # 90% band: the 5th and 95th path percentiles, centred on this forecast
+            lower_ratio, upper_ratio = band_ratios(bands, min(i, len(bands["mean"]) - 1))
             
             # Add prediction data for this day
             daily_predictions.append({
                 "date": future_date.strftime("%Y-%m-%d"),
                 "price": round(future_price, 2),
                 "confidence": confidence,
-                "upperBound": round(future_price * (1 + 0.01 * (100 - confidence) / 10), 2),
-                "lowerBound": round(future_price * (1 - 0.01 * (100 - confidence) / 10), 2)
+                "upperBound": round(future_price * upper_ratio, 2),
+                "lowerBound": round(future_price * lower_ratio, 2)
             })
             
             # Update current price for next prediction
@@ -2175,14 +1711,14 @@ def get_stock_prediction(symbol):
         # Generate RSI value that aligns with trend
         rsi_mid = 50
         rsi_range = 20
-        rsi = rsi_mid + (trend_bias * random.uniform(5, rsi_range))
+        rsi = rsi_mid + (trend_bias * rng.uniform(5, rsi_range))
         rsi = max(20, min(80, rsi))  # Keep RSI in reasonable range
         
         # Generate MACD value
-        macd = trend_bias * random.uniform(0.5, 2.0)
+        macd = trend_bias * rng.uniform(0.5, 2.0)
         
         # Generate technical analysis data
-        sma_mod = random.uniform(0.02, 0.1)
+        sma_mod = rng.uniform(0.02, 0.1)
         bullish = trend_bias > 0
         
         technical_analysis = {
@@ -2217,16 +1753,31 @@ def get_stock_prediction(symbol):
         }
         
         # Determine model accuracy based on stock industry and randomness
-        model_accuracy = 80 + (symbol_hash % 10) + random.randint(0, 5)
+        model_accuracy = 80 + (symbol_hash % 10) + rng.randint(0, 5)
         model_accuracy = min(95, model_accuracy)  # Cap at 95% accuracy
         
+        # Registered models report their held-out ensemble R² instead
+        if model_forecast:
+            r2 = model_forecast["metadata"].get("metrics", {}).get("ensemble", {}).get("R²")
+            if r2 is not None:
+                model_accuracy = round(max(0.0, r2) * 100, 1)
+        
         prediction_result = {
             "symbol": symbol,
             "name": stock_data["name"],
             "currentPrice": base_price, 
             "predictions": daily_predictions,
             "analysis": technical_analysis,
-            "modelAccuracy": model_accuracy
+            "modelAccuracy": model_accuracy,
+            "source": "model" if model_forecast else "simulated",
+            "modelVersion": model_forecast["version"] if model_forecast else None,
+            "monteCarlo": {
+                "paths": bands["paths"],
+                "dailyDrift": round(bands["drift"], 6),
+                "dailyVolatility": round(bands["volatility"], 6),
+                "bandPercentiles": [5, 95],
+                "probabilityUp": bands["probabilityUp"][-1]
+            }
         }
         
         return jsonify(prediction_result)
@@ -2236,8 +1787,10 @@ def get_stock_prediction(symbol):
         return generate_default_prediction(days)
 
 
-def generate_default_prediction(days=30):
+def generate_default_prediction(days=30, rng=None):
     """Generate default prediction data when a symbol is not found or is undefined"""
+    rng = rng or unseeded_rng()
+    
     # Base values for NIFTY 50
     base_price = 24542.17
     
@@ -2250,7 +1803,7 @@ def generate_default_prediction(days=30):
         # Slight upward bias for index
         volatility = 0.005 + (i / days) * 0.015
         # Small random daily change with slight upward trend
-        day_change_percent = 0.001 + random.uniform(-volatility, volatility)
+        day_change_percent = 0.001 + rng.uniform(-volatility, volatility)
         
         # Calculate confidence (decreases as we go further into future)
         confidence = round(max(70, 90 - (i / days) * 20), 1)
@@ -2307,47 +1860,210 @@ def generate_default_prediction(days=30):
         "modelAccuracy": 85
     })
 
+# Longest history one request may ask for: the whole daily series (five years of bars)
+HISTORY_MAX_DAYS = DAILY_HISTORY_DAYS
+
+@app.route('/api/stock/<symbol>/historical', methods=['GET'])
+def get_historical_data(symbol):
+    """Get daily OHLCV price history for a specific stock (days clamped to 1..HISTORY_MAX_DAYS)"""
+    try:
+        days = int(request.args.get('days', 365))
+    except ValueError:
+        return jsonify({"error": "days must be an integer"}), 400
+    days = max(1, min(days, HISTORY_MAX_DAYS))
+    return jsonify(generate_stock_price_history(symbol, days))
+
 @app.route('/api/stocks/list', methods=['GET'])
 def get_stocks_list():
     """Return the full list of available stocks"""
     return jsonify(INDIAN_STOCKS)
 
-@app.route('/api/fundamental/screener', methods=['GET'])
-def fundamental_screener():
-    """Filter stocks based on fundamental criteria"""
-    min_pe = float(request.args.get('min_pe', 0))
-    max_pe = float(request.args.get('max_pe', 100))
-    min_market_cap = float(request.args.get('min_market_cap', 0))
-    sector = request.args.get('sector', None)
+@app.route('/api/search', methods=['GET'])
+def search_stocks():
+    """Type-ahead search over symbols and company names, best matches first"""
+    query = request.args.get('query', '')
+    try:
+        limit = int(request.args.get('limit', SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        limit = SEARCH_DEFAULT_LIMIT
+    return jsonify(SEARCH_INDEX.search(query, limit))
+
+# Batch lookups: limits and the fields making up a quote
+BATCH_MAX_SYMBOLS = 100
+BATCH_SECTIONS = ("details", "quote", "fundamentals")
+QUOTE_FIELDS = ("price", "change", "changePercent", "open", "high", "low", "previousClose", "volume")
+
+def string_list(value):
+    """Split a comma-separated string or pass through a list of strings; None for anything else"""
+    if isinstance(value, str):
+        return value.split(',')
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return value
+    return None
+
+@app.route('/api/stocks/batch', methods=['GET', 'POST'])
+def get_stocks_batch():
+    """
+    Get details, quotes and optionally fundamentals for many stocks in one request.
+    GET takes ?symbols=A,B,C&include=details,quote,fundamentals; POST takes the same
+    keys in a JSON body, with symbols and include given as lists or comma strings.
+    """
+    if request.method == 'POST':
+        payload = request.get_json(silent=True) or {}
+        if not isinstance(payload, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        symbols = string_list(payload.get('symbols', []))
+        include = string_list(payload.get('include', ['details']))
+    else:
+        symbols = request.args.get('symbols', '').split(',')
+        include = request.args.get('include', 'details').split(',')
+    
+    if symbols is None or include is None:
+        return jsonify({"error": "symbols and include must be lists of strings or comma-separated strings"}), 400
     
+    # Normalize, de-duplicate while keeping request order
+    symbols = list(dict.fromkeys(s.strip() for s in symbols if s and s.strip()))
+    include = {section.strip() for section in include if section.strip() in BATCH_SECTIONS} or {"details"}
+    
+    if not symbols:
+        return jsonify({"error": "No symbols provided"}), 400
+    if len(symbols) > BATCH_MAX_SYMBOLS:
+        return jsonify({"error": f"At most {BATCH_MAX_SYMBOLS} symbols per batch"}), 400
+    
+    return jsonify(generate_stock_batch(symbols, include))
+
+def generate_stock_batch(symbols, include=("details",), rng=None):
+    """Build batch results for the given symbols, sharing one registry lookup and generator"""
+    rng = rng or unseeded_rng()
     results = []
+    not_found = []
     
-    for stock in INDIAN_STOCKS:
-        # Only apply sector filter if specified
-        if sector and stock["sector"] != sector:
+    for symbol, stock in zip(symbols, (STOCK_REGISTRY.get(s) for s in symbols)):
+        if not stock:
+            not_found.append(symbol)
             continue
-            
-        # Generate consistent fundamentals for screening
-        symbol_hash = sum(ord(c) for c in stock["symbol"])
-        price = 500 + (symbol_hash % 3000)
-        market_cap = price * (10000000 + (symbol_hash % 100000000))
-        pe = 15 + (symbol_hash % 25)
         
-        if pe < min_pe or pe > max_pe:
-            continue
-            
-        if market_cap < min_market_cap:
-            continue
-            
-        results.append({
-            **stock,
-            "price": price,
-            "marketCap": market_cap,
-            "pe": pe,
-            "dividendYield": round(1 + (symbol_hash % 400) / 100, 2)
-        })
+        details = generate_stock_details(symbol, stock, rng)
+        if "details" in include:
+            item = details
+        else:
+            item = {
+                "symbol": symbol,
+                "name": stock["name"],
+                "exchange": stock.get("exchange", "NSE"),
+                "sector": stock.get("sector", "Unknown")
+            }
+        
+        if "quote" in include:
+            item["quote"] = {field: details[field] for field in QUOTE_FIELDS}
+        
+        if "fundamentals" in include:
+            # The same daily universe the fundamentals endpoint serves
+            item["fundamentals"] = get_fundamentals_universe().record(symbol)
+        
+        results.append(item)
+    
+    return {
+        "results": results,
+        "notFound": not_found
+    }
+
+@app.route('/api/fundamental/screener', methods=['GET'])
+def fundamental_screener():
+    """
+    Filter stocks based on fundamental criteria.
+    Range filters: min_/max_ pe, market_cap, price, dividend_yield; sector.
+    Paging: sort=<metric>, order=asc|desc, limit, offset. The total number of
+    matches is returned in the X-Total-Count header.
+    """
+    try:
+        ranges = {
+            metric: tuple(
+                float(request.args[param]) if request.args.get(param) not in (None, '') else None
+                for param in params
+            )
+            for metric, params in SCREENER_RANGE_PARAMS.items()
+        }
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = request.args.get('limit')
+        limit = min(SCREENER_MAX_LIMIT, max(0, int(limit))) if limit else None
+    except ValueError:
+        return jsonify({"error": "Screener filters and paging must be numeric"}), 400
+    
+    sort = request.args.get('sort') or None
+    if sort and sort not in SCREENER_COLUMNS:
+        return jsonify({"error": f"Cannot sort by {sort}; use one of {', '.join(SCREENER_COLUMNS)}"}), 400
+    descending = request.args.get('order', 'asc').lower() == 'desc'
+    
+    # Screen the day's fundamentals universe so values match /api/stock/<symbol>/fundamentals
+    table = get_fundamentals_universe().table
+    mask = table.filter({SCREENER_COLUMNS[metric]: bounds for metric, bounds in ranges.items()},
+                        sector=request.args.get('sector', None))
+    rows, total = table.select(mask, SCREENER_COLUMNS.get(sort), descending, offset, limit)
+    
+    response = jsonify([screener_record(table, row) for row in rows])
+    response.headers['X-Total-Count'] = str(total)
+    return response
+
+@app.route('/api/fundamental/screen', methods=['GET', 'POST'])
+def fundamental_screen():
+    """
+    Screen the universe with a boolean expression over any fundamentals field,
+    e.g. ?q=ROE > 15 and D/E < 0.5 and sector in (IT, Pharma).
+    Also takes sort, order=asc|desc, limit, offset and fields (comma-separated
+    extra columns to return); POST accepts the same keys as a JSON body.
+    """
+    params = (request.get_json(silent=True) or {}) if request.method == 'POST' else request.args
+    if not isinstance(params, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    query = params.get('q') or params.get('query', '')
+    extra = string_list(params.get('fields') or [])
+    if not all(isinstance(params.get(key, ''), str) for key in ('q', 'query', 'sort', 'order')) or extra is None:
+        return jsonify({"error": "q, sort and order must be strings and fields a list of strings"}), 400
+    table = get_fundamentals_universe().table
+    
+    try:
+        mask = evaluate_query(query, table)
+        offset = max(0, int(params.get('offset', 0)))
+        limit = min(SCREENER_MAX_LIMIT, max(0, int(params.get('limit', 100))))
+    except ScreenerQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    
+    sort = params.get('sort') or None
+    if sort:
+        sort = table.resolve(sort)
+        if sort not in table.columns:
+            return jsonify({"error": f"Cannot sort by {params.get('sort')}"}), 400
+    descending = str(params.get('order', 'asc')).lower() == 'desc'
+    rows, total = table.select(mask, sort, descending, offset, limit)
+    
+    # Return the fields the query used plus any requested ones
+    fields = referenced_fields(parse_query(query), table)
+    for name in extra:
+        column = table.resolve(name.strip()) if name.strip() else None
+        if column and column not in fields:
+            fields.append(column)
+    if sort and sort not in fields:
+        fields.append(sort)
+    fields = [field for field in fields if field not in LABEL_FIELDS]
     
-    return jsonify(results)
+    return jsonify({
+        "query": query,
+        "total": total,
+        "offset": offset,
+        "fields": fields,
+        "results": [
+            {
+                "symbol": table.stocks[row]["symbol"],
+                "name": table.stocks[row]["name"],
+                "sector": table.stocks[row].get("sector"),
+                **{field: table.record(row, [field])[field] for field in fields}
+            }
+            for row in rows
+        ]
+    })
 
 @app.route('/api/stock/<symbol>', methods=['GET'])
 def get_stock_details(symbol):
@@ -2358,38 +2074,69 @@ def get_stock_details(symbol):
         return generate_default_stock_details()
     
     # Find the stock in our list
-    stock_data = None
-    for stock in INDIAN_STOCKS:
-        if stock["symbol"] == symbol:
-            stock_data = stock
-            break
+    stock_data = STOCK_REGISTRY.get(symbol)
     
     if not stock_data:
         print(f"Stock not found: '{symbol}', returning default stock details")
         # Return default data instead of 404 error
         return generate_default_stock_details()
     
+    return jsonify(generate_stock_details(symbol, stock_data))
+
+def generate_stock_quote(symbol, rng=None):
+    """Generate the price fields of a stock quote"""
+    rng = rng or unseeded_rng()
+    
+    symbol_hash = sum(ord(c) for c in symbol)
+    price = round(500 + (symbol_hash % 3000) + rng.uniform(-50, 50), 2)
+    change = round(rng.uniform(-50, 50), 2)
+    
+    return {
+        "symbol": symbol,
+        "price": price,
+        "change": change,
+        "changePercent": round(change / price * 100, 2),
+        "open": round(price - rng.uniform(-20, 20), 2),
+        "high": round(price + rng.uniform(10, 30), 2),
+        "low": round(price - rng.uniform(10, 30), 2),
+        "previousClose": round(price - change, 2),
+        "volume": round(rng.uniform(100000, 5000000))
+    }
+
+def generate_stock_details(symbol, stock_data=None, rng=None):
+    """
+    Generate the detail record for a listed stock, or None if it is not listed
+    """
+    if stock_data is None:
+        stock_data = STOCK_REGISTRY.get(symbol)
+    
+    if not stock_data:
+        return None
+    
+    rng = rng or unseeded_rng()
+    
     # Generate a consistent price based on the symbol
     symbol_hash = sum(ord(c) for c in symbol)
-    price = round(500 + (symbol_hash % 3000) + random.uniform(-50, 50), 2)
-    change = round(random.uniform(-50, 50), 2)
-    change_percent = round(change / price * 100, 2)
+    quote = generate_stock_quote(symbol, rng)
+    price = quote["price"]
+    change = quote["change"]
+    change_percent = quote["changePercent"]
     
     # Create recommendation
     recommendation = {
-        "rating": random.choice(["Strong Buy", "Buy", "Hold", "Reduce", "Sell"]),
+        "rating": rng.choice(["Strong Buy", "Buy", "Hold", "Reduce", "Sell"]),
         "reasons": [
-            random.choice(["Strong fundamentals", "Attractive valuation", "Growth potential", "Technical breakout", "Sector leadership"]),
-            random.choice(["Positive momentum", "Favorable industry trends", "Expanding market share", "Increasing margins"])
+            rng.choice(["Strong fundamentals", "Attractive valuation", "Growth potential", "Technical breakout", "Sector leadership"]),
+            rng.choice(["Positive momentum", "Favorable industry trends", "Expanding market share", "Increasing margins"])
         ],
-        "strength": random.randint(40, 95),
+        "strength": rng.randint(40, 95),
         "updated": datetime.now().isoformat()
     }
     
     # Company information
     founding_year = 1980 + (symbol_hash % 40)  # Between 1980-2019
     employee_count = 1000 * (1 + (symbol_hash % 100))
-    ceo_name = random.choice([
+    ceo_name = rng.choice([
         "Rajesh Sharma", "Anand Patel", "Sunita Kapoor", "Vikram Mehta",
         "Deepak Singh", "Nirmala Joshi", "Sanjay Kumar", "Priya Nair"
     ])
@@ -2474,23 +2221,23 @@ def get_stock_details(symbol):
         "boardSize": 8 + (symbol_hash % 7),  # Between 8-14
         "keyExecutives": [
             {
-                "name": random.choice(["Amit Kumar", "Vikram Singh", "Sanjay Mehta", "Priya Sharma"]),
+                "name": rng.choice(["Amit Kumar", "Vikram Singh", "Sanjay Mehta", "Priya Sharma"]),
                 "position": "Chief Financial Officer"
             },
             {
-                "name": random.choice(["Ravi Tandon", "Neha Patel", "Arun Joshi", "Meera Saxena"]),
+                "name": rng.choice(["Ravi Tandon", "Neha Patel", "Arun Joshi", "Meera Saxena"]),
                 "position": "Chief Operating Officer"
             },
             {
-                "name": random.choice(["Sandeep Gupta", "Deepak Verma", "Anita Reddy", "Rahul Malhotra"]),
-                "position": random.choice(["Chief Technology Officer", "Chief Marketing Officer", "Chief Strategy Officer"])
+                "name": rng.choice(["Sandeep Gupta", "Deepak Verma", "Anita Reddy", "Rahul Malhotra"]),
+                "position": rng.choice(["Chief Technology Officer", "Chief Marketing Officer", "Chief Strategy Officer"])
             }
         ],
         "governanceScore": 65 + (symbol_hash % 30)  # Between 65-94
     }
     
     # Generate milestones based on founding year
-    founding_milestone = {"year": founding_year, "event": f"Founded by {random.choice(['entrepreneurs', 'industry veterans', 'visionary leaders'])}"}
+    founding_milestone = {"year": founding_year, "event": f"Founded by {rng.choice(['entrepreneurs', 'industry veterans', 'visionary leaders'])}"}
     
     # Calculate milestone years (ensure they are in chronological order)
     milestone_count = 4 + (symbol_hash % 4)  # Between 4-7 milestones
@@ -2571,15 +2318,15 @@ def get_stock_details(symbol):
     
     # Create milestones array
     milestones = [founding_milestone]
-    random.seed(symbol_hash)  # Ensure consistent randomness based on symbol
-    selected_events = random.sample(event_pool, min(len(milestone_years), len(event_pool)))
+    rng = seeded_rng("stock-details", symbol)  # Ensure consistent randomness based on symbol
+    selected_events = rng.sample(event_pool, min(len(milestone_years), len(event_pool)))
     
     for i, year in enumerate(milestone_years):
         if i < len(selected_events):
             milestones.append({"year": year, "event": selected_events[i]})
     
     # Add an additional recent milestone
-    recent_milestone = {"year": 2020 + (symbol_hash % 3), "event": random.choice([
+    recent_milestone = {"year": 2020 + (symbol_hash % 3), "event": rng.choice([
         "Launched digital transformation initiative",
         "Implemented sustainability framework",
         "Achieved significant ESG milestone",
@@ -2591,6 +2338,10 @@ def get_stock_details(symbol):
     # Sort milestones by year
     milestones = sorted(milestones, key=lambda x: x["year"])
     
+    # Valuation figures come from the day's fundamentals universe so every endpoint agrees
+    fundamentals = get_fundamentals_universe()
+    pe = fundamentals.value(symbol, "valuation.pe")
+    
     result = {
         "symbol": symbol,
         "name": stock_data["name"],
@@ -2604,13 +2355,13 @@ def get_stock_details(symbol):
         "milestones": milestones,
         "companyInfo": {
             "foundingYear": founding_year,
-            "headquarters": random.choice(["Mumbai", "Bangalore", "Delhi", "Hyderabad", "Chennai", "Pune"]),
+            "headquarters": rng.choice(["Mumbai", "Bangalore", "Delhi", "Hyderabad", "Chennai", "Pune"]),
             "employeeCount": employee_count,
             "ceo": ceo_name,
             "website": f"https://www.{symbol.lower()}.in",
-            "registeredOffice": f"{random.choice(['Tower A', 'Prestige Plaza', 'Corporate House', 'Business Park'])}, {random.choice(['Bandra Kurla Complex', 'Andheri East', 'Whitefield', 'Cyber City', 'Electronics City'])}",
+            "registeredOffice": f"{rng.choice(['Tower A', 'Prestige Plaza', 'Corporate House', 'Business Park'])}, {rng.choice(['Bandra Kurla Complex', 'Andheri East', 'Whitefield', 'Cyber City', 'Electronics City'])}",
             "revenueGrowth": f"{(5 + (symbol_hash % 20))}%",  # 5% to 25%
-            "marketPosition": random.choice(["Market Leader", "Strong Challenger", "Growing Player", "Niche Leader"]),
+            "marketPosition": rng.choice(["Market Leader", "Strong Challenger", "Growing Player", "Niche Leader"]),
             "keyProducts": generateKeyProducts(sector, symbol_hash),
             "competitiveAdvantages": generateCompetitiveAdvantages(sector, symbol_hash)
         },
@@ -2618,25 +2369,25 @@ def get_stock_details(symbol):
         "currentPrice": price,
         "change": change,
         "changePercent": change_percent,
-        "open": round(price - random.uniform(-20, 20), 2),
-        "high": round(price + random.uniform(10, 30), 2),
-        "low": round(price - random.uniform(10, 30), 2),
-        "dayHigh": round(price + random.uniform(10, 30), 2),
-        "dayLow": round(price - random.uniform(10, 30), 2),
-        "previousClose": round(price - change, 2),
-        "volume": round(random.uniform(100000, 5000000)),
-        "marketCap": price * (10000000 + (symbol_hash % 100000000)),
-        "pe": round(random.uniform(10, 35), 2),
-        "eps": round(price / random.uniform(10, 35), 2),
-        "beta": round(random.uniform(0.5, 1.5), 2),
-        "yearHigh": round(price * random.uniform(1.1, 1.4), 2),
-        "yearLow": round(price * random.uniform(0.6, 0.9), 2),
-        "avgVolume": round(random.uniform(100000, 5000000)),
-        "dividend_yield": round(random.uniform(0.5, 3.5), 2),
+        "open": quote["open"],
+        "high": quote["high"],
+        "low": quote["low"],
+        "dayHigh": quote["high"],
+        "dayLow": quote["low"],
+        "previousClose": quote["previousClose"],
+        "volume": quote["volume"],
+        "marketCap": round(fundamentals.value(symbol, "valuation.marketCap"), 2),
+        "pe": round(pe, 2),
+        "eps": round(price / pe, 2),
+        "beta": round(fundamentals.value(symbol, "risks.beta"), 2),
+        "yearHigh": round(price * rng.uniform(1.1, 1.4), 2),
+        "yearLow": round(price * rng.uniform(0.6, 0.9), 2),
+        "avgVolume": round(rng.uniform(100000, 5000000)),
+        "dividend_yield": round(fundamentals.value(symbol, "dividend.yield"), 2),
         "recommendation": recommendation
     }
     
-    return jsonify(result)
+    return result
 
 def generateKeyProducts(sector, symbol_hash):
     """Generate sector-specific key products"""
@@ -2800,185 +2551,23 @@ def get_stock_technical(symbol):
             return generate_default_technical()
         
         # Find the stock in our list
-        stock_data = None
-        for stock in INDIAN_STOCKS:
-            if stock["symbol"] == symbol:
-                stock_data = stock
-                break
+        stock_data = STOCK_REGISTRY.get(symbol)
                 
         if not stock_data:
             print(f"Stock not found: {symbol}, returning default technical data")
             return generate_default_technical()
         
-        # Get base price for the stock based on symbol
-        symbol_hash = sum(ord(c) for c in symbol)
-        random.seed(symbol_hash)  # Ensure consistent randomness based on symbol
-        
-        # Base price for consistency across requests
-        base_price = round(500 + (symbol_hash % 3000), 2)
-        
-        # Determine trend bias based on symbol (some stocks will tend up, others down)
-        trend_bias = -1 if symbol_hash % 3 == 0 else 1  # 2/3 of stocks trend up, 1/3 trend down
-        bullish = trend_bias > 0
-        
-        # Generate RSI value that aligns with trend
-        rsi_mid = 50
-        rsi_range = 20
-        rsi = rsi_mid + (trend_bias * random.uniform(5, rsi_range))
-        rsi = max(20, min(80, rsi))  # Keep RSI in reasonable range
-        
-        # Generate Volume data relative to average
-        volume_change = random.uniform(-15, 30)  # More likely to be above average
-        
-        # Generate Moving Averages
-        ma_status = {}
-        intervals = [5, 10, 20, 50, 100, 200]
-        
-        # Price offsets for different moving averages
-        ma_values = {}
-        for interval in intervals:
-            # Longer intervals have more variance from current price
-            variance = 0.005 * (interval / 10) * random.uniform(-1, 1)
-            direction = 1 if interval > 50 else -1
-            # Trend bias affects longer term MAs more than shorter term
-            bias_effect = trend_bias * 0.0005 * interval
-            
-            ma_value = base_price * (1 + variance + bias_effect * direction)
-            ma_values[interval] = round(ma_value, 2)
-            
-            # Determine if price is above or below each MA
-            status = "Bullish" if base_price > ma_value else "Bearish"
-            ma_status[f"MA{interval}"] = status
-        
-        # Determine overall MA status (weighted toward longer term MAs)
-        bullish_count = sum(1 for status in ma_status.values() if status == "Bullish")
-        bearish_count = len(ma_status) - bullish_count
-        
-        ma_overall = "Bullish" if bullish_count > bearish_count else "Bearish"
-        
-        # Generate MACD values
-        macd_value = trend_bias * random.uniform(0.5, 2.0)
-        macd_signal = macd_value - trend_bias * random.uniform(0.2, 0.8)
-        macd_histogram = macd_value - macd_signal
-        
-        # Bollinger Bands
-        sma_mod = random.uniform(0.02, 0.1)
-        bollinger_bands = {
-            "upper": round(base_price * (1 + sma_mod * 2), 2),
-            "middle": round(base_price, 2),
-            "lower": round(base_price * (1 - sma_mod * 2), 2),
-            "width": round(sma_mod * 4 * 100, 2),
-            "percentB": round(random.uniform(0, 100), 1)
-        }
-        
-        # Support and resistance levels
-        support_levels = [
-            round(base_price * (1 - 0.05 * random.uniform(0.8, 1.2)), 2),
-            round(base_price * (1 - 0.1 * random.uniform(0.8, 1.2)), 2),
-            round(base_price * (1 - 0.15 * random.uniform(0.8, 1.2)), 2)
-        ]
-        
-        resistance_levels = [
-            round(base_price * (1 + 0.05 * random.uniform(0.8, 1.2)), 2),
-            round(base_price * (1 + 0.1 * random.uniform(0.8, 1.2)), 2),
-            round(base_price * (1 + 0.15 * random.uniform(0.8, 1.2)), 2)
-        ]
-        
-        # Generate chart patterns
-        patterns = []
-        pattern_choices = [
-            "Double Top", "Double Bottom", "Head and Shoulders", 
-            "Inverse Head and Shoulders", "Cup and Handle", 
-            "Rising Wedge", "Falling Wedge", "Triangle", 
-            "Flag", "Pennant", "Channel", "Gap"
-        ]
-        
-        # Choose 1-3 patterns
-        num_patterns = random.randint(1, 3)
-        for _ in range(num_patterns):
-            pattern = random.choice(pattern_choices)
-            signal = "Bullish" if (bullish and random.random() > 0.2) or (not bullish and random.random() < 0.2) else "Bearish"
-            strength = random.randint(1, 5)  # 1-5 star strength
-            
-            patterns.append({
-                "name": pattern,
-                "signal": signal,
-                "strength": strength,
-                "timeframe": random.choice(["Daily", "Weekly", "Monthly"])
-            })
-        
-        # Technical indicators summary
-        indicators = {
-            "macd": {
-                "value": round(macd_value, 2),
-                "signal": round(macd_signal, 2),
-                "histogram": round(macd_histogram, 2),
-                "trend": "Bullish Crossover" if macd_histogram > 0 and macd_value > 0 else
-                         "Bearish Crossover" if macd_histogram < 0 and macd_value < 0 else
-                         "Bullish Divergence" if macd_histogram > 0 and macd_value < 0 else
-                         "Bearish Divergence"
-            },
-            "rsi": {
-                "value": round(rsi),
-                "interpretation": "Oversold" if rsi < 30 else
-                                 "Overbought" if rsi > 70 else
-                                 "Neutral"
-            },
-            "movingAverages": {
-                "values": ma_values,
-                "status": ma_status,
-                "overall": ma_overall
-            },
-            "bollingerBands": bollinger_bands,
-            "volume": {
-                "current": round(base_price * random.uniform(100000, 5000000)),
-                "average": round(base_price * random.uniform(100000, 5000000)),
-                "change": round(volume_change, 2),
-                "trend": "Increasing" if volume_change > 5 else
-                         "Decreasing" if volume_change < -5 else
-                         "Stable"
-            },
-            "supportResistance": {
-                "support": support_levels,
-                "resistance": resistance_levels,
-                "nearestSupport": support_levels[0],
-                "nearestResistance": resistance_levels[0]
-            },
-            "patterns": patterns
-        }
-        
-        # Technical Summary
-        strength_words = ["weak", "moderate", "strong", "very strong", "extremely strong"]
-        momentum_direction = "bullish" if bullish else "bearish"
-        momentum_strength = strength_words[random.randint(0, 4)]
-        
-        technical_summary = f"{stock_data['name']} is showing {momentum_strength} {momentum_direction} momentum on the technical indicators. "
-        
-        if rsi < 30:
-            technical_summary += f"RSI at {round(rsi)} indicates oversold conditions that may lead to a potential reversal. "
-        elif rsi > 70:
-            technical_summary += f"RSI at {round(rsi)} shows overbought conditions that might signal caution. "
-        else:
-            technical_summary += f"RSI at {round(rsi)} is in a neutral zone. "
-            
-        technical_summary += f"MACD is showing a {indicators['macd']['trend'].lower()}, "
-        technical_summary += f"and moving averages are overall {ma_overall.lower()}. "
-        
-        if bollinger_bands["percentB"] < 20:
-            technical_summary += f"Price is near the lower Bollinger Band, suggesting potential oversold conditions."
-        elif bollinger_bands["percentB"] > 80:
-            technical_summary += f"Price is near the upper Bollinger Band, indicating potential overbought territory."
-        else:
-            technical_summary += f"Price is within the Bollinger Bands, showing moderate volatility."
+        # Indicators are precomputed for the whole universe once per daily bar
+        snapshot = get_technical_snapshot(symbol)
         
         # Assemble final response
         result = {
             "symbol": symbol,
             "name": stock_data["name"],
-            "currentPrice": base_price,
-            "indicators": indicators,
-            "summary": technical_summary,
-            "lastUpdated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "currentPrice": snapshot["currentPrice"],
+            "indicators": snapshot["indicators"],
+            "summary": technical_summary(stock_data["name"], snapshot),
+            "lastUpdated": snapshot["lastUpdated"]
         }
         
         return jsonify(result)
@@ -2987,5 +2576,19 @@ def get_stock_technical(symbol):
         # Provide fallback technical data
         return generate_default_technical()
 
+def generate_default_technical():
+    """Generate default technical data when a symbol is not found or is undefined"""
+    snapshot = get_technical_snapshot(DEFAULT_TECHNICAL_SYMBOL)
+    name = "NIFTY 50 Index"
+    
+    return jsonify({
+        "symbol": DEFAULT_TECHNICAL_SYMBOL,
+        "name": name,
+        "currentPrice": snapshot["currentPrice"],
+        "indicators": snapshot["indicators"],
+        "summary": technical_summary(name, snapshot),
+        "lastUpdated": snapshot["lastUpdated"]
+    })
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+Model registry for the IndiStockPredictor prediction models.
+Fitted scaler, Random Forest and LSTM artifacts are saved per symbol under a
+numbered version directory together with a metadata.json describing how they
+were trained. Loading is lazy and goes through a bounded LRU cache, so API
+requests only ever read saved models and never trigger training. The latest
+version of each symbol is remembered until its directory changes, and the
+metadata of a version (which never changes once saved) is read only once.
+
+Layout: <root>/<SYMBOL>/v<N>/{metadata.json, scaler.pkl, rf.pkl, lstm.keras}
+"""
+
+import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# Default location of saved models, next to this file
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+# Symbols become directory names, so only allow characters used by exchange tickers
+SYMBOL_PATTERN = re.compile(r'^[A-Z0-9&._-]{1,32}$')
+VERSION_PATTERN = re.compile(r'^v(\d+)$')
+
+SCALER_FILE = 'scaler.pkl'
+RF_FILE = 'rf.pkl'
+LSTM_FILE = 'lstm.keras'
+RF_DIRECT_FILE = 'rf_direct.pkl'
+LSTM_DIRECT_FILE = 'lstm_direct.keras'
+METADATA_FILE = 'metadata.json'
+
+
+def _json_number(value):
+    """Convert NumPy scalars in metrics to plain floats for JSON"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class ModelRegistry:
+    """Versioned on-disk store of trained StockPredictor models with an in-memory LRU cache"""
+
+    def __init__(self, root=MODEL_DIR, max_loaded=8):
+        self.root = root
+        self.max_loaded = max_loaded
+        self.loaded = OrderedDict()
+        self.latest = {}  # symbol -> (directory mtime, latest version)
+        self.metadata_cache = {}  # (symbol, version) -> metadata
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _symbol_dir(self, symbol):
+        symbol = symbol.upper()
+        if not SYMBOL_PATTERN.match(symbol):
+            raise ValueError(f"Invalid symbol for model registry: {symbol}")
+        return os.path.join(self.root, symbol)
+
+    def _version_dir(self, symbol, version):
+        return os.path.join(self._symbol_dir(symbol), f"v{version}")
+
+    def versions(self, symbol):
+        """Return the saved versions of a symbol's models, oldest first"""
+        symbol_dir = self._symbol_dir(symbol)
+        if not os.path.isdir(symbol_dir):
+            return []
+        versions = []
+        for name in os.listdir(symbol_dir):
+            match = VERSION_PATTERN.match(name)
+            if match:
+                versions.append(int(match.group(1)))
+        return sorted(versions)
+
+    def latest_version(self, symbol):
+        """
+        Return the newest saved version, or None if the symbol has no models.
+        Saving a version renames it into the symbol directory, which changes the
+        directory's mtime, so one stat() tells whether the cached answer is stale.
+        """
+        symbol_dir = self._symbol_dir(symbol)
+        try:
+            mtime = os.stat(symbol_dir).st_mtime_ns
+        except OSError:
+            return None
+        symbol = symbol.upper()
+        cached = self.latest.get(symbol)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        versions = self.versions(symbol)
+        version = versions[-1] if versions else None
+        self.latest[symbol] = (mtime, version)
+        return version
+
+    def symbols(self):
+        """Return every symbol with at least one saved version"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if SYMBOL_PATTERN.match(name) and self.latest_version(name) is not None
+        )
+
+    def metadata(self, symbol, version=None):
+        """Return the metadata of a saved version (default latest), or None"""
+        version = self.latest_version(symbol) if version is None else version
+        if version is None:
+            return None
+        key = (symbol.upper(), version)
+        metadata = self.metadata_cache.get(key)
+        if metadata is None:
+            path = os.path.join(self._version_dir(symbol, version), METADATA_FILE)
+            if not os.path.exists(path):
+                return None
+            with open(path) as f:
+                metadata = self.metadata_cache[key] = json.load(f)
+        return metadata
+
+    def save(self, symbol, predictor, metrics=None, train_rows=None, extra=None):
+        """
+        Save a fitted predictor as the next version of a symbol's models.
+        Artifacts are written to a temporary directory and renamed into place,
+        so readers never see a half-written version. Returns the new version.
+        """
+        symbol = symbol.upper()
+        symbol_dir = self._symbol_dir(symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=symbol_dir)
+
+        try:
+            with open(os.path.join(staging, SCALER_FILE), 'wb') as f:
+                pickle.dump(predictor.scaler, f)
+            with open(os.path.join(staging, RF_FILE), 'wb') as f:
+                pickle.dump(predictor.rf_model, f)
+            predictor.lstm_model.save(os.path.join(staging, LSTM_FILE))
+
+            # Direct multi-horizon models are optional
+            if predictor.rf_direct_model is not None and predictor.lstm_direct_model is not None:
+                with open(os.path.join(staging, RF_DIRECT_FILE), 'wb') as f:
+                    pickle.dump(predictor.rf_direct_model, f)
+                predictor.lstm_direct_model.save(os.path.join(staging, LSTM_DIRECT_FILE))
+
+            with self.lock:
+                version = (self.latest_version(symbol) or 0) + 1
+                metadata = {
+                    "symbol": symbol,
+                    "version": version,
+                    "createdAt": datetime.now().isoformat(timespec='seconds'),
+                    "featureCols": list(predictor.feature_cols),
+                    "targetCol": predictor.target_col,
+                    "sequenceLength": predictor.sequence_length,
+                    "horizon": predictor.horizon,
+                    "trainRows": train_rows,
+                    "metrics": {
+                        model: {name: _json_number(value) for name, value in values.items()}
+                        for model, values in (metrics or {}).items()
+                    },
+                }
+                metadata.update(extra or {})
+                with open(os.path.join(staging, METADATA_FILE), 'w') as f:
+                    json.dump(metadata, f, indent=2)
+
+                os.rename(staging, self._version_dir(symbol, version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        return version
+
+    def load(self, symbol, version=None):
+        """
+        Return a ready-to-use StockPredictor for a symbol (default latest version),
+        or None if no models are saved or the ML libraries are unavailable.
+        """
+        symbol = symbol.upper()
+        version = self.latest_version(symbol) if version is None else version
+        if version is None:
+            return None
+
+        key = (symbol, version)
+        with self.lock:
+            predictor = self.loaded.get(key)
+            if predictor is not None:
+                self.loaded.move_to_end(key)
+                self.hits += 1
+                return predictor
+            self.misses += 1
+
+        # Deserialize outside the lock; Keras loads can take a while
+        predictor = self._load_version(symbol, version)
+        if predictor is None:
+            return None
+
+        with self.lock:
+            self.loaded[key] = predictor
+            self.loaded.move_to_end(key)
+            while len(self.loaded) > self.max_loaded:
+                self.loaded.popitem(last=False)
+        return predictor
+
+    def _load_version(self, symbol, version):
+        try:
+            # Imported lazily so the API server runs without the ML stack installed
+            from tensorflow.keras.models import load_model
+            from prediction_demo import StockPredictor
+        except ImportError as e:
+            print(f"Model registry unavailable, missing ML dependency: {str(e)}")
+            return None
+
+        version_dir = self._version_dir(symbol, version)
+        metadata = self.metadata(symbol, version)
+        if metadata is None:
+            return None
+
+        predictor = StockPredictor()
+        predictor.feature_cols = metadata["featureCols"]
+        predictor.target_col = metadata["targetCol"]
+        predictor.sequence_length = metadata["sequenceLength"]
+        with open(os.path.join(version_dir, SCALER_FILE), 'rb') as f:
+            predictor.scaler = pickle.load(f)
+        with open(os.path.join(version_dir, RF_FILE), 'rb') as f:
+            predictor.rf_model = pickle.load(f)
+        predictor.lstm_model = load_model(os.path.join(version_dir, LSTM_FILE))
+
+        if os.path.exists(os.path.join(version_dir, LSTM_DIRECT_FILE)):
+            with open(os.path.join(version_dir, RF_DIRECT_FILE), 'rb') as f:
+                predictor.rf_direct_model = pickle.load(f)
+            predictor.lstm_direct_model = load_model(os.path.join(version_dir, LSTM_DIRECT_FILE))
+            predictor.horizon = metadata.get("horizon") or 0
+
+        return predictor
+
+    def forecast(self, symbol, history, days=30):
+        """
+        Forecast `days` ahead from a PriceHistory using the symbol's latest models.
+        Returns None when no models are saved, otherwise a dict with the model
+        version, its metadata, the last known close and per-day predictions.
+        """
+        version = self.latest_version(symbol)
+        predictor = self.load(symbol, version) if version is not None else None
+        if predictor is None:
+            return None
+
+        from prediction_demo import build_feature_frame
+
+        frame = build_feature_frame(history.columns())
+        mode = 'direct' if predictor.lstm_direct_model is not None and days <= predictor.horizon else 'recursive'
+        future_df, last_known_price = predictor.predict_future(frame, days, mode)
+
+        return {
+            "version": version,
+            "metadata": self.metadata(symbol, version),
+            "lastPrice": float(last_known_price),
+            "predictions": [
+                {
+                    "date": date.strftime("%Y-%m-%d"),
+                    "rf": float(row['rf_prediction']),
+                    "lstm": float(row['lstm_prediction']),
+                    "ensemble": float(row['ensemble_prediction']),
+                }
+                for date, row in future_df.iterrows()
+            ],
+        }
+
+    def stats(self):
+        """Return cache counters and the number of loaded models"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "loaded": len(self.loaded),
+                "maxLoaded": self.max_loaded,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
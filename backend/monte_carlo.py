@@ -0,0 +1,160 @@
+"""
+Monte Carlo price bands for the IndiStockPredictor platform.
+Fits geometric Brownian motion to a symbol's daily log returns and simulates
+tens of thousands of price paths with NumPy, a few horizon days at a time:
+a matrix of normal shocks, a cumulative sum carried across blocks, and
+per-day summaries taken before the next block is drawn.
+Percentiles across paths give the price band for every horizon day, so
+prediction intervals reflect each symbol's own volatility instead of a
+fixed percentage. Bands are cached per symbol per trading day.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ohlcv_store import PRICE_STORE
+from price_engine import daily_price_history
+from seeded_random import seeded_numpy_rng, time_bucket
+
+DEFAULT_PATHS = 20000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+MC_HISTORY_DAYS = 252  # Returns used to estimate drift and volatility
+MC_DAY_SECONDS = 86400
+MAX_HORIZON_DAYS = 365
+
+# Horizon days are simulated a block at a time for every path, and each block is
+# reduced to its per-day statistics before the next is drawn, so a (paths, days)
+# matrix never exists: 20000 paths x 16 days is about 2.5 MB per block
+DAY_BLOCK_SIZE = 16
+
+
+def estimate_gbm_params(closes):
+    """Return (drift, volatility) of daily log returns; the drift includes the Itô term"""
+    log_returns = np.diff(np.log(np.asarray(closes, dtype=np.float64)))
+    if len(log_returns) < 2:
+        return 0.0, 0.0
+    volatility = log_returns.std(ddof=1)
+    drift = log_returns.mean() + 0.5 * volatility ** 2
+    return float(drift), float(volatility)
+
+
+def simulate_gbm_percentiles(start_price, drift, volatility, days, paths=DEFAULT_PATHS,
+                             percentiles=DEFAULT_PERCENTILES, rng=None):
+    """
+    Simulate GBM paths and return (percentile matrix of shape (len(percentiles), days),
+    mean price per day, share of paths above the start price per day).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    step_mean = drift - 0.5 * volatility ** 2
+    log_bands = np.empty((len(percentiles), days))
+    mean = np.empty(days)
+    probability_up = np.empty(days)
+    level = np.zeros(paths)  # log(S / S_0) of every path at the end of the previous block
+
+    for start in range(0, days, DAY_BLOCK_SIZE):
+        stop = min(start + DAY_BLOCK_SIZE, days)
+        # log S_t = log S_0 + sum of (mu - sigma^2/2) + sigma * Z over the path
+        log_paths = rng.standard_normal((paths, stop - start))
+        log_paths *= volatility
+        log_paths += step_mean
+        log_paths[:, 0] += level
+        np.cumsum(log_paths, axis=1, out=log_paths)
+        level = log_paths[:, -1].copy()
+
+        # Percentiles commute with the monotone exp, so only the summaries are exponentiated
+        log_bands[:, start:stop] = np.percentile(log_paths, percentiles, axis=0)
+        mean[start:stop] = np.exp(log_paths).mean(axis=0)
+        probability_up[start:stop] = (log_paths > 0).mean(axis=0)
+
+    return start_price * np.exp(log_bands), start_price * mean, probability_up
+
+
+def load_closes(symbol, day, bars=MC_HISTORY_DAYS + 1):
+    """Closes from the OHLCV store, or a day-seeded simulation when the symbol is not stored"""
+    if PRICE_STORE.length(symbol) >= bars:
+        return np.asarray(PRICE_STORE.tail(symbol, bars).close, dtype=np.float64)
+    return daily_price_history(symbol, bars, day).close
+
+
+class BandCache:
+    """Thread-safe LRU cache of computed bands keyed by (symbol, day, horizon, paths)"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "maxEntries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+
+BAND_CACHE = BandCache()
+
+
+def prediction_bands(symbol, days=30, paths=DEFAULT_PATHS, closes=None, now=None):
+    """
+    Return Monte Carlo bands for a symbol's next `days` trading days:
+    {"startPrice", "drift", "volatility", "paths", "percentiles",
+     "bands": {percentile: [price per day]}, "mean": [...], "probabilityUp": [...]}.
+    Results for the stored/simulated history are cached for the trading day.
+    """
+    days = max(1, min(int(days), MAX_HORIZON_DAYS))
+    day = time_bucket(MC_DAY_SECONDS, now)
+    key = (symbol, day, days, paths) if closes is None else None
+
+    if key is not None:
+        cached = BAND_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    if closes is None:
+        closes = load_closes(symbol, day)
+    closes = np.asarray(closes, dtype=np.float64)
+    drift, volatility = estimate_gbm_params(closes)
+    bands, mean, probability_up = simulate_gbm_percentiles(
+        closes[-1], drift, volatility, days, paths,
+        rng=seeded_numpy_rng("monte-carlo", symbol, day)
+    )
+
+    result = {
+        "startPrice": round(float(closes[-1]), 2),
+        "drift": drift,
+        "volatility": volatility,
+        "paths": paths,
+        "percentiles": list(DEFAULT_PERCENTILES),
+        "bands": {p: np.round(bands[i], 2).tolist() for i, p in enumerate(DEFAULT_PERCENTILES)},
+        "mean": np.round(mean, 2).tolist(),
+        "probabilityUp": np.round(probability_up, 4).tolist()
+    }
+    if key is not None:
+        BAND_CACHE.set(key, result)
+    return result
+
+
+def band_ratios(result, day_index, low=5, high=95):
+    """(lower, upper) of a horizon day's band relative to its median, for centering on another forecast"""
+    median = result["bands"][50][day_index]
+    return result["bands"][low][day_index] / median, result["bands"][high][day_index] / median
@@ -0,0 +1,260 @@
+"""
+Columnar on-disk OHLCV store for the IndiStockPredictor platform.
+Each symbol is a directory holding one flat binary file per column (date,
+open, high, low, close, volume) plus a meta.json with the committed row
+count. Reads memory-map the column files, so a multi-GB history opens
+instantly, slices by date without copying, and every process reading the
+same symbol shares its pages through the OS page cache.
+
+Appends write the new rows to the end of each column file first and then
+atomically replace meta.json; readers only ever map the committed rows, so
+a reader never sees a half-written bar.
+
+Usage: python ohlcv_store.py build [--days 2520] [--symbols TCS,INFY]
+       python ohlcv_store.py info [--symbols TCS]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+
+import numpy as np
+
+from price_engine import PriceHistory, empty_history, simulate_price_histories
+from seeded_random import seeded_numpy_rng
+from stock_registry import STOCK_REGISTRY
+
+# Default location of the store, next to this file
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ohlcv')
+
+# Symbols become directory names, so only allow characters used by exchange tickers
+SYMBOL_PATTERN = re.compile(r'^[A-Z0-9&._-]{1,32}$')
+
+META_FILE = 'meta.json'
+COLUMN_DTYPES = {
+    "date": np.dtype('<M8[D]'),
+    "open": np.dtype('<f8'),
+    "high": np.dtype('<f8'),
+    "low": np.dtype('<f8'),
+    "close": np.dtype('<f8'),
+    "volume": np.dtype('<f8'),
+}
+
+
+class OHLCVStore:
+    """Memory-mapped per-symbol column files with a date index and append support"""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.lock = threading.Lock()
+        # symbol -> (meta version, PriceHistory of memmaps); reopened when meta.json changes
+        self.mapped = {}
+
+    def _symbol_dir(self, symbol):
+        symbol = symbol.upper()
+        if not SYMBOL_PATTERN.match(symbol):
+            raise ValueError(f"Invalid symbol for OHLCV store: {symbol}")
+        return os.path.join(self.root, symbol)
+
+    def _column_path(self, symbol, column):
+        return os.path.join(self._symbol_dir(symbol), f"{column}.bin")
+
+    def _meta_path(self, symbol):
+        return os.path.join(self._symbol_dir(symbol), META_FILE)
+
+    def __contains__(self, symbol):
+        try:
+            return os.path.exists(self._meta_path(symbol))
+        except ValueError:
+            return False
+
+    def symbols(self):
+        """Return every stored symbol"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if SYMBOL_PATTERN.match(name) and name in self)
+
+    def meta(self, symbol):
+        """Return {"symbol", "rows", "firstDate", "lastDate"} or None if not stored"""
+        try:
+            with open(self._meta_path(symbol)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def length(self, symbol):
+        meta = self.meta(symbol)
+        return meta["rows"] if meta else 0
+
+    def _write_meta(self, symbol, rows, first_date, last_date):
+        path = self._meta_path(symbol)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({
+                "symbol": symbol.upper(),
+                "rows": int(rows),
+                "firstDate": str(first_date) if first_date is not None else None,
+                "lastDate": str(last_date) if last_date is not None else None,
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _write_columns(self, symbol, history, mode, offset_rows):
+        for column, dtype in COLUMN_DTYPES.items():
+            values = np.ascontiguousarray(history.columns()[column], dtype=dtype)
+            with open(self._column_path(symbol, column), mode) as f:
+                # Drop any uncommitted tail left by an interrupted append
+                f.truncate(offset_rows * dtype.itemsize)
+                f.seek(offset_rows * dtype.itemsize)
+                f.write(values.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def write(self, symbol, history):
+        """Replace a symbol's stored history"""
+        symbol = symbol.upper()
+        with self.lock:
+            os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+            # Write fresh files and rename them in, so existing memmaps keep their old pages
+            for column, dtype in COLUMN_DTYPES.items():
+                path = self._column_path(symbol, column)
+                with open(f"{path}.tmp", 'wb') as f:
+                    f.write(np.ascontiguousarray(history.columns()[column], dtype=dtype).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(f"{path}.tmp", path)
+            dates = history.dates
+            self._write_meta(symbol, len(history), dates[0] if len(dates) else None, dates[-1] if len(dates) else None)
+            self.mapped.pop(symbol, None)
+
+    def append(self, symbol, history):
+        """
+        Append newer bars to a symbol's history (creating it if needed).
+        Bars must start after the last stored date.
+        """
+        symbol = symbol.upper()
+        if len(history) == 0:
+            return self.length(symbol)
+
+        with self.lock:
+            meta = self.meta(symbol)
+            if meta is None or meta["rows"] == 0:
+                os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+                self._write_columns(symbol, history, 'wb', 0)
+                self._write_meta(symbol, len(history), history.dates[0], history.dates[-1])
+                return len(history)
+
+            if history.dates[0] <= np.datetime64(meta["lastDate"], 'D'):
+                raise ValueError(f"Appended bars for {symbol} must start after {meta['lastDate']}")
+
+            self._write_columns(symbol, history, 'r+b', meta["rows"])
+            rows = meta["rows"] + len(history)
+            self._write_meta(symbol, rows, meta["firstDate"], history.dates[-1])
+            return rows
+
+    def read(self, symbol, start=None, end=None):
+        """
+        Return a PriceHistory whose columns are read-only memmap views,
+        optionally limited to dates in [start, end]. No data is copied.
+        """
+        history = self._open(symbol)
+        if history is None:
+            return None
+        if start is None and end is None:
+            return history
+
+        # Dates are sorted, so the date index is a binary search
+        lo = 0 if start is None else int(np.searchsorted(history.dates, np.datetime64(start, 'D'), side='left'))
+        hi = len(history) if end is None else int(np.searchsorted(history.dates, np.datetime64(end, 'D'), side='right'))
+        return _slice(history, lo, hi)
+
+    def tail(self, symbol, bars):
+        """Return the last `bars` bars as memmap views"""
+        history = self._open(symbol)
+        if history is None:
+            return None
+        return _slice(history, max(0, len(history) - int(bars)), len(history))
+
+    def _open(self, symbol):
+        symbol = symbol.upper()
+        try:
+            stat = os.stat(self._meta_path(symbol))
+            version = (stat.st_mtime_ns, stat.st_ino)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        with self.lock:
+            cached = self.mapped.get(symbol)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+        meta = self.meta(symbol)
+        rows = meta["rows"] if meta else 0
+        if rows == 0:
+            history = empty_history(symbol)
+        else:
+            columns = {
+                column: np.memmap(self._column_path(symbol, column), dtype=dtype, mode='r', shape=(rows,))
+                for column, dtype in COLUMN_DTYPES.items()
+            }
+            history = PriceHistory(symbol, columns["date"], columns["open"], columns["high"],
+                                   columns["low"], columns["close"], columns["volume"])
+
+        with self.lock:
+            self.mapped[symbol] = (version, history)
+        return history
+
+
+# Shared store at the default location
+PRICE_STORE = OHLCVStore()
+
+
+def _slice(history, lo, hi):
+    return PriceHistory(history.symbol, history.dates[lo:hi], history.open[lo:hi], history.high[lo:hi],
+                        history.low[lo:hi], history.close[lo:hi], history.volume[lo:hi])
+
+
+def build_store(store, symbols, days):
+    """Fill the store with simulated histories from the price engine"""
+    histories = simulate_price_histories(symbols, days, rng=seeded_numpy_rng("ohlcv-store", days))
+    for symbol, history in histories.items():
+        store.write(symbol, history)
+    return len(histories)
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Manage the memory-mapped OHLCV store")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--symbols", help="Comma-separated symbols (default: whole registry)")
+    parser.add_argument("--days", type=int, default=2520, help="Days of history to build")
+    parser.add_argument("--root", default=STORE_DIR, help="Store directory")
+    args = parser.parse_args()
+
+    store = OHLCVStore(args.root)
+    if args.symbols:
+        symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    elif args.command == "build":
+        symbols = [stock["symbol"] for stock in STOCK_REGISTRY.stocks]
+    else:
+        symbols = store.symbols()
+
+    if args.command == "build":
+        count = build_store(store, symbols, args.days)
+        print(f"Stored {count} symbols x {args.days} days in {args.root}")
+    else:
+        for symbol in symbols:
+            meta = store.meta(symbol)
+            if meta:
+                print(f"{symbol}: {meta['rows']} bars, {meta['firstDate']} to {meta['lastDate']}")
+            else:
+                print(f"{symbol}: not stored")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
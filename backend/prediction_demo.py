@@ -17,6 +17,14 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 
+import indicators
+from model_registry import ModelRegistry
+from monte_carlo import MC_HISTORY_DAYS, prediction_bands
+from ohlcv_store import OHLCVStore
+from price_engine import simulate_price_history
+from seeded_random import seeded_numpy_rng
+from sequence_windows import create_sequences, create_multi_horizon_sequences, iter_sequence_batches, DEFAULT_CHUNK_SIZE
+
 # Add the parent directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -65,29 +73,44 @@ def generate_sample_data(symbol="RELIANCE", days=1000):
     df['volume'] = np.random.normal(5000000, 2000000, len(df))
     df['volume'] = df['volume'].clip(1000000)  # Ensure minimum volume
     
-    # Add some technical indicators
-    df['sma_20'] = df['close'].rolling(window=20).mean()
-    df['sma_50'] = df['close'].rolling(window=50).mean()
-    df['rsi_14'] = calculate_rsi(df['close'], 14)
-    
-    df.fillna(method='bfill', inplace=True)
     df.set_index('date', inplace=True)
     
-    return df
+    return add_technical_features(df)
 
-def calculate_rsi(series, period=14):
-    """Calculate RSI technical indicator"""
-    delta = series.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
+def generate_symbol_data(symbol, days=1000, store_root=None):
+    """
+    Load a symbol's last `days` bars from the OHLCV store at store_root, or
+    generate a reproducible history from the API's price engine.
+    """
+    store = OHLCVStore(store_root) if store_root else None
+    if store is not None and symbol in store:
+        history = store.tail(symbol, days)
+    else:
+        history = simulate_price_history(symbol, days, rng=seeded_numpy_rng("training", symbol))
+    return build_feature_frame(history.columns())
+
+def add_technical_features(df):
+    """Add the indicator columns the models are trained on"""
+    close = df['close'].to_numpy(dtype=np.float64)
+    df['sma_20'] = indicators.sma(close, 20)
+    df['sma_50'] = indicators.sma(close, 50)
+    df['rsi_14'] = indicators.rsi(close, 14)
     
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
+    df.bfill(inplace=True)
     
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+    return df
+
+def build_feature_frame(columns):
+    """Build a model-ready DataFrame from OHLCV columns with a 'date' column"""
+    df = pd.DataFrame(columns)
+    df['date'] = pd.to_datetime(df['date'])
+    df.set_index('date', inplace=True)
     
-    return rsi
+    return add_technical_features(df)
+
+def calculate_rsi(series, period=14):
+    """Calculate RSI technical indicator"""
+    return pd.Series(indicators.rsi(series.to_numpy(), period), index=series.index)
 
 class StockPredictor:
     """Stock price prediction using ensemble of models"""
@@ -99,11 +122,19 @@ class StockPredictor:
         self.feature_cols = ['open', 'high', 'low', 'close', 'volume', 'sma_20', 'sma_50', 'rsi_14']
         self.target_col = 'close'
         self.sequence_length = 10  # For LSTM
+        
+        # Direct multi-horizon models, trained with train_direct()
+        self.rf_direct_model = None
+        self.lstm_direct_model = None
+        self.horizon = 0
     
-    def prepare_data(self, df, test_size=0.2):
+    def prepare_data(self, df, test_size=0.2, fit_scaler=True):
         """Prepare data for training and testing"""
-        # Scale the features
-        scaled_data = self.scaler.fit_transform(df[self.feature_cols])
+        # Scale the features (reuse a fitted scaler when models were loaded from the registry)
+        if fit_scaler:
+            scaled_data = self.scaler.fit_transform(df[self.feature_cols])
+        else:
+            scaled_data = self.scaler.transform(df[self.feature_cols])
         scaled_df = pd.DataFrame(scaled_data, columns=self.feature_cols, index=df.index)
         
         # Split into train and test
@@ -133,14 +164,12 @@ class StockPredictor:
         }
     
     def _create_sequences(self, X, y):
-        """Create sequences for LSTM model"""
-        X_seq, y_seq = [], []
-        
-        for i in range(len(X) - self.sequence_length):
-            X_seq.append(X.iloc[i:i+self.sequence_length].values)
-            y_seq.append(y.iloc[i+self.sequence_length])
-        
-        return np.array(X_seq), np.array(y_seq)
+        """Create sequences for LSTM model as zero-copy windows over X"""
+        return create_sequences(X, y, self.sequence_length)
+    
+    def iter_sequences(self, X, y, chunk_size=DEFAULT_CHUNK_SIZE, shuffle=False):
+        """Yield LSTM sequences in bounded-size chunks for very long histories"""
+        return iter_sequence_batches(X, y, self.sequence_length, chunk_size=chunk_size, shuffle=shuffle)
     
     def train_random_forest(self, X_train, y_train):
         """Train Random Forest model"""
@@ -153,26 +182,60 @@ class StockPredictor:
         self.rf_model.fit(X_train, y_train)
         print("Random Forest model trained.")
     
-    def train_lstm(self, X_train, y_train):
-        """Train LSTM model"""
-        print("Training LSTM model...")
-        self.lstm_model = Sequential([
-            LSTM(50, return_sequences=True, input_shape=(X_train.shape[1], X_train.shape[2])),
+    def _build_lstm(self, n_features, outputs=1):
+        """Build and compile the LSTM network"""
+        model = Sequential([
+            LSTM(50, return_sequences=True, input_shape=(self.sequence_length, n_features)),
             Dropout(0.2),
             LSTM(50),
             Dropout(0.2),
-            Dense(1)
+            Dense(outputs)
         ])
-        
-        self.lstm_model.compile(optimizer='adam', loss='mean_squared_error')
+        model.compile(optimizer='adam', loss='mean_squared_error')
+        return model
+    
+    def train_lstm(self, X_train, y_train, epochs=50, verbose=1):
+        """Train LSTM model"""
+        print("Training LSTM model...")
+        self.lstm_model = self._build_lstm(X_train.shape[2])
         self.lstm_model.fit(
             X_train, y_train,
-            epochs=50,
+            epochs=epochs,
             batch_size=32,
-            verbose=1
+            verbose=verbose
         )
         print("LSTM model trained.")
     
+    def train_lstm_streaming(self, X_scaled, y, epochs=50, batch_size=32, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Train LSTM model chunk by chunk from a scaled feature matrix, never holding all sequences"""
+        print("Training LSTM model (streaming)...")
+        X_scaled = np.asarray(X_scaled)
+        self.lstm_model = self._build_lstm(X_scaled.shape[1])
+        
+        for epoch in range(epochs):
+            for X_chunk, y_chunk in self.iter_sequences(X_scaled, y, chunk_size=chunk_size, shuffle=True):
+                self.lstm_model.fit(X_chunk, y_chunk, epochs=1, batch_size=batch_size, verbose=0)
+            print(f"Epoch {epoch + 1}/{epochs} done")
+        print("LSTM model trained.")
+    
+    def train_direct(self, X_scaled, y, horizon=30, epochs=50, batch_size=32):
+        """Train models that output the next `horizon` closes in a single call"""
+        print(f"Training direct {horizon}-day models...")
+        X_seq, Y_seq = create_multi_horizon_sequences(X_scaled, y, self.sequence_length, horizon)
+        
+        # Random Forest handles multi-output targets natively; it sees each window's last row
+        self.rf_direct_model = RandomForestRegressor(
+            n_estimators=100,
+            max_depth=20,
+            random_state=42
+        )
+        self.rf_direct_model.fit(X_seq[:, -1, :], Y_seq)
+        
+        self.lstm_direct_model = self._build_lstm(X_seq.shape[2], outputs=horizon)
+        self.lstm_direct_model.fit(X_seq, Y_seq, epochs=epochs, batch_size=batch_size, verbose=1)
+        self.horizon = horizon
+        print("Direct models trained.")
+    
     def predict_rf(self, X_test):
         """Make predictions with Random Forest model"""
         return self.rf_model.predict(X_test)
@@ -226,63 +289,89 @@ class StockPredictor:
         
         return results
     
-    def predict_future(self, df, days=30):
+    def predict_future(self, df, days=30, mode='recursive'):
         """Predict future prices"""
-        # Get the last sequence for LSTM
-        last_sequence = df[self.feature_cols].tail(self.sequence_length).values
-        last_sequence_scaled = self.scaler.transform(last_sequence)
+        return self.predict_future_batch({'_': df}, days, mode)['_']
+    
+    def predict_future_batch(self, frames, days=30, mode='recursive'):
+        """
+        Forecast many symbols at once from a dict of {symbol: df}.
+        'recursive' rolls every symbol forward together with one RF and one LSTM
+        call per day; 'direct' uses the multi-horizon models for a single call
+        per model. Returns {symbol: (future_df, last_known_price)}.
+        """
+        symbols = list(frames)
+        if not symbols:
+            return {}
         
-        # Last know values for reference
-        last_known_price = df['close'].iloc[-1]
+        # Stack the last sequence of every symbol: (n_symbols, sequence_length, n_features)
+        windows = np.stack([
+            self.scaler.transform(frames[symbol][self.feature_cols].tail(self.sequence_length).values)
+            for symbol in symbols
+        ])
         
-        # Prepare for predictions
-        future_dates = pd.date_range(
-            start=df.index[-1] + timedelta(days=1),
-            periods=days,
-            freq='B'  # Business days
-        )
+        if mode == 'direct':
+            rf_preds, lstm_preds = self._predict_direct(windows, days)
+        elif mode == 'recursive':
+            rf_preds, lstm_preds = self._predict_recursive(windows, days)
+        else:
+            raise ValueError(f"Unknown forecast mode: {mode}")
         
-        future_prices_rf = []
-        future_prices_lstm = []
-        future_prices_ensemble = []
+        # Weighted ensemble, same weights as ensemble_predict
+        ensemble_preds = 0.4 * rf_preds + 0.6 * lstm_preds
         
-        # Make predictions for each day
-        current_features = last_sequence_scaled.copy()
+        results = {}
+        for i, symbol in enumerate(symbols):
+            df = frames[symbol]
+            future_dates = pd.date_range(
+                start=df.index[-1] + timedelta(days=1),
+                periods=days,
+                freq='B'  # Business days
+            )
+            future_df = pd.DataFrame({
+                'date': future_dates,
+                'rf_prediction': rf_preds[i],
+                'lstm_prediction': lstm_preds[i],
+                'ensemble_prediction': ensemble_preds[i]
+            })
+            future_df.set_index('date', inplace=True)
+            results[symbol] = (future_df, df['close'].iloc[-1])
         
-        for _ in range(days):
-            # RF prediction using last available features
-            rf_pred = self.rf_model.predict(current_features[-1:].reshape(1, -1))[0]
-            
-            # LSTM prediction using sequence
-            lstm_input = current_features[-self.sequence_length:].reshape(1, self.sequence_length, len(self.feature_cols))
-            lstm_pred = self.lstm_model.predict(lstm_input)[0][0]
-            
-            # Ensemble prediction
-            ensemble_pred = 0.4 * rf_pred + 0.6 * lstm_pred
-            
-            # Store predictions
-            future_prices_rf.append(rf_pred)
-            future_prices_lstm.append(lstm_pred)
-            future_prices_ensemble.append(ensemble_pred)
+        return results
+    
+    def _predict_recursive(self, windows, days):
+        """Roll all windows forward one day at a time; returns (n, days) RF and LSTM arrays"""
+        n_symbols = len(windows)
+        close_idx = self.feature_cols.index('close')
+        rf_preds = np.empty((n_symbols, days))
+        lstm_preds = np.empty((n_symbols, days))
+        current = windows.copy()
+        
+        for step in range(days):
+            # RF uses the latest row of every window, LSTM the whole window
+            rf_preds[:, step] = self.rf_model.predict(current[:, -1, :])
+            lstm_preds[:, step] = np.asarray(self.lstm_model.predict_on_batch(current)).reshape(-1)
             
             # Update features for next prediction (simplified approach)
             # In a real scenario, we'd need to update all features including indicators
-            new_features = current_features[-1:].copy()
-            new_features[0, self.feature_cols.index('close')] = lstm_pred  # Use LSTM pred for simplicity
+            new_rows = current[:, -1:, :].copy()
+            new_rows[:, 0, close_idx] = lstm_preds[:, step]  # Use LSTM pred for simplicity
             
             # Remove oldest day and append new prediction
-            current_features = np.vstack([current_features[1:], new_features])
+            current = np.concatenate([current[:, 1:, :], new_rows], axis=1)
         
-        # Create DataFrame with future predictions
-        future_df = pd.DataFrame({
-            'date': future_dates,
-            'rf_prediction': future_prices_rf,
-            'lstm_prediction': future_prices_lstm,
-            'ensemble_prediction': future_prices_ensemble
-        })
-        future_df.set_index('date', inplace=True)
+        return rf_preds, lstm_preds
+    
+    def _predict_direct(self, windows, days):
+        """Predict every horizon in one call per model; returns (n, days) RF and LSTM arrays"""
+        if self.lstm_direct_model is None or self.rf_direct_model is None:
+            raise ValueError("Direct models are not trained; call train_direct() first")
+        if days > self.horizon:
+            raise ValueError(f"Direct models were trained for {self.horizon} days, cannot forecast {days}")
         
-        return future_df, last_known_price
+        rf_preds = np.asarray(self.rf_direct_model.predict(windows[:, -1, :])).reshape(len(windows), -1)
+        lstm_preds = np.asarray(self.lstm_direct_model.predict_on_batch(windows)).reshape(len(windows), -1)
+        return rf_preds[:, :days], lstm_preds[:, :days]
 
 def plot_predictions(df, predictions, test_dates, model_name):
     """Plot actual vs predicted prices"""
@@ -310,8 +399,8 @@ def plot_predictions(df, predictions, test_dates, model_name):
     plt.savefig(os.path.join(plot_dir, f'{model_name.lower().replace(" ", "_")}_prediction.png'))
     plt.close()
 
-def plot_future_predictions(future_df, last_known_price, symbol):
-    """Plot future price predictions"""
+def plot_future_predictions(future_df, last_known_price, symbol, bands=None):
+    """Plot future price predictions, shaded with Monte Carlo bands when given"""
     plt.figure(figsize=(12, 6))
     
     # Last known price as a reference point
@@ -322,14 +411,25 @@ def plot_future_predictions(future_df, last_known_price, symbol):
     plt.plot(future_df.index, future_df['lstm_prediction'], 'r-', label='LSTM Prediction')
     plt.plot(future_df.index, future_df['ensemble_prediction'], 'purple', label='Ensemble Prediction')
     
-    # Confidence interval (simplified, for demo purposes)
-    plt.fill_between(
-        future_df.index,
-        future_df['ensemble_prediction'] * 0.95,
-        future_df['ensemble_prediction'] * 1.05,
-        color='gray', alpha=0.2,
-        label='Confidence Interval (±5%)'
-    )
+    # 5th-95th and 25th-75th percentiles of the simulated GBM paths
+    if bands:
+        horizon = len(future_df)
+        plt.fill_between(
+            future_df.index, bands["bands"][5][:horizon], bands["bands"][95][:horizon],
+            color='gray', alpha=0.2, label='Monte Carlo 90% Band'
+        )
+        plt.fill_between(
+            future_df.index, bands["bands"][25][:horizon], bands["bands"][75][:horizon],
+            color='gray', alpha=0.3, label='Monte Carlo 50% Band'
+        )
+    else:
+        plt.fill_between(
+            future_df.index,
+            future_df['ensemble_prediction'] * 0.95,
+            future_df['ensemble_prediction'] * 1.05,
+            color='gray', alpha=0.2,
+            label='Confidence Interval (±5%)'
+        )
     
     plt.title(f'Future Price Prediction for {symbol}')
     plt.xlabel('Date')
@@ -450,24 +550,33 @@ def main():
     
     print(f"\nIndiStockPredictor - Prediction Demo for {symbol}")
     print("=" * 50)
-    print("Generating sample data...")
-    
-    # Generate sample data
-    df = generate_sample_data(symbol)
-    print(f"Generated {len(df)} days of sample data")
+    print("Generating price history...")
     
-    # Initialize predictor
-    predictor = StockPredictor()
+    # Train on the same price engine the API serves, like train_universe.py,
+    # so the saved models match the prices they are asked to forecast
+    df = generate_symbol_data(symbol)
+    print(f"Generated {len(df)} days of {symbol} history")
     
-    # Prepare data
-    print("Preparing data for training and testing...")
-    data = predictor.prepare_data(df)
+    # Warm-start from saved models unless a retrain is requested
+    registry = ModelRegistry()
+    predictor = None if '--retrain' in sys.argv else registry.load(symbol)
+    trained = predictor is None
     
-    # Train Random Forest model
-    predictor.train_random_forest(data['rf'][0], data['rf'][1])
-    
-    # Train LSTM model
-    predictor.train_lstm(data['lstm'][0], data['lstm'][1])
+    if trained:
+        predictor = StockPredictor()
+        
+        # Prepare data
+        print("Preparing data for training and testing...")
+        data = predictor.prepare_data(df)
+        
+        # Train Random Forest model
+        predictor.train_random_forest(data['rf'][0], data['rf'][1])
+        
+        # Train LSTM model
+        predictor.train_lstm(data['lstm'][0], data['lstm'][1])
+    else:
+        print(f"Loaded saved models for {symbol} (version {registry.latest_version(symbol)})")
+        data = predictor.prepare_data(df, fit_scaler=False)
     
     # Make predictions
     print("Making predictions...")
@@ -487,6 +596,11 @@ def main():
         for metric_name, value in metrics.items():
             print(f"  {metric_name}: {value:.4f}")
     
+    # Save freshly trained models so the next run and the API can reuse them
+    if trained:
+        version = registry.save(symbol, predictor, metrics=evaluation, train_rows=len(data['rf'][0]))
+        print(f"Saved models for {symbol} as version {version}")
+    
     # Plot predictions
     print("\nPlotting predictions...")
     for model_name, preds in predictions.items():
@@ -496,8 +610,9 @@ def main():
     print("\nPredicting future prices...")
     future_df, last_known_price = predictor.predict_future(df)
     
-    # Plot future predictions
-    plot_future_predictions(future_df, last_known_price, symbol)
+    # Plot future predictions with bands simulated from the same closes
+    bands = prediction_bands(symbol, len(future_df), closes=df['close'].to_numpy()[-(MC_HISTORY_DAYS + 1):])
+    plot_future_predictions(future_df, last_known_price, symbol, bands)
     
     # Generate recommendation
     recommendation = generate_recommendation(future_df, last_known_price)
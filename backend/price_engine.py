@@ -0,0 +1,179 @@
+"""
+Vectorized price history engine for the IndiStockPredictor platform.
+Generates OHLCV bars with NumPy, drawing all random shocks for a history in a
+single call and building the price path with cumulative products. Histories
+are kept as columnar arrays and only turned into JSON-ready rows on demand.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from seeded_random import seeded_numpy_rng
+
+# Cyclic drift: prices get a small boost during the first half of every 30-day cycle
+CYCLE_LENGTH = 30
+CYCLE_BOOST_DAYS = 15
+CYCLE_BOOST = 1.002
+
+# Number of symbols simulated per vectorized block in batch generation
+SYMBOL_BLOCK_SIZE = 64
+
+# Day-seeded histories are always drawn at this length (five years of daily
+# bars) and cut to the requested window, so every window is a tail of one series
+DAILY_HISTORY_DAYS = 1825
+
+
+def symbol_hash(symbol):
+    """Stable per-symbol hash used to derive base price, volatility and volume"""
+    return sum(ord(c) for c in symbol)
+
+
+def symbol_price_params(symbol):
+    """Return (base_price, daily_volatility, base_volume) for a symbol"""
+    h = symbol_hash(symbol)
+    base_price = 500 + (h % 3000)
+    volatility = 0.015 + (h % 100) / 1000  # Different volatility per stock
+    volume_base = 100000 + (h % 1000000)
+    return base_price, volatility, volume_base
+
+
+class PriceHistory:
+    """Columnar OHLCV history for a single symbol"""
+
+    FIELDS = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, symbol, dates, open, high, low, close, volume):
+        self.symbol = symbol
+        self.dates = dates
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self):
+        return len(self.dates)
+
+    def tail(self, days):
+        """Return the last `days` bars as views on the same arrays"""
+        start = max(0, len(self) - days)
+        return PriceHistory(self.symbol, self.dates[start:], *(getattr(self, field)[start:] for field in self.FIELDS))
+
+    def columns(self):
+        """Return the history as a dict of column name to array"""
+        return {
+            "date": self.dates,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+    def to_records(self):
+        """Serialize to the list-of-dicts shape served by the API"""
+        dates = np.datetime_as_string(self.dates, unit="D").tolist()
+        opens = np.round(self.open, 2).tolist()
+        highs = np.round(self.high, 2).tolist()
+        lows = np.round(self.low, 2).tolist()
+        closes = np.round(self.close, 2).tolist()
+        volumes = np.rint(self.volume).astype(np.int64).tolist()
+
+        return [
+            {
+                "date": date,
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "volume": v,
+            }
+            for date, o, h, l, c, v in zip(dates, opens, highs, lows, closes, volumes)
+        ]
+
+
+def empty_history(symbol):
+    """Return a history with no bars"""
+    empty = np.empty(0, dtype=np.float64)
+    return PriceHistory(symbol, np.empty(0, dtype="datetime64[D]"), empty, empty, empty, empty, empty)
+
+
+def trading_dates(days, end_date=None):
+    """Return `days` consecutive calendar dates ending at end_date (default today)"""
+    end = np.datetime64((end_date or datetime.now()).date(), "D")
+    return end - np.arange(days - 1, -1, -1)
+
+
+def simulate_price_paths(base_prices, volatilities, volume_bases, days, rng=None):
+    """
+    Simulate OHLCV bars for many symbols at once.
+    All parameter arrays have one entry per symbol; every returned array has
+    shape (n_symbols, days).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+
+    base_prices = np.asarray(base_prices, dtype=np.float64)[:, None]
+    volatilities = np.asarray(volatilities, dtype=np.float64)[:, None]
+    volume_bases = np.asarray(volume_bases, dtype=np.float64)[:, None]
+    n_symbols = base_prices.shape[0]
+
+    # One draw for every shock: daily change plus open/high/low offsets
+    shocks = rng.random((4, n_symbols, days))
+    change = (2 * shocks[0] - 1) * volatilities
+
+    cycle = np.where(np.arange(days) % CYCLE_LENGTH < CYCLE_BOOST_DAYS, CYCLE_BOOST, 1.0)
+    close = base_prices * np.cumprod((1 + change) * cycle, axis=1)
+
+    return {
+        "open": close * (1 - shocks[1] * 0.01),
+        "high": close * (1 + shocks[2] * 0.02),
+        "low": close * (1 - shocks[3] * 0.02),
+        "close": close,
+        "volume": volume_bases * (1 + np.abs(change) * 10),  # Higher volume on big moves
+    }
+
+
+def simulate_price_histories(symbols, days=365, end_date=None, rng=None):
+    """Generate histories for a list of symbols in one vectorized pass"""
+    symbols = list(symbols)
+    if not symbols or days <= 0:
+        return {symbol: empty_history(symbol) for symbol in symbols}
+
+    rng = rng if rng is not None else np.random.default_rng()
+    params = np.array([symbol_price_params(symbol) for symbol in symbols], dtype=np.float64)
+    dates = trading_dates(days, end_date)
+    histories = {}
+
+    # Work in blocks of symbols so the shock matrix stays cache- and memory-friendly
+    for start in range(0, len(symbols), SYMBOL_BLOCK_SIZE):
+        block = params[start:start + SYMBOL_BLOCK_SIZE]
+        paths = simulate_price_paths(block[:, 0], block[:, 1], block[:, 2], days, rng=rng)
+        for i, symbol in enumerate(symbols[start:start + SYMBOL_BLOCK_SIZE]):
+            histories[symbol] = PriceHistory(symbol, dates, *(paths[field][i] for field in PriceHistory.FIELDS))
+
+    return histories
+
+
+def simulate_price_history(symbol, days=365, end_date=None, rng=None):
+    """Generate a columnar OHLCV history for a single symbol"""
+    days = max(0, int(days))
+    if days == 0:
+        return empty_history(symbol)
+
+    return simulate_price_histories([symbol], days, end_date=end_date, rng=rng)[symbol]
+
+
+def daily_price_history(symbol, days, day, end_date=None):
+    """
+    Return the last `days` bars (at most DAILY_HISTORY_DAYS) of a symbol's
+    simulated history for `day` (a daily time_bucket). The series is seeded by
+    symbol and day only, so every window any endpoint asks for ends on the
+    same bars.
+    """
+    days = max(0, min(int(days), DAILY_HISTORY_DAYS))
+    if days == 0:
+        return empty_history(symbol)
+
+    rng = seeded_numpy_rng("history", symbol, day)
+    return simulate_price_history(symbol, DAILY_HISTORY_DAYS, end_date, rng).tail(days)
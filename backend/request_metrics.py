@@ -0,0 +1,216 @@
+"""
+Per-route request metrics for the IndiStockPredictor API.
+Flask request hooks record, for every route template (/api/stock/<symbol>,
+not each symbol), request counts by status, a latency histogram, response
+payload sizes and error counts in memory. Recent latencies are also kept in a
+small window per route so p50/p95/p99 can be reported exactly. Everything is
+rendered in the Prometheus text exposition format for /api/metrics.
+
+Metrics are per process: behind several workers, scrape each worker or
+aggregate the histograms (quantiles of different workers cannot be averaged).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+from flask import g, request
+
+METRIC_PREFIX = "indistock"
+
+# Histogram upper bounds in seconds and bytes (Prometheus `le` labels)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+QUANTILES = (0.5, 0.95, 0.99)
+LATENCY_WINDOW = 1024  # Recent requests per route used for the quantiles
+
+# Requests that match no route share one label so scanners cannot grow the label set
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Methods reported by name; anything else a client sends is counted as OTHER
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+OTHER_METHOD = "OTHER"
+
+
+class RouteStats:
+    """Counters and histograms for one (method, route) pair"""
+
+    def __init__(self):
+        self.statuses = {}
+        self.errors = {}
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.count = 0
+        self.size_buckets = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_sum = 0
+        self.size_count = 0
+        self.window = deque(maxlen=LATENCY_WINDOW)
+
+    def observe(self, status, seconds, size):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status >= 400:
+            kind = "server" if status >= 500 else "client"
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_sum += seconds
+        self.count += 1
+        self.window.append(seconds)
+
+        # Streamed responses have no length when the handler returns
+        if size is not None:
+            self.size_buckets[bisect_left(SIZE_BUCKETS, size)] += 1
+            self.size_sum += size
+            self.size_count += 1
+
+    def quantiles(self):
+        """Exact quantiles over the recent latency window"""
+        if not self.window:
+            return {}
+        ordered = sorted(self.window)
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(q * len(ordered)))] for q in QUANTILES}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value):
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class RequestMetrics:
+    """Thread-safe in-memory request metrics for a Flask app"""
+
+    def __init__(self, prefix=METRIC_PREFIX):
+        self.prefix = prefix
+        self.routes = {}
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.exceptions = 0
+        self.started_at = time.time()
+
+    def install(self, app):
+        """Register the request hooks on a Flask app"""
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        return self
+
+    def _route(self):
+        rule = request.url_rule
+        return rule.rule if rule is not None else UNMATCHED_ROUTE
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        with self.lock:
+            self.in_flight += 1
+
+    def _after_request(self, response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            size = None if response.is_streamed else response.calculate_content_length()
+            self.observe(request.method, self._route(), response.status_code, time.perf_counter() - started, size)
+            with self.lock:
+                self.in_flight -= 1
+        return response
+
+    def _teardown_request(self, exc):
+        # Only still set when an exception skipped after_request (e.g. propagated in debug mode)
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            self.observe(request.method, self._route(), 500, time.perf_counter() - started, None)
+            with self.lock:
+                self.in_flight -= 1
+        if exc is not None:
+            with self.lock:
+                self.exceptions += 1
+
+    def observe(self, method, route, status, seconds, size=None):
+        """Record one finished request; unknown methods are folded into OTHER"""
+        method = method if method in KNOWN_METHODS else OTHER_METHOD
+        with self.lock:
+            stats = self.routes.get((method, route))
+            if stats is None:
+                stats = self.routes[(method, route)] = RouteStats()
+            stats.observe(status, seconds, size)
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+            self.exceptions = 0
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        p = self.prefix
+        with self.lock:
+            routes = sorted(self.routes.items())
+            quantiles = {key: stats.quantiles() for key, stats in routes}
+            in_flight = self.in_flight
+            exceptions = self.exceptions
+            lines = []
+
+            lines += [f"# HELP {p}_http_requests_total Requests handled, by route, method and status.",
+                      f"# TYPE {p}_http_requests_total counter"]
+            for (method, route), stats in routes:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f"{p}_http_requests_total{_labels(route=route, method=method, status=status)} {count}")
+
+            lines += [f"# HELP {p}_http_request_errors_total Responses with a 4xx (client) or 5xx (server) status.",
+                      f"# TYPE {p}_http_request_errors_total counter"]
+            for (method, route), stats in routes:
+                for kind, count in sorted(stats.errors.items()):
+                    lines.append(f"{p}_http_request_errors_total{_labels(route=route, method=method, kind=kind)} {count}")
+
+            lines += [f"# HELP {p}_http_request_duration_seconds Time from request start to response, by route.",
+                      f"# TYPE {p}_http_request_duration_seconds histogram"]
+            for (method, route), stats in routes:
+                lines += self._histogram(f"{p}_http_request_duration_seconds", route, method, LATENCY_BUCKETS,
+                                         stats.latency_buckets, stats.latency_sum, stats.count)
+
+            lines += [f"# HELP {p}_http_request_latency_seconds Latency quantiles over the last "
+                      f"{LATENCY_WINDOW} requests per route.",
+                      f"# TYPE {p}_http_request_latency_seconds summary"]
+            for (method, route), stats in routes:
+                for q, value in quantiles[(method, route)].items():
+                    labels = _labels(route=route, method=method, quantile=q)
+                    lines.append(f"{p}_http_request_latency_seconds{labels} {_number(value)}")
+                labels = _labels(route=route, method=method)
+                lines.append(f"{p}_http_request_latency_seconds_sum{labels} {_number(stats.latency_sum)}")
+                lines.append(f"{p}_http_request_latency_seconds_count{labels} {stats.count}")
+
+            lines += [f"# HELP {p}_http_response_size_bytes Response payload size, by route.",
+                      f"# TYPE {p}_http_response_size_bytes histogram"]
+            for (method, route), stats in routes:
+                lines += self._histogram(f"{p}_http_response_size_bytes", route, method, SIZE_BUCKETS,
+                                         stats.size_buckets, stats.size_sum, stats.size_count)
+
+        lines += [f"# HELP {p}_http_requests_in_flight Requests currently being handled.",
+                  f"# TYPE {p}_http_requests_in_flight gauge",
+                  f"{p}_http_requests_in_flight {in_flight}",
+                  f"# HELP {p}_http_unhandled_exceptions_total Requests that ended in an unhandled exception.",
+                  f"# TYPE {p}_http_unhandled_exceptions_total counter",
+                  f"{p}_http_unhandled_exceptions_total {exceptions}",
+                  f"# HELP {p}_process_start_time_seconds Unix time the metrics started recording.",
+                  f"# TYPE {p}_process_start_time_seconds gauge",
+                  f"{p}_process_start_time_seconds {_number(round(self.started_at, 3))}"]
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, name, route, method, bounds, buckets, total, count):
+        """Cumulative bucket, sum and count lines for one route"""
+        lines = []
+        cumulative = 0
+        for bound, bucket in zip(bounds, buckets):
+            cumulative += bucket
+            lines.append(f"{name}_bucket{_labels(route=route, method=method, le=_number(float(bound)))} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(route=route, method=method, le='+Inf')} {count}")
+        lines.append(f"{name}_sum{_labels(route=route, method=method)} {_number(total)}")
+        lines.append(f"{name}_count{_labels(route=route, method=method)} {count}")
+        return lines
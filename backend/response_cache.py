@@ -0,0 +1,95 @@
+"""
+Response cache for the IndiStockPredictor API.
+Stores pre-serialized JSON bodies keyed by request and time bucket. Entries
+expire at the end of their bucket, so a 60-second TTL lines up with the
+minute-seeded market generators, and the least recently used entry is evicted
+once the cache is full.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, request
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of serialized responses with time-bucketed expiry"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, now=None):
+        """Return the cached (body, status, mimetype, expires_at) or None"""
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[3] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, body, status, mimetype, expires_at):
+        with self.lock:
+            self.entries[key] = (body, status, mimetype, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "maxEntries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def cached_response(cache, ttl):
+    """
+    Cache a Flask view's successful responses for the current `ttl`-second bucket.
+    The key is the request path plus query string, so different parameters are
+    cached separately; the cached body is served as-is without re-serializing.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            now = time.time()
+            bucket = int(now) // ttl
+            key = (view.__name__, request.full_path, bucket)
+
+            entry = cache.get(key, now)
+            if entry is None:
+                response = view(*args, **kwargs)
+                if not isinstance(response, Response) or response.status_code != 200:
+                    return response
+                expires_at = (bucket + 1) * ttl
+                entry = (response.get_data(), response.status_code, response.mimetype, expires_at)
+                cache.set(key, *entry)
+
+            body, status, mimetype, expires_at = entry
+            cached = Response(body, status=status, mimetype=mimetype)
+            cached.headers["Cache-Control"] = f"public, max-age={max(0, int(expires_at - now))}"
+            return cached
+        return wrapper
+    return decorator
@@ -0,0 +1,196 @@
+"""
+Portfolio risk analytics for the IndiStockPredictor platform.
+Once per trading day the daily returns of every listed symbol are loaded
+(from the OHLCV store when it has enough history, otherwise the day's
+simulated series that the price endpoints serve), and the universe covariance
+matrix, betas to the benchmark and mean returns are computed with NumPy. A portfolio's volatility, VaR, beta and marginal risk
+contributions then only need its weight vector and a product with the cached
+covariance matrix, so risk for thousands of portfolios stays cheap.
+"""
+
+import threading
+from datetime import datetime
+from statistics import NormalDist
+
+import numpy as np
+
+from ohlcv_store import PRICE_STORE
+from price_engine import daily_price_history
+from seeded_random import time_bucket
+from stock_registry import STOCK_REGISTRY
+
+RISK_DAY_SECONDS = 86400
+RISK_HISTORY_DAYS = 252  # One year of daily returns
+TRADING_DAYS_PER_YEAR = 252
+DEFAULT_CONFIDENCE = 0.95
+
+# Benchmark for beta; when it is not in the OHLCV store an equal-weighted
+# index of the listed universe stands in for it
+BENCHMARK_SYMBOL = "NIFTY"
+
+_risk_lock = threading.Lock()
+_risk = {"day": None, "model": None}
+
+
+def _pct(value, digits=2):
+    return round(float(value) * 100, digits)
+
+
+class RiskModel:
+    """Daily return statistics for a universe of symbols"""
+
+    def __init__(self, symbols, returns, benchmark_returns, benchmark_name=BENCHMARK_SYMBOL, last_prices=None):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.returns = np.asarray(returns, dtype=np.float64)  # (days, symbols)
+        self.last_prices = None if last_prices is None else np.asarray(last_prices, dtype=np.float64)
+        self.benchmark_name = benchmark_name
+        self.computed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        self.mean = self.returns.mean(axis=0)
+        self.covariance = np.cov(self.returns, rowvar=False)
+        self.volatility = np.sqrt(np.diag(self.covariance))
+
+        # Beta of every symbol in one product: cov(r_i, r_b) / var(r_b)
+        benchmark = np.asarray(benchmark_returns, dtype=np.float64)
+        centered = benchmark - benchmark.mean()
+        benchmark_var = centered @ centered / (len(benchmark) - 1)
+        self.beta = (self.returns - self.mean).T @ centered / (len(benchmark) - 1) / benchmark_var
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def last_price(self, symbol):
+        """Last close used by the model, or None"""
+        if self.last_prices is None or symbol not in self.index:
+            return None
+        return float(self.last_prices[self.index[symbol]])
+
+    def weights(self, exposures):
+        """
+        Turn {symbol: position value} into (row indices, weights, total value),
+        skipping symbols the model does not cover. Raises ValueError for
+        non-finite values or a total that is not positive (e.g. offsetting
+        long and short positions), which have no meaningful weights.
+        """
+        known = [(self.index[s], float(v)) for s, v in exposures.items() if s in self.index and v]
+        if not known:
+            return np.empty(0, dtype=np.intp), np.empty(0), 0.0
+        rows = np.array([row for row, _ in known], dtype=np.intp)
+        values = np.array([value for _, value in known])
+        if not np.isfinite(values).all():
+            raise ValueError("Holding values must be finite numbers")
+        with np.errstate(over="ignore"):
+            total = values.sum()
+        if not np.isfinite(total):
+            raise ValueError("Holding values must be finite numbers")
+        if total <= 0:
+            raise ValueError("Total portfolio value must be positive")
+        return rows, values / total, total
+
+    def portfolio_risk(self, exposures, confidence=DEFAULT_CONFIDENCE):
+        """One-day risk report for a portfolio given as {symbol: position value}"""
+        missing = sorted(s for s in exposures if s not in self.index)
+        try:
+            rows, weights, total = self.weights(exposures)
+        except ValueError as e:
+            return {"error": str(e), "missing": missing}
+        if not len(rows):
+            return {"error": "No holdings with return history", "missing": missing}
+
+        cov = self.covariance[np.ix_(rows, rows)]
+        cov_w = cov @ weights
+        variance = weights @ cov_w
+        sigma = np.sqrt(variance)
+        mean = weights @ self.mean[rows]
+        z = NormalDist().inv_cdf(confidence)
+
+        # Parametric VaR assumes normal returns; historical VaR replays the return history
+        parametric_var = max(0.0, z * sigma - mean)
+        portfolio_returns = self.returns[:, rows] @ weights
+        historical_var = max(0.0, -np.percentile(portfolio_returns, (1 - confidence) * 100))
+
+        # Euler decomposition: contributions w_i * (Σw)_i / σ sum to σ
+        marginal = cov_w / sigma if sigma > 0 else np.zeros_like(cov_w)
+        contribution = weights * marginal
+        annualize = np.sqrt(TRADING_DAYS_PER_YEAR)
+
+        holdings = []
+        for row, weight, marg, contrib in zip(rows, weights, marginal, contribution):
+            holdings.append({
+                "symbol": self.symbols[row],
+                "weight": _pct(weight),
+                "volatility": _pct(self.volatility[row] * annualize),
+                "beta": round(float(self.beta[row]), 3),
+                "marginalRisk": _pct(marg * annualize, 3),
+                "riskContribution": _pct(contrib / sigma if sigma > 0 else 0),
+                "parametricVaR": _pct(max(0.0, z * self.volatility[row] - self.mean[row]))
+            })
+
+        return {
+            "confidence": confidence,
+            "horizonDays": 1,
+            "historyDays": len(self.returns),
+            "benchmark": self.benchmark_name,
+            "portfolio": {
+                "value": round(total, 2),
+                "volatility": _pct(sigma * annualize),
+                "dailyVolatility": _pct(sigma, 3),
+                "beta": round(float(weights @ self.beta[rows]), 3),
+                "parametricVaR": {"percent": _pct(parametric_var), "amount": round(parametric_var * total, 2)},
+                "historicalVaR": {"percent": _pct(historical_var), "amount": round(historical_var * total, 2)},
+                "diversificationRatio": round(float(weights @ self.volatility[rows] / sigma), 3) if sigma > 0 else None
+            },
+            "holdings": holdings,
+            "missing": missing,
+            "lastUpdated": self.computed_at
+        }
+
+    def batch_volatility(self, weight_matrix):
+        """
+        Daily volatility for many portfolios at once from a (portfolios, symbols)
+        weight matrix in universe order: sqrt(diag(W Σ Wᵀ)) without forming it.
+        """
+        weight_matrix = np.asarray(weight_matrix, dtype=np.float64)
+        return np.sqrt(np.einsum("ij,ij->i", weight_matrix @ self.covariance, weight_matrix))
+
+
+def _daily_returns(closes):
+    return closes[:, 1:] / closes[:, :-1] - 1
+
+
+def build_risk_model(day):
+    """Load or simulate the universe's closes and compute the day's risk model"""
+    symbols = [stock["symbol"] for stock in STOCK_REGISTRY.stocks]
+    bars = RISK_HISTORY_DAYS + 1
+    histories = {}
+
+    # Prefer real stored bars for symbols with enough history in the OHLCV store,
+    # else the day's simulated series that /historical and the technical card serve
+    for symbol in symbols:
+        if PRICE_STORE.length(symbol) >= bars:
+            histories[symbol] = PRICE_STORE.tail(symbol, bars)
+        else:
+            histories[symbol] = daily_price_history(symbol, bars, day)
+
+    closes = np.vstack([np.asarray(histories[symbol].close, dtype=np.float64) for symbol in symbols])
+    returns = _daily_returns(closes)
+
+    if PRICE_STORE.length(BENCHMARK_SYMBOL) >= bars:
+        benchmark = _daily_returns(np.asarray(PRICE_STORE.tail(BENCHMARK_SYMBOL, bars).close)[None, :])[0]
+        name = BENCHMARK_SYMBOL
+    else:
+        benchmark = returns.mean(axis=0)
+        name = f"{BENCHMARK_SYMBOL} (equal-weighted proxy)"
+
+    return RiskModel(symbols, returns.T, benchmark, name, last_prices=closes[:, -1])
+
+
+def get_risk_model(now=None):
+    """Return the day's risk model, computing it on the first request of the day"""
+    day = time_bucket(RISK_DAY_SECONDS, now)
+    with _risk_lock:
+        if _risk["day"] != day:
+            _risk["model"] = build_risk_model(day)
+            _risk["day"] = day
+        return _risk["model"]
@@ -0,0 +1,156 @@
+"""
+Fundamental screener for the IndiStockPredictor platform.
+The universe is held as a columnar table (one NumPy array per metric) with a
+sorted index per metric, so a min/max range filter is two binary searches
+and a screen with several ranges only checks the rows left by the most
+selective one. Sorting and paging read the precomputed order instead of
+sorting the result on every request. The served table is the day's
+fundamentals universe (fundamentals_engine), so screener values match the
+fundamentals endpoint.
+"""
+
+import numpy as np
+
+from screener_query import FIELD_ALIASES
+
+# Screener metrics and the fundamentals universe columns they read
+SCREENER_COLUMNS = {
+    "price": "price",
+    "marketCap": "valuation.marketCap",
+    "pe": "valuation.pe",
+    "dividendYield": "dividend.yield",
+}
+
+# Request parameters accepted for range filters: metric -> (min param, max param)
+RANGE_PARAMS = {
+    "price": ("min_price", "max_price"),
+    "marketCap": ("min_market_cap", "max_market_cap"),
+    "pe": ("min_pe", "max_pe"),
+    "dividendYield": ("min_dividend_yield", "max_dividend_yield"),
+}
+
+MAX_LIMIT = 1000
+
+# Registry fields exposed as text columns
+LABEL_FIELDS = ("symbol", "name", "sector", "industry", "exchange")
+
+
+class ScreenerTable:
+    """
+    Columnar metrics for a stock universe with a sorted index per numeric
+    column, plus text columns (registry fields and any extra labels).
+    """
+
+    def __init__(self, stocks, columns, labels=None):
+        self.stocks = list(stocks)
+        self.columns = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+        self.labels = {
+            field: np.array([str(stock.get(field, "")) for stock in self.stocks]) for field in LABEL_FIELDS
+        }
+        self.labels.update({name: np.asarray(values, dtype=str) for name, values in (labels or {}).items()})
+        self.field_names = self._field_names()
+
+        # Stable argsort keeps listing order among equal values
+        self.order = {name: np.argsort(values, kind="stable") for name, values in self.columns.items()}
+        self.sorted_values = {name: self.columns[name][order] for name, order in self.order.items()}
+        # Descending order with listing order kept among equal values
+        self.order_desc = {name: np.argsort(-values, kind="stable") for name, values in self.columns.items()}
+
+        self.sector_rows = {}
+        for row, stock in enumerate(self.stocks):
+            self.sector_rows.setdefault(stock.get("sector"), []).append(row)
+        self.sector_rows = {sector: np.array(rows, dtype=np.intp) for sector, rows in self.sector_rows.items()}
+
+    def __len__(self):
+        return len(self.stocks)
+
+    def _field_names(self):
+        """Map lower-case full names, unique last parts and aliases to column names"""
+        names = {}
+        last_parts = {}
+        for name in list(self.columns) + list(self.labels):
+            names[name.lower()] = name
+            last_parts.setdefault(name.rsplit(".", 1)[-1].lower(), []).append(name)
+        for part, matches in last_parts.items():
+            if len(matches) == 1:
+                names.setdefault(part, matches[0])
+        for alias, name in FIELD_ALIASES.items():
+            if name in self.columns or name in self.labels:
+                names.setdefault(alias, name)
+        return names
+
+    def resolve(self, name):
+        """Return the column for a field name or alias, or None"""
+        return self.field_names.get(name.lower())
+
+    def column(self, name):
+        return self.columns[name] if name in self.columns else self.labels[name]
+
+    def range_rows(self, column, low=None, high=None):
+        """Row ids with low <= value <= high, found by binary search on the sorted column"""
+        values = self.sorted_values[column]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        end = len(values) if high is None else np.searchsorted(values, high, side="right")
+        return self.order[column][start:end]
+
+    def filter(self, ranges=None, sector=None):
+        """
+        Return a boolean row mask for rows inside every (low, high) range and
+        in the given sector. Starts from the smallest candidate set and checks
+        the remaining ranges on those rows only.
+        """
+        candidates = []
+        if sector:
+            candidates.append(self.sector_rows.get(sector, np.empty(0, dtype=np.intp)))
+        ranges = {column: bounds for column, bounds in (ranges or {}).items() if bounds != (None, None)}
+        for column, (low, high) in ranges.items():
+            candidates.append(self.range_rows(column, low, high))
+
+        mask = np.zeros(len(self), dtype=bool)
+        if not candidates:
+            mask[:] = True
+            return mask
+
+        rows = min(candidates, key=len)
+        for column, (low, high) in ranges.items():
+            values = self.columns[column][rows]
+            keep = np.ones(len(rows), dtype=bool)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            rows = rows[keep]
+        if sector:
+            rows = rows[np.isin(rows, self.sector_rows.get(sector, []))]
+
+        mask[rows] = True
+        return mask
+
+    def select(self, mask, sort=None, descending=False, offset=0, limit=None):
+        """Return (matching row ids for the requested page, total matches)"""
+        if sort:
+            order = self.order_desc[sort] if descending else self.order[sort]
+            rows = order[mask[order]]
+        else:
+            rows = np.flatnonzero(mask)
+
+        total = len(rows)
+        end = None if limit is None else offset + limit
+        return rows[offset:end], total
+
+    def record(self, row, fields=None):
+        """The stock record plus its metric values for one row"""
+        item = dict(self.stocks[row])
+        for name in fields or self.columns:
+            value = self.column(name)[row].item()
+            # Whole-number metrics come back as ints, matching the generated JSON
+            item[name] = int(value) if isinstance(value, float) and value.is_integer() else value
+        return item
+
+
+def screener_record(table, row):
+    """The stock record plus the screener metrics for one row, rounded for display"""
+    item = dict(table.stocks[row])
+    for metric, column in SCREENER_COLUMNS.items():
+        item[metric] = round(table.columns[column][row].item(), 2)
+    return item
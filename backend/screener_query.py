@@ -0,0 +1,369 @@
+"""
+Boolean screener expressions for the IndiStockPredictor platform.
+A screen such as
+
+    ROE > 15 and D/E < 0.5 and sector in (IT, Pharma)
+
+is parsed once into a small syntax tree and evaluated against a columnar
+universe table, so every comparison is a single NumPy operation over all
+stocks and the result is a boolean row mask.
+
+Grammar (keywords are case-insensitive):
+    expr       := or
+    or         := and ('or' and)*
+    and        := not ('and' not)*
+    not        := 'not' not | comparison
+    comparison := sum (op sum | ['not'] 'in' '(' list ')' | 'between' sum 'and' sum)?
+    sum        := product (('+' | '-') product)*
+    product    := unary (('*' | '/') unary)*
+    unary      := '-' unary | atom
+    atom       := number | 'string' | field | '(' expr ')'
+with op one of > >= < <= = == != <>. Fields are dotted paths such as
+profitability.returnOnEquity, their last part when it is unique
+(returnOnEquity), or a common alias (ROE, D/E, P/E, ...). Text values may
+be bare words (IT) or quoted ('BAJAJ-AUTO').
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Common abbreviations for fundamentals fields (matched case-insensitively)
+FIELD_ALIASES = {
+    "pe": "valuation.pe",
+    "p/e": "valuation.pe",
+    "pb": "valuation.pb",
+    "p/b": "valuation.pb",
+    "ps": "valuation.ps",
+    "p/s": "valuation.ps",
+    "peg": "valuation.peg",
+    "ev/ebitda": "valuation.evToEbitda",
+    "marketcap": "valuation.marketCap",
+    "de": "financialHealth.debtToEquity",
+    "d/e": "financialHealth.debtToEquity",
+    "roe": "profitability.returnOnEquity",
+    "roa": "profitability.returnOnAssets",
+    "roic": "profitability.returnOnInvestedCapital",
+    "dividendyield": "dividend.yield",
+    "payout": "dividend.payout",
+    "beta": "risks.beta",
+    "score": "fundamentalScore",
+    "consensus": "analystRatings.consensus",
+    "targetprice": "analystRatings.targetPrice",
+}
+
+# Aliases containing characters that are otherwise operators, longest first
+_SLASH_ALIASES = sorted((alias for alias in FIELD_ALIASES if "/" in alias), key=len, reverse=True)
+
+KEYWORDS = {"and", "or", "not", "in", "between"}
+COMPARISONS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "=": np.equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+    "<>": np.not_equal,
+}
+ARITHMETIC = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide}
+
+MAX_QUERY_LENGTH = 2000
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<number>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?(?![A-Za-z_])|\.\d+(?:[eE][+-]?\d+)?)
+  | (?P<string>'[^']*'|"[^"]*")
+  | (?P<ident>[A-Za-z0-9_][A-Za-z0-9_.]*)
+  | (?P<op>>=|<=|==|!=|<>|[<>=()+\-*/,])
+""", re.VERBOSE)
+
+
+class ScreenerQueryError(ValueError):
+    """Raised for screener expressions that cannot be parsed or evaluated"""
+
+
+def tokenize(text):
+    """Split an expression into (kind, value, position) tokens"""
+    tokens = []
+    pos = 0
+    lowered = text.lower()
+    while pos < len(text):
+        alias = next(
+            (a for a in _SLASH_ALIASES
+             if lowered.startswith(a, pos) and not lowered[pos + len(a):pos + len(a) + 1].isalnum()),
+            None
+        )
+        if alias:
+            tokens.append(("ident", text[pos:pos + len(alias)], pos))
+            pos += len(alias)
+            continue
+
+        match = _TOKEN_PATTERN.match(text, pos)
+        if not match:
+            raise ScreenerQueryError(f"Unexpected character {text[pos]!r} at position {pos}")
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "ident" and value.lower() in KEYWORDS:
+            kind, value = "keyword", value.lower()
+        if kind != "space":
+            tokens.append((kind, value, pos))
+        pos = match.end()
+    tokens.append(("end", None, len(text)))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing nested tuples"""
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def peek(self):
+        return self.tokens[self.index]
+
+    def take(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def accept(self, kind, value=None):
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.index += 1
+            return token
+        return None
+
+    def expect(self, kind, value=None):
+        token = self.accept(kind, value)
+        if token is None:
+            found = self.peek()
+            wanted = value or kind
+            got = "end of query" if found[0] == "end" else repr(found[1])
+            raise ScreenerQueryError(f"Expected {wanted} at position {found[2]}, found {got}")
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        self.expect("end")
+        return node
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.accept("keyword", "or"):
+            node = ("or", node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while self.accept("keyword", "and"):
+            node = ("and", node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        if self.accept("keyword", "not"):
+            return ("not", self.parse_not())
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        left = self.parse_sum()
+        token = self.peek()
+        if token[0] == "op" and token[1] in COMPARISONS:
+            self.take()
+            return ("compare", token[1], left, self.parse_sum())
+        if token[0] == "keyword" and token[1] == "between":
+            self.take()
+            low = self.parse_sum()
+            self.expect("keyword", "and")
+            high = self.parse_sum()
+            return ("and", ("compare", ">=", left, low), ("compare", "<=", left, high))
+
+        negate = False
+        if token[0] == "keyword" and token[1] == "not" and self.tokens[self.index + 1][:2] == ("keyword", "in"):
+            self.take()
+            negate = True
+        if self.accept("keyword", "in"):
+            self.expect("op", "(")
+            values = [self.parse_sum()]
+            while self.accept("op", ","):
+                values.append(self.parse_sum())
+            self.expect("op", ")")
+            node = ("in", left, tuple(values))
+            return ("not", node) if negate else node
+        return left
+
+    def parse_sum(self):
+        node = self.parse_product()
+        while True:
+            token = self.peek()
+            if token[0] == "op" and token[1] in ("+", "-"):
+                self.take()
+                node = ("arith", token[1], node, self.parse_product())
+            else:
+                return node
+
+    def parse_product(self):
+        node = self.parse_unary()
+        while True:
+            token = self.peek()
+            if token[0] == "op" and token[1] in ("*", "/"):
+                self.take()
+                node = ("arith", token[1], node, self.parse_unary())
+            else:
+                return node
+
+    def parse_unary(self):
+        if self.accept("op", "-"):
+            return ("neg", self.parse_unary())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        token = self.take()
+        kind, value, pos = token
+        if kind == "number":
+            return ("number", float(value))
+        if kind == "string":
+            return ("string", value[1:-1])
+        if kind == "ident":
+            return ("name", value, pos)
+        if kind == "op" and value == "(":
+            node = self.parse_or()
+            self.expect("op", ")")
+            return node
+        got = "end of query" if kind == "end" else repr(value)
+        raise ScreenerQueryError(f"Unexpected {got} at position {pos}")
+
+
+@lru_cache(maxsize=256)
+def parse_query(text):
+    """Parse an expression into a syntax tree (cached per query text)"""
+    text = (text or "").strip()
+    if not text:
+        raise ScreenerQueryError("Empty screener query")
+    if len(text) > MAX_QUERY_LENGTH:
+        raise ScreenerQueryError(f"Screener query longer than {MAX_QUERY_LENGTH} characters")
+    return _Parser(text).parse()
+
+
+def referenced_fields(node, table):
+    """Return the table columns an expression reads, in first-use order"""
+    fields = []
+
+    def walk(n):
+        if n and isinstance(n[0], tuple):
+            # The value list of an 'in' node
+            for child in n:
+                walk(child)
+        elif n[0] == "name":
+            column = table.resolve(n[1])
+            if column and column not in fields:
+                fields.append(column)
+        else:
+            for child in n[1:]:
+                if isinstance(child, tuple):
+                    walk(child)
+
+    walk(node)
+    return fields
+
+
+def _evaluate(node, table):
+    """Evaluate a node to (kind, value) with kind one of 'bool', 'num', 'str', 'word'"""
+    op = node[0]
+
+    if op == "number":
+        return "num", node[1]
+    if op == "string":
+        return "str", node[1]
+    if op == "name":
+        column = table.resolve(node[1])
+        if column is None:
+            # Unknown bare words are allowed as string values, e.g. sector in (IT, Pharma)
+            return "word", node[1]
+        return ("str" if column in table.labels else "num"), table.column(column)
+
+    if op in ("and", "or"):
+        left = _as_mask(node[1], table)
+        right = _as_mask(node[2], table)
+        return "bool", (left & right) if op == "and" else (left | right)
+    if op == "not":
+        return "bool", ~_as_mask(node[1], table)
+
+    if op == "neg":
+        return "num", np.negative(_as_number(node[1], table))
+    if op == "arith":
+        left = _as_number(node[2], table)
+        right = _as_number(node[3], table)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return "num", ARITHMETIC[node[1]](left, right)
+
+    if op == "compare":
+        left_kind, left = _evaluate(node[2], table)
+        right_kind, right = _evaluate(node[3], table)
+        # Against a text field a bare name is a value (consensus = Sell), even if it is also a field
+        if left_kind == "str" and node[3][0] == "name":
+            right_kind, right = "word", node[3][1]
+        elif right_kind == "str" and node[2][0] == "name":
+            left_kind, left = "word", node[2][1]
+        if "str" in (left_kind, right_kind) or (left_kind == "word" and right_kind == "word"):
+            if node[1] not in ("=", "==", "!=", "<>"):
+                raise ScreenerQueryError(f"Text fields only support = and != (got {node[1]})")
+            return "bool", COMPARISONS[node[1]](_labels(left, left_kind, node[2], table),
+                                                _labels(right, right_kind, node[3], table))
+        with np.errstate(invalid="ignore"):
+            return "bool", COMPARISONS[node[1]](_number(left, left_kind, node[2]),
+                                                _number(right, right_kind, node[3]))
+
+    if op == "in":
+        kind, left = _evaluate(node[1], table)
+        if kind == "str":
+            options = [value[1] if value[0] in ("name", "string") else str(_evaluate(value, table)[1])
+                       for value in node[2]]
+            return "bool", np.isin(left, options)
+        values = [_evaluate(value, table) for value in node[2]]
+        left = _number(left, kind, node[1])
+        options = np.array([_number(value, value_kind, raw) for (value_kind, value), raw in zip(values, node[2])],
+                           dtype=float)
+        return "bool", np.isin(left, options)
+
+    raise ScreenerQueryError(f"Unsupported expression: {op}")
+
+
+def _unknown(node):
+    return ScreenerQueryError(f"Unknown field {node[1]!r} at position {node[2]}")
+
+
+def _number(value, kind, node):
+    if kind == "num":
+        return value
+    if kind == "word":
+        raise _unknown(node)
+    raise ScreenerQueryError("Cannot use a text or true/false value as a number")
+
+
+def _labels(value, kind, node, table):
+    if kind in ("str", "word"):
+        return value
+    raise ScreenerQueryError("Cannot compare a text field with a number")
+
+
+def _as_number(node, table):
+    kind, value = _evaluate(node, table)
+    return _number(value, kind, node)
+
+
+def _as_mask(node, table):
+    kind, value = _evaluate(node, table)
+    if kind == "word":
+        raise _unknown(node)
+    if kind != "bool":
+        raise ScreenerQueryError("Expected a comparison such as 'ROE > 15'")
+    return value
+
+
+def evaluate_query(text, table):
+    """Return the boolean row mask selected by an expression over a table"""
+    mask = _as_mask(parse_query(text), table)
+    return np.broadcast_to(mask, (len(table),)).copy()
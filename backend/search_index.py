@@ -0,0 +1,175 @@
+"""
+Type-ahead search index for the IndiStockPredictor platform.
+Built once at startup from the stock registry: a prefix trie over symbols and
+name words answers short queries, and a trigram index over symbol and name
+answers substring and fuzzy queries without scanning the whole universe.
+Prefix matches are ranked when the tries are built, so every trie node keeps
+only its best MAX_LIMIT ids and a one-letter query scores at most that many.
+"""
+
+from stock_registry import STOCK_REGISTRY
+
+# Ranking tiers, highest first
+SCORE_EXACT_SYMBOL = 1000
+SCORE_SYMBOL_PREFIX = 800
+SCORE_NAME_WORD_PREFIX = 600
+SCORE_SYMBOL_SUBSTRING = 500
+SCORE_NAME_SUBSTRING = 400
+SCORE_FUZZY = 300
+
+# Fuzzy matches need at least this share of the query's trigrams
+FUZZY_MIN_SIMILARITY = 0.5
+
+# Trigrams present in more than this share of names carry little signal for fuzzy matching
+COMMON_TRIGRAM_SHARE = 0.1
+
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 100
+
+
+def trigrams(text):
+    """Return the set of padded character trigrams of a lowercase string"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def inner_trigrams(text):
+    """Return the unpadded trigrams of a string; any string containing `text` has all of them"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PrefixTrie:
+    """Character trie where every node lists the entry ids stored beneath it"""
+
+    def __init__(self):
+        self.root = {"ids": [], "children": {}}
+
+    def insert(self, key, entry_id):
+        node = self.root
+        for char in key:
+            node = node["children"].setdefault(char, {"ids": [], "children": {}})
+            # Words repeat within a name, so only record an id once per node
+            if not node["ids"] or node["ids"][-1] != entry_id:
+                node["ids"].append(entry_id)
+
+    def rank(self, key, keep):
+        """Order every node's ids by `key` and keep only the first `keep`"""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            node["ids"] = sorted(node["ids"], key=key)[:keep]
+            stack.extend(node["children"].values())
+
+    def lookup(self, prefix):
+        """Return the ranked ids of keys starting with prefix (see rank)"""
+        node = self.root
+        for char in prefix:
+            node = node["children"].get(char)
+            if node is None:
+                return []
+        return node["ids"]
+
+
+class StockSearchIndex:
+    """Ranked symbol and company-name search over a list of stock records"""
+
+    def __init__(self, stocks):
+        self.stocks = list(stocks)
+        self.symbols = [stock["symbol"].lower() for stock in self.stocks]
+        self.names = [stock["name"].lower() for stock in self.stocks]
+        self.symbol_trie = PrefixTrie()
+        self.word_trie = PrefixTrie()
+        self.trigram_index = {}
+
+        for entry_id, (symbol, name) in enumerate(zip(self.symbols, self.names)):
+            self.symbol_trie.insert(symbol, entry_id)
+            for word in name.split():
+                self.word_trie.insert(word, entry_id)
+            for gram in trigrams(symbol) | trigrams(name):
+                self.trigram_index.setdefault(gram, []).append(entry_id)
+
+        # Prefix scores depend only on the entry: shorter symbols first, and
+        # name-word matches all tie, so listing order decides
+        self.symbol_trie.rank(lambda entry_id: (len(self.symbols[entry_id]), entry_id), MAX_LIMIT)
+        self.word_trie.rank(None, MAX_LIMIT)
+
+    def score(self, entry_id, query):
+        """Rank one entry against a lowercase query; 0 means no match"""
+        symbol = self.symbols[entry_id]
+        name = self.names[entry_id]
+
+        if symbol == query:
+            return SCORE_EXACT_SYMBOL
+        if symbol.startswith(query):
+            # Shorter symbols are closer to what was typed
+            return SCORE_SYMBOL_PREFIX - len(symbol)
+        if any(word.startswith(query) for word in name.split()):
+            return SCORE_NAME_WORD_PREFIX
+        if query in symbol:
+            return SCORE_SYMBOL_SUBSTRING
+        if query in name:
+            return SCORE_NAME_SUBSTRING
+        return 0
+
+    def fuzzy_candidates(self, query):
+        """Return {entry_id: similarity} for entries sharing most of the query's trigrams"""
+        grams = [gram for gram in trigrams(query) if gram in self.trigram_index]
+        common = COMMON_TRIGRAM_SHARE * len(self.stocks)
+        informative = [gram for gram in grams if len(self.trigram_index[gram]) <= common] or grams
+        if not informative:
+            return {}
+
+        counts = {}
+        for gram in informative:
+            for entry_id in self.trigram_index[gram]:
+                counts[entry_id] = counts.get(entry_id, 0) + 1
+
+        total = len(trigrams(query)) - (len(grams) - len(informative))
+        return {
+            entry_id: count / total
+            for entry_id, count in counts.items()
+            if count / total >= FUZZY_MIN_SIMILARITY
+        }
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Return up to `limit` stock records ranked by match quality"""
+        query = (query or "").strip().lower()
+        if not query:
+            return []
+        limit = max(1, min(int(limit), MAX_LIMIT))
+
+        # Prefix matches on symbols and name words come straight from the tries, already ranked
+        candidates = set(self.symbol_trie.lookup(query))
+        candidates.update(self.word_trie.lookup(query))
+
+        # Substring matches rank below every prefix match, so they are only needed to fill
+        # the page. They must contain every trigram of the query; padded trigrams only match
+        # at word boundaries, so candidates come from the unpadded ones and score() confirms them.
+        # One- and two-letter queries have no trigrams and only match prefixes.
+        grams = inner_trigrams(query)
+        if len(candidates) < limit and grams:
+            postings = sorted((self.trigram_index.get(gram, []) for gram in grams), key=len)
+            substring = set(postings[0])
+            for posting in postings[1:]:
+                substring.intersection_update(posting)
+                if not substring:
+                    break
+            candidates.update(substring)
+
+        scored = [(self.score(entry_id, query), entry_id) for entry_id in candidates]
+        scored = [(score, entry_id) for score, entry_id in scored if score > 0]
+
+        # Fall back to fuzzy trigram matches when exact matching comes up short
+        if len(scored) < limit and len(query) >= 3:
+            seen = {entry_id for _, entry_id in scored}
+            for entry_id, similarity in self.fuzzy_candidates(query).items():
+                if entry_id not in seen:
+                    scored.append((int(SCORE_FUZZY * similarity), entry_id))
+
+        # Highest score first, listing order breaks ties
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [self.stocks[entry_id] for _, entry_id in scored[:limit]]
+
+
+# Shared index built once at startup
+SEARCH_INDEX = StockSearchIndex(STOCK_REGISTRY.stocks)
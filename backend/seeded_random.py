@@ -0,0 +1,46 @@
+"""
+Deterministic random generators for the IndiStockPredictor platform.
+Every request builds its own generator from a key (for example a symbol and a
+time bucket) instead of reseeding the shared `random` module, so concurrent
+requests under a threaded server never disturb each other and the same key
+always reproduces the same output.
+"""
+
+import hashlib
+import random
+import time
+
+import numpy as np
+
+
+def stable_seed(*parts):
+    """Derive a 64-bit seed from key parts, stable across processes and runs"""
+    key = "|".join(str(part) for part in parts)
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def time_bucket(seconds, now=None):
+    """Return the index of the `seconds`-wide time window containing `now`"""
+    if now is None:
+        now = time.time()
+    return int(now) // seconds
+
+
+def seeded_rng(*parts):
+    """Return a `random.Random` seeded from the given key parts"""
+    return random.Random(stable_seed(*parts))
+
+
+def unseeded_rng():
+    """Return a private `random.Random` seeded from system entropy"""
+    return random.Random()
+
+
+def numpy_rng(rng):
+    """Return a NumPy generator driven by an existing `random.Random`"""
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def seeded_numpy_rng(*parts):
+    """Return a NumPy generator seeded from the given key parts"""
+    return np.random.default_rng(stable_seed(*parts))
@@ -0,0 +1,82 @@
+"""
+Sliding-window sequence builder for the IndiStockPredictor LSTM models.
+Windows are strided views over the scaled feature matrix rather than copies,
+so building sequences costs O(1) memory regardless of history length. For
+very long histories (years of minute bars) the batch generator materializes
+only one chunk of windows at a time.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Windows materialized per chunk in streaming mode
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def sequence_count(n_rows, sequence_length):
+    """Number of (window, next target) pairs available in n_rows of history"""
+    return max(0, n_rows - sequence_length)
+
+
+def sliding_windows(features, sequence_length):
+    """
+    Return a read-only view of shape (n_windows, sequence_length, n_features)
+    where window i covers rows i .. i+sequence_length-1. No data is copied.
+    """
+    features = np.asarray(features)
+    if features.ndim == 1:
+        features = features[:, None]
+    if len(features) < sequence_length:
+        return np.empty((0, sequence_length, features.shape[1]), dtype=features.dtype)
+
+    # sliding_window_view puts the window axis last; move it next to the row axis
+    return sliding_window_view(features, sequence_length, axis=0).transpose(0, 2, 1)
+
+
+def create_sequences(features, targets, sequence_length):
+    """
+    Pair each window with the target of the row that follows it.
+    X is a zero-copy view over `features`; y is a view over `targets`.
+    """
+    features = np.asarray(features)
+    targets = np.asarray(targets)
+    count = sequence_count(len(features), sequence_length)
+
+    X = sliding_windows(features, sequence_length)[:count]
+    y = targets[sequence_length:sequence_length + count]
+    return X, y
+
+
+def iter_sequence_batches(features, targets, sequence_length, chunk_size=DEFAULT_CHUNK_SIZE, shuffle=False, rng=None):
+    """
+    Yield (X_chunk, y_chunk) pairs of at most chunk_size sequences.
+    Each chunk is a contiguous copy so it can be handed to a model directly,
+    while memory stays bounded by one chunk. With shuffle=True the chunk order
+    is randomized; windows inside a chunk keep their time order.
+    """
+    X, y = create_sequences(features, targets, sequence_length)
+    starts = np.arange(0, len(X), chunk_size)
+    if shuffle:
+        rng = rng if rng is not None else np.random.default_rng()
+        rng.shuffle(starts)
+
+    for start in starts:
+        end = start + chunk_size
+        yield np.ascontiguousarray(X[start:end]), np.ascontiguousarray(y[start:end])
+
+
+def create_multi_horizon_sequences(features, targets, sequence_length, horizon):
+    """
+    Pair each window with the next `horizon` targets for direct multi-step models.
+    Returns X of shape (n, sequence_length, n_features) and Y of shape (n, horizon),
+    both views over the inputs.
+    """
+    features = np.asarray(features)
+    targets = np.asarray(targets)
+    count = max(0, len(features) - sequence_length - horizon + 1)
+
+    X = sliding_windows(features, sequence_length)[:count]
+    if count == 0:
+        return X, np.empty((0, horizon), dtype=targets.dtype)
+    Y = sliding_window_view(targets, horizon)[sequence_length:sequence_length + count]
+    return X, Y
@@ -0,0 +1,131 @@
+"""
+Symbol registry for the IndiStockPredictor platform.
+Holds the listed stock universe and hash indexes over it so that handlers can
+resolve a symbol, sector, industry or exchange without scanning the full list.
+"""
+
+# Expanded list of Indian stocks for more comprehensive database
+INDIAN_STOCKS = [
+    {"symbol": "RELIANCE", "name": "Reliance Industries Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Oil & Gas", "description": "India's largest private sector company with businesses in energy, petrochemicals, textiles, retail, and telecommunications."},
+    {"symbol": "TCS", "name": "Tata Consultancy Services Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "India's largest IT services company offering consulting and business solutions globally."},
+    {"symbol": "HDFCBANK", "name": "HDFC Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "India's largest private sector bank by assets offering a wide range of banking products and financial services."},
+    {"symbol": "INFY", "name": "Infosys Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "A global leader in next-generation digital services and consulting, enabling clients to navigate digital transformation."},
+    {"symbol": "HINDUNILVR", "name": "Hindustan Unilever Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Consumer Goods", "description": "India's largest fast-moving consumer goods company with products in home care, beauty & personal care, and foods & refreshment."},
+    {"symbol": "ICICIBANK", "name": "ICICI Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "Second largest private sector bank in India offering a wide range of banking products and financial services."},
+    {"symbol": "SBIN", "name": "State Bank of India", "sector": "Banking", "exchange": "NSE", "industry": "Public Banking", "description": "India's largest public sector bank offering a wide range of banking products and services."},
+    {"symbol": "BAJFINANCE", "name": "Bajaj Finance Ltd.", "sector": "Finance", "exchange": "NSE", "industry": "NBFC", "description": "One of India's leading non-banking financial companies (NBFC) with diversified lending products."},
+    {"symbol": "BHARTIARTL", "name": "Bharti Airtel Ltd.", "sector": "Telecom", "exchange": "NSE", "industry": "Telecommunications", "description": "One of India's leading telecommunications service providers with operations in 18 countries."},
+    {"symbol": "ITC", "name": "ITC Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Diversified", "description": "Multi-business conglomerate with diversified presence in FMCG, hotels, paperboards & packaging, agri business & IT."},
+    {"symbol": "KOTAKBANK", "name": "Kotak Mahindra Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "One of India's leading private sector banks offering banking and financial services."},
+    {"symbol": "LT", "name": "Larsen & Toubro Ltd.", "sector": "Construction", "exchange": "NSE", "industry": "Engineering & Construction", "description": "India's largest construction company and a leading technology, engineering, construction, manufacturing and financial services conglomerate."},
+    {"symbol": "ASIANPAINT", "name": "Asian Paints Ltd.", "sector": "Consumer Goods", "exchange": "NSE", "industry": "Paints", "description": "India's leading paint company and ranked among the top decorative paints companies in the world."},
+    {"symbol": "MARUTI", "name": "Maruti Suzuki India Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Passenger Vehicles", "description": "India's largest passenger car manufacturer with more than 50% market share in the Indian passenger car market."},
+    {"symbol": "AXISBANK", "name": "Axis Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "Third largest private sector bank in India offering a wide range of banking products and financial services."},
+    {"symbol": "WIPRO", "name": "Wipro Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "Global information technology, consulting and business process services company providing solutions to enable clients do business better."},
+    {"symbol": "HCLTECH", "name": "HCL Technologies Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "Global technology company that helps enterprises reimagine their businesses for the digital age."},
+    {"symbol": "SUNPHARMA", "name": "Sun Pharmaceutical Industries Ltd.", "sector": "Pharma", "exchange": "NSE", "industry": "Pharmaceuticals", "description": "India's largest pharmaceutical company and the fifth largest specialty generic company globally."},
+    {"symbol": "TATASTEEL", "name": "Tata Steel Ltd.", "sector": "Metal", "exchange": "NSE", "industry": "Steel", "description": "Among the top global steel companies with an annual crude steel capacity of 34 million tonnes per annum."},
+    {"symbol": "ONGC", "name": "Oil & Natural Gas Corporation Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Oil & Gas", "description": "India's largest government-owned oil and gas corporation contributing 70% to India's domestic production."},
+    {"symbol": "TATAMOTORS", "name": "Tata Motors Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Automotive", "description": "India's largest automobile company, also owning the Jaguar Land Rover (JLR) brand."},
+    {"symbol": "NTPC", "name": "NTPC Ltd.", "sector": "Power", "exchange": "NSE", "industry": "Power Generation", "description": "India's largest power generation company with a power generating capacity of 65,810 MW."},
+    {"symbol": "BAJAJFINSV", "name": "Bajaj Finserv Ltd.", "sector": "Finance", "exchange": "NSE", "industry": "Financial Services", "description": "Holding company for Bajaj Finance, Bajaj Allianz General Insurance and Bajaj Allianz Life Insurance."},
+    {"symbol": "BAJAJ-AUTO", "name": "Bajaj Auto Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Two-wheelers", "description": "World's fourth largest two and three-wheeler manufacturer with presence in over 70 countries."},
+    {"symbol": "TITAN", "name": "Titan Company Ltd.", "sector": "Consumer Goods", "exchange": "NSE", "industry": "Watches & Jewelry", "description": "Leading manufacturer of watches, jewelry, and eyewear in India with brands like Tanishq, Titan, Fastrack, etc."},
+    {"symbol": "ADANIENT", "name": "Adani Enterprises Ltd.", "sector": "Diversified", "exchange": "NSE", "industry": "Infrastructure", "description": "Flagship company of the Adani Group with interests in resources, logistics, energy and agro."},
+    {"symbol": "ADANIPORTS", "name": "Adani Ports and Special Economic Zone Ltd.", "sector": "Infrastructure", "exchange": "NSE", "industry": "Ports", "description": "India's largest private port operator with ports across the eastern and western coasts of India."},
+    {"symbol": "ADANIPOWER", "name": "Adani Power Ltd.", "sector": "Power", "exchange": "NSE", "industry": "Power Generation", "description": "India's largest private thermal power producer with capacity of 12,450 MW."},
+    {"symbol": "ADANIGREEN", "name": "Adani Green Energy Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Renewable Energy", "description": "One of the largest renewable energy companies in India with a renewable portfolio of 14,795 MW."},
+    {"symbol": "ULTRACEMCO", "name": "UltraTech Cement Ltd.", "sector": "Cement", "exchange": "NSE", "industry": "Cement", "description": "India's largest cement company and the world's third-largest cement company with annual capacity of 116.75 MTPA."},
+    {"symbol": "JSWSTEEL", "name": "JSW Steel Ltd.", "sector": "Metal", "exchange": "NSE", "industry": "Steel", "description": "India's leading integrated steel manufacturer with 18 MTPA capacity."},
+    {"symbol": "TECHM", "name": "Tech Mahindra Ltd.", "sector": "IT", "exchange": "NSE", "industry": "Software", "description": "Fifth largest IT services company in India offering technology services and solutions."},
+    {"symbol": "NESTLEIND", "name": "Nestle India Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Food Processing", "description": "Leading food and beverage company in India with popular brands like Maggi, Nescafe, KitKat, etc."},
+    {"symbol": "DIVISLAB", "name": "Divi's Laboratories Ltd.", "sector": "Pharma", "exchange": "NSE", "industry": "Pharmaceuticals", "description": "India's leading pharmaceutical company manufacturing active pharmaceutical ingredients."},
+    {"symbol": "CIPLA", "name": "Cipla Ltd.", "sector": "Pharma", "exchange": "NSE", "industry": "Pharmaceuticals", "description": "Global pharmaceutical company with a portfolio in respiratory, antiretroviral, urology, cardiology, and anti-infective segments."},
+    {"symbol": "DRREDDY", "name": "Dr. Reddy's Laboratories Ltd.", "sector": "Pharma", "exchange": "NSE", "industry": "Pharmaceuticals", "description": "Leading Indian pharmaceutical company with presence in over 20 countries and offering a wide range of medicines."},
+    {"symbol": "SHREECEM", "name": "Shree Cement Ltd.", "sector": "Cement", "exchange": "NSE", "industry": "Cement", "description": "One of India's largest cement manufacturers with an installed capacity of 43.40 MTPA."},
+    {"symbol": "COALINDIA", "name": "Coal India Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Mining & Minerals", "description": "World's largest coal producer and contributes to around 83% of India's coal production."},
+    {"symbol": "GRASIM", "name": "Grasim Industries Ltd.", "sector": "Diversified", "exchange": "NSE", "industry": "Textiles & Chemicals", "description": "Flagship company of the Aditya Birla Group with businesses in viscose staple fiber, chemicals, and cement."},
+    {"symbol": "PIDILITIND", "name": "Pidilite Industries Ltd.", "sector": "Chemicals", "exchange": "NSE", "industry": "Adhesives", "description": "India's leading manufacturer of adhesives, sealants, and construction chemicals with brands like Fevicol, Dr. Fixit, etc."},
+    {"symbol": "INDUSINDBK", "name": "IndusInd Bank Ltd.", "sector": "Banking", "exchange": "NSE", "industry": "Private Banking", "description": "New-generation Indian bank serving the retail and corporate banking sectors."},
+    {"symbol": "M&M", "name": "Mahindra & Mahindra Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Automotive", "description": "Leading manufacturer of utility vehicles, tractors, and information technology services."},
+    {"symbol": "BRITANNIA", "name": "Britannia Industries Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Food Products", "description": "India's leading food company with popular biscuit brands and a growing presence in dairy and bakery products."},
+    {"symbol": "HEROMOTOCO", "name": "Hero MotoCorp Ltd.", "sector": "Automobile", "exchange": "NSE", "industry": "Two-wheelers", "description": "World's largest manufacturer of two-wheelers with more than 50% market share in the Indian two-wheeler market."},
+    {"symbol": "ZEEL", "name": "Zee Entertainment Enterprises Ltd.", "sector": "Media", "exchange": "NSE", "industry": "Media & Entertainment", "description": "One of India's largest media and entertainment companies with presence in television, digital content, and live entertainment."},
+    {"symbol": "BPCL", "name": "Bharat Petroleum Corporation Ltd.", "sector": "Energy", "exchange": "NSE", "industry": "Oil & Gas", "description": "Second largest downstream oil company in India and one of the Fortune Global 500 companies."},
+    {"symbol": "HDFCLIFE", "name": "HDFC Life Insurance Company Ltd.", "sector": "Insurance", "exchange": "NSE", "industry": "Life Insurance", "description": "One of India's leading private life insurance companies offering a range of insurance products."},
+    {"symbol": "SBILIFE", "name": "SBI Life Insurance Company Ltd.", "sector": "Insurance", "exchange": "NSE", "industry": "Life Insurance", "description": "Joint venture between State Bank of India and BNP Paribas Cardif offering a range of life insurance products."},
+    {"symbol": "DABUR", "name": "Dabur India Ltd.", "sector": "FMCG", "exchange": "NSE", "industry": "Consumer Goods", "description": "Fourth largest FMCG company in India with a portfolio of over 250 herbal/ayurvedic products."}
+]
+
+
+class StockRegistry:
+    """Stock universe indexed by symbol, sector, industry and exchange"""
+
+    INDEXED_FIELDS = ("sector", "industry", "exchange")
+
+    def __init__(self, stocks):
+        self.stocks = list(stocks)
+        self.by_symbol = {}
+        self.indexes = {field: {} for field in self.INDEXED_FIELDS}
+
+        # Build every index in a single pass over the universe
+        for stock in self.stocks:
+            self.by_symbol[stock["symbol"]] = stock
+            for field in self.INDEXED_FIELDS:
+                value = stock.get(field)
+                if value is not None:
+                    self.indexes[field].setdefault(value, []).append(stock)
+
+    def __len__(self):
+        return len(self.stocks)
+
+    def __contains__(self, symbol):
+        return symbol in self.by_symbol
+
+    def get(self, symbol):
+        """Return the stock record for a symbol, or None if it is not listed"""
+        if not symbol:
+            return None
+        return self.by_symbol.get(symbol)
+
+    def get_many(self, symbols):
+        """Return the records for the listed symbols, skipping unknown ones"""
+        return [self.by_symbol[s] for s in symbols if s in self.by_symbol]
+
+    def by_sector(self, sector):
+        return list(self.indexes["sector"].get(sector, []))
+
+    def by_industry(self, industry):
+        return list(self.indexes["industry"].get(industry, []))
+
+    def by_exchange(self, exchange):
+        return list(self.indexes["exchange"].get(exchange, []))
+
+    def values(self, field):
+        """Return the distinct values of an indexed field, e.g. all sectors"""
+        return sorted(self.indexes[field].keys())
+
+    def filter(self, sector=None, industry=None, exchange=None):
+        """
+        Return stocks matching every given criterion, preserving listing order.
+        Starts from the smallest matching bucket and checks the rest per record.
+        """
+        criteria = {
+            field: value
+            for field, value in (("sector", sector), ("industry", industry), ("exchange", exchange))
+            if value
+        }
+        if not criteria:
+            return list(self.stocks)
+
+        buckets = [self.indexes[field].get(value, []) for field, value in criteria.items()]
+        smallest = min(buckets, key=len)
+
+        return [
+            stock for stock in smallest
+            if all(stock.get(field) == value for field, value in criteria.items())
+        ]
+
+
+# Shared registry built once at import
+STOCK_REGISTRY = StockRegistry(INDIAN_STOCKS)
@@ -0,0 +1,292 @@
+"""
+Technical analysis data for the IndiStockPredictor platform.
+Indicators are computed from each symbol's daily price history with the
+vectorized indicator engine, for the whole universe in one pass. The result
+is built once per daily bar close and served from memory, so the technical
+endpoint only does a dictionary lookup per request. Simulated symbols use the
+same day-seeded series as /historical, so the card matches the chart, and the
+default card is the NIFTY 50 index at the level /api/market/indices reports.
+"""
+
+import threading
+from datetime import datetime
+
+import numpy as np
+
+import indicators
+from market_data import get_market_snapshot
+from ohlcv_store import PRICE_STORE
+from price_engine import PriceHistory, daily_price_history, simulate_price_paths, trading_dates
+from seeded_random import seeded_numpy_rng, time_bucket
+from stock_registry import STOCK_REGISTRY
+
+# Daily bars: the universe is recomputed once per bar close
+TECHNICAL_BAR_SECONDS = 86400
+
+# Enough history for the 200-day moving average plus a margin for crossovers
+TECHNICAL_HISTORY_DAYS = 260
+
+MA_PERIODS = (5, 10, 20, 50, 100, 200)
+PIVOT_DAYS = 20  # Range used for pivot-point support and resistance levels
+VOLUME_AVERAGE_DAYS = 20
+CROSSOVER_LOOKBACK = 10  # Bars searched for recent moving-average crossovers
+
+# Symbol used for the default (index-level) technical card, and the market index it tracks
+DEFAULT_TECHNICAL_SYMBOL = "NIFTY"
+DEFAULT_TECHNICAL_INDEX = "NIFTY 50"
+
+# Indices are not in the stock registry, so their simulated paths use fixed
+# index-like parameters instead of the per-symbol ones
+INDEX_VOLATILITY = 0.01
+INDEX_VOLUME = 200000
+
+_technical_lock = threading.Lock()
+_technical = {"bar": None, "data": None, "computedAt": None}
+
+
+def _round(value, digits=2):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def _stack(histories, symbols, field):
+    return np.vstack([getattr(histories[symbol], field) for symbol in symbols])
+
+
+def _crossed(fast, slow):
+    """Per symbol: +1 if fast crossed above slow within the lookback, -1 if below, else 0"""
+    diff = np.sign(fast[:, -(CROSSOVER_LOOKBACK + 1):] - slow[:, -(CROSSOVER_LOOKBACK + 1):])
+    changes = np.diff(diff, axis=1)
+    up = np.any(changes > 0, axis=1)
+    down = np.any(changes < 0, axis=1)
+    return np.where(up & ~down, 1, np.where(down & ~up, -1, 0))
+
+
+def compute_technical_snapshots(symbols, histories):
+    """
+    Compute the technical card for many symbols at once from equal-length
+    PriceHistory objects. Returns {symbol: {"currentPrice", "indicators", "signals"}}.
+    """
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+
+    high = _stack(histories, symbols, "high")
+    low = _stack(histories, symbols, "low")
+    close = _stack(histories, symbols, "close")
+    volume = _stack(histories, symbols, "volume")
+
+    batch = indicators.compute_indicators(high, low, close)
+    mas = {period: indicators.sma(close, period) for period in MA_PERIODS}
+    volume_avg = indicators.sma(volume, VOLUME_AVERAGE_DAYS)
+    golden_cross = _crossed(mas[50], mas[200])
+    macd_cross = _crossed(batch["macd"], batch["macdSignal"])
+
+    # Classic pivot points over the recent range give three levels on each side
+    range_high = high[:, -PIVOT_DAYS:].max(axis=1)
+    range_low = low[:, -PIVOT_DAYS:].min(axis=1)
+    pivot = (range_high + range_low + close[:, -1]) / 3
+    span = range_high - range_low
+    supports = np.column_stack([2 * pivot - range_high, pivot - span, range_low - 2 * (range_high - pivot)])
+    resistances = np.column_stack([2 * pivot - range_low, pivot + span, range_high + 2 * (pivot - range_low)])
+    year_high = high.max(axis=1)
+    year_low = low.min(axis=1)
+
+    snapshots = {}
+    for i, symbol in enumerate(symbols):
+        price = close[i, -1]
+
+        ma_values = {period: _round(mas[period][i, -1]) for period in MA_PERIODS}
+        ma_status = {
+            f"MA{period}": "Bullish" if value is not None and price > value else "Bearish"
+            for period, value in ma_values.items()
+        }
+        bullish_count = sum(1 for status in ma_status.values() if status == "Bullish")
+        ma_overall = "Bullish" if bullish_count > len(ma_status) - bullish_count else "Bearish"
+
+        macd_value = batch["macd"][i, -1]
+        macd_signal = batch["macdSignal"][i, -1]
+        macd_histogram = batch["macdHistogram"][i, -1]
+
+        rsi = batch["rsi14"][i, -1]
+
+        upper = batch["bollingerUpper"][i, -1]
+        middle = batch["bollingerMiddle"][i, -1]
+        lower = batch["bollingerLower"][i, -1]
+        band = upper - lower
+        percent_b = (price - lower) / band * 100 if band > 0 else 50.0
+
+        current_volume = volume[i, -1]
+        average_volume = volume_avg[i, -1]
+        volume_change = (current_volume - average_volume) / average_volume * 100 if average_volume else 0.0
+
+        # Nearest levels first
+        support_levels = [_round(v) for v in supports[i]]
+        resistance_levels = [_round(v) for v in resistances[i]]
+
+        patterns = []
+        if golden_cross[i] != 0:
+            patterns.append({
+                "name": "Golden Cross" if golden_cross[i] > 0 else "Death Cross",
+                "signal": "Bullish" if golden_cross[i] > 0 else "Bearish",
+                "strength": 4,
+                "timeframe": "Daily"
+            })
+        if macd_cross[i] != 0:
+            patterns.append({
+                "name": "MACD Signal Cross",
+                "signal": "Bullish" if macd_cross[i] > 0 else "Bearish",
+                "strength": 3,
+                "timeframe": "Daily"
+            })
+        if price >= range_high[i]:
+            patterns.append({"name": "Breakout", "signal": "Bullish", "strength": 3, "timeframe": "Daily"})
+        elif price <= range_low[i]:
+            patterns.append({"name": "Breakdown", "signal": "Bearish", "strength": 3, "timeframe": "Daily"})
+        if price >= year_high[i] * 0.98:
+            patterns.append({"name": "Near 52-Week High", "signal": "Bullish", "strength": 2, "timeframe": "Yearly"})
+        elif price <= year_low[i] * 1.02:
+            patterns.append({"name": "Near 52-Week Low", "signal": "Bearish", "strength": 2, "timeframe": "Yearly"})
+
+        # Count bullish readings across indicators to grade overall momentum
+        bullish_signals = sum([
+            ma_overall == "Bullish",
+            macd_histogram > 0,
+            rsi > 50,
+            percent_b > 50,
+            volume_change > 0 and price >= close[i, -2],
+        ])
+
+        snapshots[symbol] = {
+            "currentPrice": _round(price),
+            "indicators": {
+                "macd": {
+                    "value": _round(macd_value),
+                    "signal": _round(macd_signal),
+                    "histogram": _round(macd_histogram),
+                    "trend": "Bullish Crossover" if macd_histogram > 0 and macd_value > 0 else
+                             "Bearish Crossover" if macd_histogram < 0 and macd_value < 0 else
+                             "Bullish Divergence" if macd_histogram > 0 and macd_value < 0 else
+                             "Bearish Divergence"
+                },
+                "rsi": {
+                    "value": round(float(rsi)),
+                    "interpretation": "Oversold" if rsi < 30 else
+                                      "Overbought" if rsi > 70 else
+                                      "Neutral"
+                },
+                "movingAverages": {
+                    "values": ma_values,
+                    "status": ma_status,
+                    "overall": ma_overall
+                },
+                "bollingerBands": {
+                    "upper": _round(upper),
+                    "middle": _round(middle),
+                    "lower": _round(lower),
+                    "width": _round(band / middle * 100) if middle else 0.0,
+                    "percentB": _round(percent_b, 1)
+                },
+                "atr": _round(batch["atr14"][i, -1]),
+                "volume": {
+                    "current": int(round(current_volume)),
+                    "average": int(round(average_volume)),
+                    "change": _round(volume_change),
+                    "trend": "Increasing" if volume_change > 5 else
+                             "Decreasing" if volume_change < -5 else
+                             "Stable"
+                },
+                "supportResistance": {
+                    "support": support_levels,
+                    "resistance": resistance_levels,
+                    "nearestSupport": support_levels[0],
+                    "nearestResistance": resistance_levels[0]
+                },
+                "patterns": patterns
+            },
+            "signals": {
+                "bullish": bullish_signals >= 3,
+                "strength": bullish_signals if bullish_signals >= 3 else 5 - bullish_signals
+            }
+        }
+
+    return snapshots
+
+
+def index_level(index_symbol):
+    """Current level of a market index from the market snapshot"""
+    return next(index["price"] for index in get_market_snapshot()["indices"] if index["symbol"] == index_symbol)
+
+
+def simulate_index_history(symbol, level, days, day, end_date=None):
+    """Simulate a day-seeded index history scaled so its last close equals `level`"""
+    paths = simulate_price_paths([level], [INDEX_VOLATILITY], [INDEX_VOLUME], days,
+                                 rng=seeded_numpy_rng("history", symbol, day))
+    scale = level / paths["close"][0, -1]
+    return PriceHistory(symbol, trading_dates(days, end_date), *(
+        paths[field][0] * (1.0 if field == "volume" else scale) for field in PriceHistory.FIELDS
+    ))
+
+
+def generate_technical_universe(bar, end_date=None):
+    """Load or simulate the bar's daily histories and compute technicals for every listed symbol"""
+    symbols = [stock["symbol"] for stock in STOCK_REGISTRY.stocks] + [DEFAULT_TECHNICAL_SYMBOL]
+    histories = {}
+
+    # Prefer real stored bars for symbols with enough history in the OHLCV store
+    for symbol in symbols:
+        if PRICE_STORE.length(symbol) >= TECHNICAL_HISTORY_DAYS:
+            histories[symbol] = PRICE_STORE.tail(symbol, TECHNICAL_HISTORY_DAYS)
+        elif symbol == DEFAULT_TECHNICAL_SYMBOL:
+            histories[symbol] = simulate_index_history(
+                DEFAULT_TECHNICAL_INDEX, index_level(DEFAULT_TECHNICAL_INDEX), TECHNICAL_HISTORY_DAYS, bar, end_date
+            )
+        else:
+            histories[symbol] = daily_price_history(symbol, TECHNICAL_HISTORY_DAYS, bar, end_date)
+
+    return compute_technical_snapshots(symbols, histories)
+
+
+def get_technical_snapshot(symbol, now=None):
+    """
+    Return the precomputed technical card for a symbol (None if unknown).
+    The whole universe is computed on the first request after each bar close.
+    """
+    bar = time_bucket(TECHNICAL_BAR_SECONDS, now)
+    with _technical_lock:
+        if _technical["bar"] != bar:
+            _technical["data"] = generate_technical_universe(bar)
+            _technical["bar"] = bar
+            _technical["computedAt"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        snapshot = _technical["data"].get(symbol)
+        return dict(snapshot, lastUpdated=_technical["computedAt"]) if snapshot else None
+
+
+def technical_summary(name, snapshot):
+    """Describe a technical card in one paragraph"""
+    tech = snapshot["indicators"]
+    strength_words = ["weak", "moderate", "strong", "very strong", "extremely strong"]
+    momentum_direction = "bullish" if snapshot["signals"]["bullish"] else "bearish"
+    momentum_strength = strength_words[min(4, max(0, snapshot["signals"]["strength"] - 1))]
+    rsi = tech["rsi"]["value"]
+
+    summary = f"{name} is showing {momentum_strength} {momentum_direction} momentum on the technical indicators. "
+
+    if rsi < 30:
+        summary += f"RSI at {rsi} indicates oversold conditions that may lead to a potential reversal. "
+    elif rsi > 70:
+        summary += f"RSI at {rsi} shows overbought conditions that might signal caution. "
+    else:
+        summary += f"RSI at {rsi} is in a neutral zone. "
+
+    summary += f"MACD is showing a {tech['macd']['trend'].lower()}, "
+    summary += f"and moving averages are overall {tech['movingAverages']['overall'].lower()}. "
+
+    percent_b = tech["bollingerBands"]["percentB"]
+    if percent_b < 20:
+        summary += "Price is near the lower Bollinger Band, suggesting potential oversold conditions."
+    elif percent_b > 80:
+        summary += "Price is near the upper Bollinger Band, indicating potential overbought territory."
+    else:
+        summary += "Price is within the Bollinger Bands, showing moderate volatility."
+
+    return summary
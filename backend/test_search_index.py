@@ -0,0 +1,73 @@
+"""
+Regression tests for the type-ahead search index.
+Every query of three or more characters must find at least the stocks the
+original linear scan (`query in symbol or query in name`) found, including
+substrings in the middle of a word. Shorter queries only match prefixes.
+"""
+
+import pytest
+
+from search_index import SEARCH_INDEX, MAX_LIMIT, StockSearchIndex
+from stock_registry import STOCK_REGISTRY
+
+
+def linear_matches(query):
+    query = query.lower()
+    return {
+        stock["symbol"] for stock in STOCK_REGISTRY.stocks
+        if query in stock["symbol"].lower() or query in stock["name"].lower()
+    }
+
+
+def prefix_matches(query):
+    query = query.lower()
+    return {
+        stock["symbol"] for stock in STOCK_REGISTRY.stocks
+        if stock["symbol"].lower().startswith(query)
+        or any(word.startswith(query) for word in stock["name"].lower().split())
+    }
+
+
+def search_symbols(query):
+    return {stock["symbol"] for stock in SEARCH_INDEX.search(query, MAX_LIMIT)}
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("ank", {"HDFCBANK", "ICICIBANK", "SBIN", "KOTAKBANK", "AXISBANK", "INDUSINDBK"}),
+    ("ndustr", {"RELIANCE", "SUNPHARMA", "GRASIM", "PIDILITIND", "BRITANNIA"}),
+])
+def test_mid_word_substrings(query, expected):
+    assert expected <= search_symbols(query)
+
+
+@pytest.mark.parametrize("query", ["ank", "ndustr", "nfy", "otor", "ilev", "tata", "bank"])
+def test_finds_everything_the_linear_scan_finds(query):
+    assert linear_matches(query) <= search_symbols(query)
+
+
+@pytest.mark.parametrize("query", ["in", "a", "t", "&m"])
+def test_short_queries_match_prefixes(query):
+    assert search_symbols(query) == prefix_matches(query)
+
+
+def test_every_registry_substring():
+    for stock in STOCK_REGISTRY.stocks:
+        for text in (stock["symbol"].lower(), stock["name"].lower()):
+            for start in range(len(text) - 2):
+                query = text[start:start + 4].strip()
+                if len(query) >= 3:
+                    assert linear_matches(query) <= search_symbols(query), query
+
+
+def test_exact_symbol_ranks_first():
+    assert SEARCH_INDEX.search("TCS")[0]["symbol"] == "TCS"
+
+
+def test_prefix_ranking_survives_trimmed_trie_nodes():
+    # Far more prefix matches than a trie node keeps
+    stocks = [{"symbol": f"A{i:05d}", "name": f"Alpha {i} Ltd"} for i in range(MAX_LIMIT * 5)]
+    stocks.append({"symbol": "AB", "name": "Beta Corp"})
+    index = StockSearchIndex(stocks)
+    results = [stock["symbol"] for stock in index.search("a", MAX_LIMIT)]
+    assert results[0] == "AB"
+    assert results[1:] == [f"A{i:05d}" for i in range(MAX_LIMIT - 1)]
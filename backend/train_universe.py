@@ -0,0 +1,225 @@
+"""
+IndiStockPredictor - Universe Training Driver
+
+Retrains StockPredictor models for many symbols in parallel. Each symbol is
+trained in its own worker process (prepare_data, Random Forest, LSTM,
+evaluate) and saved to the model registry. Workers are started with capped
+BLAS/TensorFlow thread pools so N workers use N * threads cores instead of
+oversubscribing the machine, and a failing symbol is reported without
+stopping the rest of the run.
+
+Usage: python train_universe.py [--symbols TCS,INFY] [--sector IT] [--workers 8]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from model_registry import ModelRegistry, MODEL_DIR
+from stock_registry import STOCK_REGISTRY
+
+# Environment variables that size the native thread pools of NumPy/sklearn/TensorFlow
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+    "TF_NUM_INTEROP_THREADS",
+)
+
+
+def default_workers(threads_per_worker=1):
+    """One worker per `threads_per_worker` cores, at least one"""
+    return max(1, (os.cpu_count() or 1) // max(1, threads_per_worker))
+
+
+def init_worker(threads_per_worker):
+    """
+    Process initializer: cap native thread pools before the ML libraries load.
+    Workers are spawned fresh, so these settings take effect on first import.
+    """
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads_per_worker)
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+    try:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(threads_per_worker)
+        tf.config.threading.set_inter_op_parallelism_threads(threads_per_worker)
+    except Exception:
+        # Thread limits are best-effort; TensorFlow may be missing or already initialized
+        pass
+
+
+def train_symbol(symbol, days=1000, epochs=50, save=True, registry_root=MODEL_DIR, store_root=None):
+    """
+    Train, evaluate and optionally save the models for one symbol.
+    Never raises: failures are returned as a result with status 'failed'.
+    """
+    started = time.time()
+    try:
+        from prediction_demo import StockPredictor, generate_symbol_data
+
+        df = generate_symbol_data(symbol, days, store_root)
+        predictor = StockPredictor()
+        data = predictor.prepare_data(df)
+
+        predictor.train_random_forest(data['rf'][0], data['rf'][1])
+        predictor.train_lstm(data['lstm'][0], data['lstm'][1], epochs=epochs, verbose=0)
+
+        predictions = predictor.ensemble_predict(data['rf'][2], data['lstm'][2])
+        evaluation = predictor.evaluate(data['y_test_orig'], predictions)
+        metrics = {
+            model_name: {metric: float(value) for metric, value in values.items()}
+            for model_name, values in evaluation.items()
+        }
+
+        version = None
+        if save:
+            version = ModelRegistry(registry_root).save(
+                symbol, predictor, metrics=evaluation, train_rows=len(data['rf'][0])
+            )
+
+        return {
+            "symbol": symbol,
+            "status": "ok",
+            "version": version,
+            "metrics": metrics,
+            "seconds": round(time.time() - started, 2)
+        }
+    except Exception as e:
+        return {
+            "symbol": symbol,
+            "status": "failed",
+            "error": f"{type(e).__name__}: {str(e)}",
+            "traceback": traceback.format_exc(),
+            "seconds": round(time.time() - started, 2)
+        }
+
+
+def format_progress(done, total, result):
+    """One progress line per finished symbol"""
+    prefix = f"[{done}/{total}] {result['symbol']}"
+    if result["status"] != "ok":
+        return f"{prefix} FAILED after {result['seconds']}s: {result['error']}"
+
+    rmse = result["metrics"].get("ensemble", {}).get("RMSE")
+    saved = f", saved v{result['version']}" if result.get("version") else ""
+    return f"{prefix} ok in {result['seconds']}s (ensemble RMSE {rmse:.2f}{saved})"
+
+
+def _run_pool(symbols, workers, threads_per_worker, task_args, on_result):
+    """
+    Train symbols on one process pool. Returns the symbols whose worker died
+    before returning a result, so the caller can retry them in isolation.
+    """
+    broken = []
+
+    # Spawn (not fork) so every worker starts clean and picks up the thread limits
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(symbols))),
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(threads_per_worker,)
+    ) as pool:
+        futures = {pool.submit(train_symbol, symbol, *task_args): symbol for symbol in symbols}
+
+        for future in as_completed(futures):
+            try:
+                on_result(future.result())
+            except BrokenProcessPool:
+                broken.append(futures[future])
+
+    return broken
+
+
+def train_universe(symbols, workers=None, threads_per_worker=1, days=1000, epochs=50,
+                   save=True, registry_root=MODEL_DIR, store_root=None, progress=print):
+    """
+    Train every symbol across a process pool and return the per-symbol results
+    in completion order. Exceptions inside a symbol's training are reported as
+    failures; if a worker process dies outright (e.g. out of memory), the
+    symbols caught in the broken pool are retried one per process so only the
+    culprit fails.
+    """
+    symbols = list(symbols)
+    workers = workers or default_workers(threads_per_worker)
+    task_args = (days, epochs, save, registry_root, store_root)
+    results = []
+
+    def on_result(result):
+        results.append(result)
+        if progress:
+            progress(format_progress(len(results), len(symbols), result))
+
+    broken = _run_pool(symbols, workers, threads_per_worker, task_args, on_result) if symbols else []
+
+    for symbol in broken:
+        if _run_pool([symbol], 1, threads_per_worker, task_args, on_result):
+            on_result({
+                "symbol": symbol,
+                "status": "failed",
+                "error": "Worker process terminated abruptly",
+                "seconds": 0.0
+            })
+
+    return results
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Train StockPredictor models for a universe of symbols")
+    parser.add_argument("--symbols", help="Comma-separated symbols (default: whole registry)")
+    parser.add_argument("--sector", help="Only train symbols from this sector")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: cores / threads-per-worker)")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="Native threads per worker")
+    parser.add_argument("--days", type=int, default=1000, help="Days of history per symbol")
+    parser.add_argument("--epochs", type=int, default=50, help="LSTM training epochs")
+    parser.add_argument("--no-save", action="store_true", help="Evaluate only, do not save models")
+    parser.add_argument("--registry", default=MODEL_DIR, help="Model registry directory")
+    parser.add_argument("--store", help="OHLCV store directory to read histories from (default: simulate)")
+    args = parser.parse_args()
+
+    if args.symbols:
+        symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    else:
+        symbols = [stock["symbol"] for stock in STOCK_REGISTRY.filter(sector=args.sector)]
+
+    if not symbols:
+        print("No symbols to train")
+        return 1
+
+    workers = args.workers or default_workers(args.threads_per_worker)
+    print(f"\nTraining {len(symbols)} symbols on {workers} workers x {args.threads_per_worker} threads")
+    print("=" * 50)
+
+    started = time.time()
+    results = train_universe(
+        symbols,
+        workers=workers,
+        threads_per_worker=args.threads_per_worker,
+        days=args.days,
+        epochs=args.epochs,
+        save=not args.no_save,
+        registry_root=args.registry,
+        store_root=args.store
+    )
+
+    failed = [r for r in results if r["status"] != "ok"]
+    print("=" * 50)
+    print(f"Trained {len(results) - len(failed)}/{len(results)} symbols in {time.time() - started:.1f}s")
+    for result in failed:
+        print(f"  {result['symbol']}: {result['error']}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,35 +27,31 @@ export const searchStocks = createAsyncThunk(
       const response = await axios.get(`${API_BASE_URL}/search?query=${query}`);
       const searchResults = response.data;
       
-      // If we have search results, fetch additional details for top 5 results 
+      // If we have search results, fetch details for all of them in one batch request
       if (searchResults && searchResults.length > 0) {
-        const detailedResults = await Promise.all(
-          searchResults.slice(0, 5).map(async (stock) => {
-            try {
-              // Get basic stock details
-              const detailsResponse = await axios.get(`${API_BASE_URL}/stock/${stock.symbol}`);
-              
-              // Return enhanced stock object with more details
-              return {
-                ...stock,
-                ...detailsResponse.data,
-                detailsFetched: true
-              };
-            } catch (error) {
-              // If fetching details fails, return original stock object
-              console.error(`Error fetching details for ${stock.symbol}:`, error);
-              return stock;
-            }
-          })
-        );
-        
-        // Combine detailed results with remaining results
-        const enhancedResults = [
-          ...detailedResults,
-          ...searchResults.slice(5)
-        ];
-        
-        return enhancedResults;
+        try {
+          const symbols = searchResults.slice(0, 100).map((stock) => stock.symbol);
+          const batchResponse = await axios.get(`${API_BASE_URL}/stocks/batch`, {
+            params: { symbols: symbols.join(',') }
+          });
+
+          // Index batch results by symbol for merging
+          const detailsBySymbol = {};
+          (batchResponse.data.results || []).forEach((details) => {
+            detailsBySymbol[details.symbol] = details;
+          });
+
+          // Return enhanced stock objects with more details
+          return searchResults.map((stock) => (
+            detailsBySymbol[stock.symbol]
+              ? { ...stock, ...detailsBySymbol[stock.symbol], detailsFetched: true }
+              : stock
+          ));
+        } catch (error) {
+          // If fetching details fails, return original search results
+          console.error('Error fetching batch stock details:', error);
+          return searchResults;
+        }
       }
       
       return searchResults;